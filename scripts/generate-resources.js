@@ -24,11 +24,28 @@
  *   insertAfter: "## Section Heading"  # Optional: heading after which to insert image
  * ---
  *
- * Usage: node scripts/generate-resources.js
+ * Usage: node scripts/generate-resources.js [--slug <slug>]... [--force]
+ *
+ * Incremental build: a content-hash cache (.cache/generate-resources.json)
+ * records, per draft, a key built from the draft bytes, the template bytes,
+ * the manifest tag config and this script. Drafts whose key is unchanged and
+ * whose output exists are skipped; outputs whose rendered bytes are identical
+ * to the file on disk are not rewritten (mtimes stay untouched).
+ *   --slug <slug>  Always re-render this slug (repeatable)
+ *   --force        Ignore the cache and re-render every draft
+ *
+ * Responsive images: when resources/image-variants.json (written by the
+ * ingest pipeline) lists width variants for the hero or inline image, the
+ * <img> tags get srcset/sizes and explicit width/height. A draft's variant
+ * entries are part of its cache key.
+ *
+ * Also loaded by scripts/generator-worker.js, which keeps this module in
+ * memory; template, manifest and draft reads are memoized by (mtime, size).
  */
 
 const fs = require('fs');
 const path = require('path');
+const crypto = require('crypto');
 
 // Paths
 const ROOT_DIR = path.join(__dirname, '..');
@@ -36,11 +53,34 @@ const RESOURCES_DIR = path.join(ROOT_DIR, 'resources');
 const DRAFTS_DIR = path.join(RESOURCES_DIR, 'drafts');
 const TEMPLATE_PATH = path.join(RESOURCES_DIR, 'TEMPLATE-resource-single.html');
 const MANIFEST_PATH = path.join(RESOURCES_DIR, 'resources.manifest.json');
+const VARIANTS_PATH = path.join(RESOURCES_DIR, 'image-variants.json');
+const CACHE_PATH = path.join(ROOT_DIR, '.cache', 'generate-resources.json');
+const CACHE_VERSION = 1;
+
+// <img sizes>: the hero spans the viewport; inline images sit in
+// .container--narrow (--max-width-narrow: 800px)
+const HERO_IMAGE_SIZES = '100vw';
+const INLINE_IMAGE_SIZES = '(max-width: 800px) 100vw, 800px';
+
+// Memoize a file-derived value by (mtime, size) so a long-lived worker
+// re-reads a file only after it changes
+const fileMemo = new Map();
+function readMemoized(filePath, derive) {
+  const stat = fs.statSync(filePath);
+  const stamp = `${stat.mtimeMs}:${stat.size}`;
+  const hit = fileMemo.get(filePath);
+  if (hit && hit.stamp === stamp) {
+    return hit.value;
+  }
+  const value = derive(fs.readFileSync(filePath));
+  fileMemo.set(filePath, { stamp, value });
+  return value;
+}
 
 // Load valid tagTypes from manifest (single source of truth)
 function loadValidTagTypes() {
   try {
-    const manifest = JSON.parse(fs.readFileSync(MANIFEST_PATH, 'utf-8'));
+    const manifest = readMemoized(MANIFEST_PATH, raw => JSON.parse(raw.toString('utf-8')));
     return Object.keys(manifest.categoryTags || {});
   } catch (e) {
     console.error(`WARNING: Could not load manifest: ${e.message}`);
@@ -92,6 +132,9 @@ function parseFrontMatter(content) {
       // Remove quotes if present
       if (value.startsWith('"') && value.endsWith('"')) {
         value = value.slice(1, -1);
+      } else if (value.length >= 2 && value.startsWith("'") && value.endsWith("'")) {
+        // Single-quoted scalar (PyYAML writes dates this way); '' is an escaped '
+        value = value.slice(1, -1).replace(/''/g, "'");
       }
 
       // Check if this starts a nested object (empty value or next line is indented)
@@ -122,11 +165,99 @@ function parseFrontMatter(content) {
 
 // Read the template
 function readTemplate() {
-  return fs.readFileSync(TEMPLATE_PATH, 'utf-8');
+  return readMemoized(TEMPLATE_PATH, raw => raw.toString('utf-8'));
+}
+
+function sha256(data) {
+  return crypto.createHash('sha256').update(data).digest('hex');
+}
+
+// Load the image variant manifest ({ "<file>": { width, height, variants: [...] } })
+function loadImageVariants() {
+  try {
+    return readMemoized(VARIANTS_PATH, raw => JSON.parse(raw.toString('utf-8')).images || {});
+  } catch (e) {
+    return {};
+  }
+}
+
+// Variant manifest entry for an image src like "images/slug-header.webp"
+function variantEntry(src, imageVariants) {
+  return (src && imageVariants[path.posix.basename(src)]) || null;
+}
+
+// srcset/sizes (when variants exist) and width/height attributes for an image
+function responsiveImageAttrs(src, sizes, imageVariants) {
+  const entry = variantEntry(src, imageVariants);
+  if (!entry) {
+    return '';
+  }
+  let attrs = '';
+  if (entry.variants.length > 0) {
+    const dir = path.posix.dirname(src);
+    const candidates = entry.variants.map(v => `${path.posix.join(dir, v.file)} ${v.width}w`);
+    candidates.push(`${src} ${entry.width}w`);
+    attrs += ` srcset="${candidates.join(', ')}" sizes="${sizes}"`;
+  }
+  return `${attrs} width="${entry.width}" height="${entry.height}"`;
+}
+
+// Hash of the manifest tag config (the only manifest data that affects output)
+function tagConfigHash() {
+  try {
+    const manifest = readMemoized(MANIFEST_PATH, raw => JSON.parse(raw.toString('utf-8')));
+    return sha256(JSON.stringify(manifest.categoryTags || {}));
+  } catch (e) {
+    return sha256('');
+  }
+}
+
+function loadCache() {
+  try {
+    const cache = JSON.parse(fs.readFileSync(CACHE_PATH, 'utf-8'));
+    if (cache.version === CACHE_VERSION && cache.entries) {
+      return cache;
+    }
+  } catch (e) {
+    // Missing or unreadable cache - full build
+  }
+  return { version: CACHE_VERSION, entries: {} };
+}
+
+function saveCache(cache) {
+  fs.mkdirSync(path.dirname(CACHE_PATH), { recursive: true });
+  const tmpPath = `${CACHE_PATH}.${process.pid}.tmp`;
+  fs.writeFileSync(tmpPath, JSON.stringify(cache, null, 2), 'utf-8');
+  fs.renameSync(tmpPath, CACHE_PATH);
+}
+
+// Write only if the bytes differ from what is already on disk
+function writeIfChanged(outputPath, content) {
+  try {
+    if (fs.readFileSync(outputPath, 'utf-8') === content) {
+      return false;
+    }
+  } catch (e) {
+    // Output does not exist yet
+  }
+  fs.writeFileSync(outputPath, content, 'utf-8');
+  return true;
+}
+
+function parseArgs(argv) {
+  const options = { slugs: new Set(), force: false };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--force') {
+      options.force = true;
+    } else if (argv[i] === '--slug' && i + 1 < argv.length) {
+      options.slugs.add(argv[++i]);
+    }
+  }
+  return options;
 }
 
 // Convert Markdown to HTML
-function markdownToHtml(markdown, inlineImage) {
+function markdownToHtml(markdown, inlineImage, imageVariants = {}) {
   let html = markdown;
 
   // Remove front matter if still present
@@ -162,7 +293,7 @@ function markdownToHtml(markdown, inlineImage) {
     const headingPattern = new RegExp(`(<h[2-6]>${escapeRegex(headingText)}</h[2-6]>)`);
     const imageHtml = `
         <figure class="article-content-image">
-          <img src="${inlineImage.src}" alt="${inlineImage.alt || ''}" loading="lazy" style="width: 100%; height: auto; display: block; border-radius: 8px; margin: 2rem 0;">
+          <img src="${inlineImage.src}"${responsiveImageAttrs(inlineImage.src, INLINE_IMAGE_SIZES, imageVariants)} alt="${inlineImage.alt || ''}" loading="lazy" style="width: 100%; height: auto; display: block; border-radius: 8px; margin: 2rem 0;">
         </figure>
 `;
     html = html.replace(headingPattern, `$1\n${imageHtml}`);
@@ -348,11 +479,11 @@ function convertParagraphs(html) {
 }
 
 // Generate HTML page from front matter and markdown content
-function generateResourcePage(frontMatter, markdownBody, template) {
+function generateResourcePage(frontMatter, markdownBody, template, imageVariants = loadImageVariants()) {
   let html = template;
 
   // Convert markdown to HTML content
-  const bodyContent = markdownToHtml(markdownBody, frontMatter.inlineImage);
+  const bodyContent = markdownToHtml(markdownBody, frontMatter.inlineImage, imageVariants);
 
   // Replace template placeholders
   html = html.replace(/\[TITLE\]/g, frontMatter.title);
@@ -368,7 +499,7 @@ function generateResourcePage(frontMatter, markdownBody, template) {
   const heroImageHtml = `
     <!-- Hero Image -->
     <figure class="article-hero-image">
-      <img src="${frontMatter.hero.src}" alt="${frontMatter.hero.alt}" loading="eager" style="width: 100%; height: auto; display: block;">
+      <img src="${frontMatter.hero.src}"${responsiveImageAttrs(frontMatter.hero.src, HERO_IMAGE_SIZES, imageVariants)} alt="${frontMatter.hero.alt}" loading="eager" style="width: 100%; height: auto; display: block;">
     </figure>
 `;
 
@@ -394,7 +525,7 @@ ${bodyContent}
 }
 
 // Validate front matter has required fields
-function validateFrontMatter(frontMatter, filename) {
+function validateFrontMatter(frontMatter, filename, validTagTypes = loadValidTagTypes()) {
   const required = ['slug', 'title', 'shortTitle', 'description', 'category', 'tagType', 'publishDate', 'readTimeMinutes'];
   const missing = required.filter(field => !frontMatter[field]);
 
@@ -408,7 +539,6 @@ function validateFrontMatter(frontMatter, filename) {
     return false;
   }
 
-  const validTagTypes = loadValidTagTypes();
   if (!validTagTypes.includes(frontMatter.tagType)) {
     console.error(`ERROR: ${filename} has invalid tagType "${frontMatter.tagType}".`);
     console.error(`       Valid tagTypes (from resources.manifest.json): ${validTagTypes.join(', ')}`);
@@ -419,13 +549,28 @@ function validateFrontMatter(frontMatter, filename) {
   return true;
 }
 
-// Main execution
-function main() {
+// Read a draft: raw-bytes hash plus parsed front matter and body
+function readDraft(mdPath) {
+  return readMemoized(mdPath, raw => ({
+    hash: sha256(raw),
+    ...parseFrontMatter(raw.toString('utf-8'))
+  }));
+}
+
+// Render every stale draft; options: { slugs: Set<string>, force: boolean }
+function generate(options) {
   console.log('Fox Fuel Resource Generator');
   console.log('===========================\n');
 
-  // Read template
+  // Read template and shared inputs once
   const template = readTemplate();
+  const validTagTypes = loadValidTagTypes();
+  const imageVariants = loadImageVariants();
+  const sharedKey = sha256([
+    sha256(template),
+    tagConfigHash(),
+    readMemoized(__filename, sha256)
+  ].join(':'));
 
   // Get list of markdown files
   let mdFiles = [];
@@ -433,20 +578,38 @@ function main() {
     mdFiles = fs.readdirSync(DRAFTS_DIR).filter(f => f.endsWith('.md'));
   } catch (e) {
     console.log('No drafts directory found or empty.');
-    return;
+    return { found: 0, generated: [], unchanged: 0, upToDate: 0, skipped: 0, errors: 0 };
   }
 
   console.log(`Found ${mdFiles.length} Markdown files in drafts/\n`);
 
-  let generated = 0;
+  const cache = options.force ? { version: CACHE_VERSION, entries: {} } : loadCache();
+  const entries = {};
+
+  const generated = [];
+  let unchanged = 0;
+  let upToDate = 0;
   let skipped = 0;
   let errors = 0;
 
   for (const mdFile of mdFiles) {
     const mdPath = path.join(DRAFTS_DIR, mdFile);
-    const content = fs.readFileSync(mdPath, 'utf-8');
+    const draft = readDraft(mdPath);
+    const fm = draft.frontMatter || {};
+    const variants = [fm.hero, fm.inlineImage].map(img => variantEntry(img && img.src, imageVariants));
+    const key = sha256(`${sharedKey}:${draft.hash}:${JSON.stringify(variants)}`);
+
+    // Skip drafts whose inputs are unchanged and whose output still exists
+    const cached = cache.entries[mdFile];
+    if (cached && cached.key === key && !options.slugs.has(cached.slug) &&
+        fs.existsSync(path.join(RESOURCES_DIR, cached.output))) {
+      entries[mdFile] = cached;
+      console.log(`· Up to date: ${cached.output}`);
+      upToDate++;
+      continue;
+    }
 
-    const { frontMatter, body } = parseFrontMatter(content);
+    const { frontMatter, body } = draft;
 
     if (!frontMatter) {
       console.log(`⚠ Skipping ${mdFile}: No YAML front matter found`);
@@ -454,23 +617,43 @@ function main() {
       continue;
     }
 
-    if (!validateFrontMatter(frontMatter, mdFile)) {
+    if (!validateFrontMatter(frontMatter, mdFile, validTagTypes)) {
+      console.log(`✗ Invalid: ${mdFile}`);
       errors++;
       continue;
     }
 
     // Generate HTML
-    const htmlContent = generateResourcePage(frontMatter, body, template);
-
-    // Write output file
-    const outputPath = path.join(RESOURCES_DIR, `${frontMatter.slug}.html`);
-    fs.writeFileSync(outputPath, htmlContent, 'utf-8');
+    const htmlContent = generateResourcePage(frontMatter, body, template, imageVariants);
+
+    // Write output file (only if the content changed)
+    const outputName = `${frontMatter.slug}.html`;
+    const outputPath = path.join(RESOURCES_DIR, outputName);
+    if (writeIfChanged(outputPath, htmlContent)) {
+      console.log(`✓ Generated: ${outputName} (publishes ${frontMatter.publishDate})`);
+      generated.push(frontMatter.slug);
+    } else {
+      console.log(`= Unchanged: ${outputName}`);
+      unchanged++;
+    }
 
-    console.log(`✓ Generated: ${frontMatter.slug}.html (publishes ${frontMatter.publishDate})`);
-    generated++;
+    entries[mdFile] = { key, slug: frontMatter.slug, output: outputName };
   }
 
-  console.log(`\nSummary: ${generated} generated, ${skipped} skipped, ${errors} errors`);
+  // Entries for deleted drafts are dropped here
+  saveCache({ version: CACHE_VERSION, entries });
+
+  console.log(`\nSummary: ${generated.length} generated, ${unchanged} unchanged, ${upToDate} up to date, ${skipped} skipped, ${errors} errors`);
+
+  return { found: mdFiles.length, generated, unchanged, upToDate, skipped, errors };
 }
 
-main();
+function main() {
+  generate(parseArgs(process.argv.slice(2)));
+}
+
+module.exports = { generate, parseFrontMatter, generateResourcePage };
+
+if (require.main === module) {
+  main();
+}
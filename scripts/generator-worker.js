@@ -0,0 +1,89 @@
+#!/usr/bin/env node
+/**
+ * Persistent Generator Worker for Fox Fuel Pro Site
+ *
+ * Keeps generate-resources.js and regenerate-index.js loaded in one
+ * long-lived process so the ingest pipeline pays node startup (and template,
+ * manifest and draft parsing) once per session instead of twice per bundle.
+ *
+ * Protocol: one JSON object per line on stdin, one JSON response per line
+ * on stdout. Requests are handled strictly in arrival order.
+ *
+ *   {"id": 1, "cmd": "render", "slugs": ["my-slug"], "force": false}
+ *   {"id": 2, "cmd": "index"}
+ *   {"id": 3, "cmd": "ping"}
+ *
+ *   {"id": 1, "ok": true, "output": "...", "result": {...}}
+ *   {"id": 2, "ok": false, "output": "...", "error": "message"}
+ *
+ * Console output from the generators is captured into "output"; stdout is
+ * reserved for protocol lines. The worker exits when stdin closes.
+ *
+ * Usage: node scripts/generator-worker.js
+ */
+
+const readline = require('readline');
+
+const protocolOut = process.stdout.write.bind(process.stdout);
+
+// Capture generator console output for the request being served
+let captured = null;
+function capture(...args) {
+  const line = args.map(a => (typeof a === 'string' ? a : String(a))).join(' ');
+  if (captured) {
+    captured.push(line);
+  } else {
+    process.stderr.write(`${line}\n`);
+  }
+}
+console.log = capture;
+console.error = capture;
+console.warn = capture;
+
+const generator = require('./generate-resources.js');
+const indexer = require('./regenerate-index.js');
+
+const handlers = {
+  ping: () => ({ pid: process.pid }),
+  render: (request) => generator.generate({
+    slugs: new Set(request.slugs || []),
+    force: Boolean(request.force)
+  }),
+  index: () => indexer.main()
+};
+
+function respond(message) {
+  protocolOut(`${JSON.stringify(message)}\n`);
+}
+
+function handle(line) {
+  if (!line.trim()) return;
+
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (e) {
+    respond({ id: null, ok: false, output: '', error: `Invalid request: ${e.message}` });
+    return;
+  }
+
+  const handler = handlers[request.cmd];
+  if (!handler) {
+    respond({ id: request.id, ok: false, output: '', error: `Unknown command: ${request.cmd}` });
+    return;
+  }
+
+  captured = [];
+  try {
+    const result = handler(request);
+    respond({ id: request.id, ok: true, output: captured.join('\n'), result });
+  } catch (e) {
+    respond({ id: request.id, ok: false, output: captured.join('\n'), error: e.stack || e.message });
+  } finally {
+    captured = null;
+  }
+}
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on('line', handle);
+rl.on('close', () => process.exit(0));
@@ -9,6 +9,16 @@
  * 4. Regenerates the Guides & White Papers section of /resources/index.html
  *
  * Usage: node scripts/regenerate-index.js
+ *        node scripts/regenerate-index.js --today 2026-12-01 --stdout
+ *        node scripts/regenerate-index.js --list
+ *
+ *   --today YYYY-MM-DD  Publish as of this date instead of today (ET)
+ *   --stdout            Print the new index.html instead of writing it
+ *                       (the report goes to stderr)
+ *   --list              Print every resource (manifest + drafts) as JSON
+ *
+ * Also loaded by scripts/generator-worker.js; draft and manifest reads are
+ * memoized by (mtime, size) so repeated runs only re-parse changed files.
  */
 
 const fs = require('fs');
@@ -21,6 +31,20 @@ const DRAFTS_DIR = path.join(RESOURCES_DIR, 'drafts');
 const INDEX_PATH = path.join(RESOURCES_DIR, 'index.html');
 const MANIFEST_PATH = path.join(RESOURCES_DIR, 'resources.manifest.json');
 
+// Memoize a file-derived value by (mtime, size)
+const fileMemo = new Map();
+function readMemoized(filePath, derive) {
+  const stat = fs.statSync(filePath);
+  const stamp = `${stat.mtimeMs}:${stat.size}`;
+  const hit = fileMemo.get(filePath);
+  if (hit && hit.stamp === stamp) {
+    return hit.value;
+  }
+  const value = derive(fs.readFileSync(filePath, 'utf-8'));
+  fileMemo.set(filePath, { stamp, value });
+  return value;
+}
+
 // Get today's date in America/New_York timezone
 function getTodayET() {
   const now = new Date();
@@ -61,6 +85,9 @@ function parseFrontMatter(content) {
 
       if (value.startsWith('"') && value.endsWith('"')) {
         value = value.slice(1, -1);
+      } else if (value.length >= 2 && value.startsWith("'") && value.endsWith("'")) {
+        // Single-quoted scalar (PyYAML writes dates this way); '' is an escaped '
+        value = value.slice(1, -1).replace(/''/g, "'");
       }
 
       if (value === '' || value === 'null') {
@@ -93,7 +120,7 @@ function getAllResources() {
 
   // Read manifest for existing published resources
   if (fs.existsSync(MANIFEST_PATH)) {
-    const manifest = JSON.parse(fs.readFileSync(MANIFEST_PATH, 'utf-8'));
+    const manifest = readMemoized(MANIFEST_PATH, JSON.parse);
     if (manifest.resources) {
       manifest.resources.forEach(r => {
         // Only include manifest entries that don't have a corresponding draft
@@ -116,8 +143,7 @@ function getAllResources() {
     const mdFiles = fs.readdirSync(DRAFTS_DIR).filter(f => f.endsWith('.md'));
 
     for (const mdFile of mdFiles) {
-      const content = fs.readFileSync(path.join(DRAFTS_DIR, mdFile), 'utf-8');
-      const frontMatter = parseFrontMatter(content);
+      const frontMatter = readMemoized(path.join(DRAFTS_DIR, mdFile), parseFrontMatter);
 
       if (frontMatter && frontMatter.slug && frontMatter.publishDate) {
         // Check if this slug already exists from manifest
@@ -199,13 +225,31 @@ function regenerateIndex(indexHtml, publishedResources) {
   return indexHtml.replace(gridPattern, newGridWithFooter);
 }
 
-// Main execution
-function main() {
+// Parse command line arguments
+function parseArgs(argv) {
+  const options = { today: null, stdout: false, list: false };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--today' && argv[i + 1]) {
+      options.today = argv[++i];
+    } else if (argv[i] === '--stdout') {
+      options.stdout = true;
+    } else if (argv[i] === '--list') {
+      options.list = true;
+    }
+  }
+  return options;
+}
+
+// Main execution; options: { today: 'YYYY-MM-DD' | null, stdout: boolean }
+function main(options = {}) {
+  // With --stdout, stdout carries the page: the report goes to stderr
+  const console = options.stdout ? { log: (...args) => process.stderr.write(args.join(' ') + '\n') } : global.console;
+
   console.log('Fox Fuel Index Regenerator');
   console.log('==========================\n');
 
-  const today = getTodayET();
-  console.log(`Today (America/New_York): ${today}\n`);
+  const today = options.today || getTodayET();
+  console.log(`${options.today ? 'Date' : 'Today (America/New_York)'}: ${today}\n`);
 
   // Get all resources
   const allResources = getAllResources();
@@ -232,10 +276,15 @@ function main() {
   // Regenerate index
   const newIndexHtml = regenerateIndex(indexHtml, publishedResources);
 
-  // Write updated index
-  fs.writeFileSync(INDEX_PATH, newIndexHtml, 'utf-8');
-
-  console.log('\n✓ Updated /resources/index.html');
+  // Write updated index (skip the write when nothing changed so the mtime stays put)
+  if (options.stdout) {
+    process.stdout.write(newIndexHtml);
+  } else if (newIndexHtml !== indexHtml) {
+    fs.writeFileSync(INDEX_PATH, newIndexHtml, 'utf-8');
+    console.log('\n✓ Updated /resources/index.html');
+  } else {
+    console.log('\n= /resources/index.html unchanged');
+  }
   console.log('Done.');
 
   // Return info for CI/automation
@@ -252,5 +301,10 @@ module.exports = { main, getTodayET, getAllResources };
 
 // Run if called directly
 if (require.main === module) {
-  main();
+  const options = parseArgs(process.argv.slice(2));
+  if (options.list) {
+    process.stdout.write(JSON.stringify(getAllResources()));
+  } else {
+    main(options);
+  }
 }
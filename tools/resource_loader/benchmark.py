@@ -0,0 +1,506 @@
+"""
+Fox Fuel Resource Loader - Benchmark Harness
+
+Generates synthetic content corpora and times every pipeline stage at
+several corpus sizes, writing a JSON report that can be compared against a
+saved baseline.
+
+Each run builds a throwaway repo (template, manifest, index and node
+scripts copied from the real repo) and measures two phases:
+- batch:  ingest_batch() of N synthetic bundles into the empty corpus
+- single: one more ingest() into the N-draft corpus (per-editor latency)
+
+It also checks the front matter reader against pathological inputs
+(unclosed fences, a fence past the 64 KB cap, one huge line, fence
+look-alikes, --- inside a block scalar, BOM + CRLF, huge bodies, a
+non-UTF-8 draft): each must give the expected closed flag, body offset
+and YAML block. Reader times are reported, not asserted.
+
+Usage:
+    cd tools/resource_loader
+    python -m benchmark                                  # 10/100/1000 drafts
+    python -m benchmark --sizes 10,100 --output bench.json
+    python -m benchmark --baseline bench.json            # fail on regressions
+    python -m benchmark --front-matter                   # reader checks only
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+import time
+import multiprocessing
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from PIL import Image, ImageDraw
+
+from ingest_pipeline import IngestPipeline, IngestError, MissingFrontMatterError, find_repo_root
+from front_matter import read_front_matter, split_front_matter, DEFAULT_MAX_BYTES
+from tracing import Tracer
+
+
+REPORT_VERSION = 1
+
+# Files copied from the real repo into each synthetic repo
+REPO_FILES = [
+    'resources/TEMPLATE-resource-single.html',
+    'resources/resources.manifest.json',
+    'resources/index.html',
+    'scripts/generate-resources.js',
+    'scripts/regenerate-index.js',
+    'scripts/generator-worker.js',
+]
+
+WORDS = (
+    "fuel fleet delivery diesel generator tank reliability schedule supply contract "
+    "operations facility compliance inventory route vendor emergency backup capacity "
+    "gallons monitoring telemetry budget cost winter summer construction site equipment "
+    "maintenance planning program review dispatch storage additive contamination uptime"
+).split()
+
+
+class CorpusGenerator:
+    """Writes synthetic bundles (1 markdown file + hero + inline image each)."""
+
+    def __init__(self, tag_types: Dict[str, str], seed: int = 1,
+                 image_size: tuple = (1600, 900), image_format: str = 'png'):
+        """
+        Args:
+            tag_types: tagType -> category label (from the manifest's categoryTags)
+            seed: Random seed (same seed, same corpus)
+            image_size: (width, height) of generated images
+            image_format: 'png' or 'jpg'
+        """
+        self.tag_types = tag_types
+        self.rng = random.Random(seed)
+        self.image_size = image_size
+        self.image_format = image_format
+
+    def words(self, low: int, high: int) -> str:
+        return ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high)))
+
+    def sentence(self) -> str:
+        text = self.words(8, 20)
+        return text[0].upper() + text[1:] + '.'
+
+    def paragraph(self) -> str:
+        return ' '.join(self.sentence() for _ in range(self.rng.randint(2, 6)))
+
+    def table(self) -> str:
+        columns = self.rng.randint(2, 4)
+        header = '| ' + ' | '.join(self.words(1, 3).title() for _ in range(columns)) + ' |'
+        divider = '|' + '|'.join(['---'] * columns) + '|'
+        rows = ['| ' + ' | '.join(self.words(1, 4) for _ in range(columns)) + ' |'
+                for _ in range(self.rng.randint(3, 8))]
+        return '\n'.join([header, divider, *rows])
+
+    def bullet_list(self, ordered: bool = False) -> str:
+        items = []
+        for i in range(self.rng.randint(3, 7)):
+            marker = f"{i + 1}." if ordered else '-'
+            item = self.words(4, 12)
+            if self.rng.random() < 0.3:
+                item = f"**{self.words(1, 3).title()}:** {item}"
+            items.append(f"{marker} {item}")
+        return '\n'.join(items)
+
+    def body(self, title: str, sections: int) -> List[str]:
+        """Markdown body parts; returns [text, heading the inline image goes after]."""
+        parts = [f"# {title}", '', f"**{self.sentence()}**", '', f"*{self.sentence()}*", '', '---', '']
+        headings = []
+        for n in range(1, sections + 1):
+            heading = f"## Section {n}: {self.words(2, 4).title()}"
+            headings.append(heading)
+            parts.extend([heading, '', self.paragraph(), ''])
+            for _ in range(self.rng.randint(1, 3)):
+                block = self.rng.choice(['paragraph', 'list', 'olist', 'table', 'quote', 'sub'])
+                if block == 'list':
+                    parts.append(self.bullet_list())
+                elif block == 'olist':
+                    parts.append(self.bullet_list(ordered=True))
+                elif block == 'table':
+                    parts.append(self.table())
+                elif block == 'quote':
+                    parts.append(f"> {self.sentence()}")
+                elif block == 'sub':
+                    parts.extend([f"### {self.words(2, 5).title()}", '', self.paragraph()])
+                else:
+                    parts.append(self.paragraph())
+                parts.append('')
+        return ['\n'.join(parts), self.rng.choice(headings)]
+
+    def image(self, path: Path, label: str):
+        """Gradient plus noise blocks, so encoders do real work."""
+        width, height = self.image_size
+        base = Image.linear_gradient('L').resize((width, height))
+        img = Image.merge('RGB', (base, base.rotate(90).resize((width, height)), base.transpose(Image.FLIP_LEFT_RIGHT)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(40):
+            x, y = self.rng.randrange(width), self.rng.randrange(height)
+            size = self.rng.randint(20, max(21, width // 8))
+            color = tuple(self.rng.randrange(256) for _ in range(3))
+            draw.rectangle([x, y, x + size, y + size // 2], fill=color)
+        draw.text((20, 20), label, fill=(255, 255, 255))
+        if self.image_format == 'jpg':
+            img.save(path, 'JPEG', quality=90)
+        else:
+            img.save(path, 'PNG')
+
+    def bundle(self, folder: Path, index: int, start: date) -> Path:
+        """Write one bundle folder and return it."""
+        folder.mkdir(parents=True, exist_ok=True)
+        slug = f"bench-{index:05d}-{self.words(2, 3).replace(' ', '-')}"
+        tag_type = self.rng.choice(sorted(self.tag_types))
+        title = self.words(4, 9).title()
+        # Bodies from a few hundred words to long guides
+        body, insert_after = self.body(title, self.rng.choice([2, 4, 6, 10, 16]))
+        front_matter = {
+            'slug': slug,
+            'title': title,
+            'shortTitle': ' '.join(title.split()[:3]),
+            'description': self.sentence(),
+            'category': self.tag_types[tag_type],
+            'tagType': tag_type,
+            'publishDate': (start + timedelta(days=self.rng.randint(-365, 365))).isoformat(),
+            'readTimeMinutes': max(1, len(body.split()) // 200),
+            'hero': {'alt': self.sentence()},
+            'inlineImage': {'alt': self.sentence(), 'insertAfter': insert_after},
+        }
+        lines = ['---']
+        for key, value in front_matter.items():
+            if isinstance(value, dict):
+                lines.append(f"{key}:")
+                lines.extend(f"  {k}: {json.dumps(v)}" for k, v in value.items())
+            else:
+                lines.append(f"{key}: {json.dumps(value)}")
+        lines.extend(['---', '', body])
+        (folder / f"{slug}.md").write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+        ext = 'jpg' if self.image_format == 'jpg' else 'png'
+        self.image(folder / f"{slug}-header.{ext}", f"{slug} hero")
+        self.image(folder / f"{slug}-inline.{ext}", f"{slug} inline")
+        return folder
+
+
+def build_synthetic_repo(source_root: Path, dest: Path) -> Path:
+    """Create an empty resources repo at dest with the real template, manifest and scripts."""
+    for rel in REPO_FILES:
+        src = source_root / rel
+        target = dest / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if src.exists():
+            shutil.copy2(src, target)
+    (dest / 'resources' / 'drafts').mkdir(parents=True, exist_ok=True)
+    (dest / 'resources' / 'images').mkdir(parents=True, exist_ok=True)
+    return dest
+
+
+def summarize(tracer: Tracer) -> Dict[str, Dict[str, float]]:
+    """Per-span statistics in milliseconds."""
+    durations: Dict[str, List[float]] = {}
+    for event in tracer.events:
+        durations.setdefault(event['name'], []).append(event['dur'] * 1000)
+    stats = {}
+    for name, values in sorted(durations.items()):
+        values.sort()
+        stats[name] = {
+            'count': len(values),
+            'totalMs': round(sum(values), 3),
+            'meanMs': round(statistics.fmean(values), 3),
+            'p50Ms': round(values[len(values) // 2], 3),
+            'p95Ms': round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+            'maxMs': round(values[-1], 3),
+        }
+    return stats
+
+
+def run_size(source_root: Path, work_dir: Path, drafts: int, args: argparse.Namespace,
+             log) -> List[Dict[str, Any]]:
+    """Benchmark one corpus size; returns the batch and single phase results."""
+    repo = build_synthetic_repo(source_root, work_dir / f"repo-{drafts}")
+    inbox = work_dir / f"inbox-{drafts}"
+    manifest = json.loads((repo / 'resources' / 'resources.manifest.json').read_text(encoding='utf-8'))
+    tag_types = {tag: info.get('label', tag) for tag, info in manifest.get('categoryTags', {}).items()}
+    generator = CorpusGenerator(tag_types, seed=args.seed + drafts,
+                                image_size=args.image_size, image_format=args.image_type)
+
+    log(f"Generating corpus: {drafts} bundles ({args.image_size[0]}x{args.image_size[1]} {args.image_type})")
+    start = date.today()
+    bundles = [generator.bundle(inbox / f"{i:05d}", i, start) for i in range(drafts + 1)]
+
+    def new_pipeline() -> IngestPipeline:
+        pipeline = IngestPipeline(repo, log_callback=lambda msg, lvl: None)
+        pipeline.optimize_images = args.optimize
+        pipeline.image_format = args.image_format
+        if not args.variants:
+            pipeline.variant_widths = []
+        if args.generator_worker:
+            pipeline.start_generator_worker()
+        return pipeline
+
+    results = []
+
+    # Phase 1: batch ingest of N bundles into an empty corpus
+    pipeline = new_pipeline()
+    wall = time.perf_counter()
+    batch_results = pipeline.ingest_batch(bundles[:drafts], max_workers=args.workers)
+    wall = time.perf_counter() - wall
+    pipeline.stop_generator_worker()
+    failed = [r for r in batch_results if not r.success]
+    for r in failed[:5]:
+        log(f"  FAILED {r.slug or r.bundle_dir.name} ({r.stage}): {'; '.join(r.errors)[:200]}")
+    results.append({'drafts': drafts, 'phase': 'batch', 'wallMs': round(wall * 1000, 3),
+                    'succeeded': len(batch_results) - len(failed), 'failed': len(failed),
+                    'stages': summarize(pipeline.tracer)})
+    log(f"  batch  {drafts:>5} drafts: {wall:.2f} s ({len(failed)} failed)")
+
+    # Phase 2: one more ingest into the N-draft corpus
+    pipeline = new_pipeline()
+    md_path, hero_path, inline_path = pipeline.find_bundle_files(bundles[drafts])
+    wall = time.perf_counter()
+    single = pipeline.ingest(md_path, hero_path, inline_path)
+    wall = time.perf_counter() - wall
+    pipeline.stop_generator_worker()
+    results.append({'drafts': drafts, 'phase': 'single', 'wallMs': round(wall * 1000, 3),
+                    'succeeded': int(single.success), 'failed': int(not single.success),
+                    'stages': summarize(pipeline.tracer)})
+    log(f"  single {drafts:>5} drafts: {wall:.2f} s ({'ok' if single.success else single.stage})")
+    return results
+
+
+# Front matter reader cases: (name, head, tail, expected closed, expected YAML).
+# The file is head + tail; when the fence closes, the body starts right after head.
+def front_matter_cases(size: int) -> List[tuple]:
+    """Pathological and edge-case markdown files of roughly `size` bytes."""
+    body = b'# Title\n\n' + b'Paragraph text.\n' * (size // 16)
+    past_cap = b'key: value\n' * (DEFAULT_MAX_BYTES // 11 + 1)
+    return [
+        ('unclosed-fence', b'---\nslug: x\n', b'key: value\n' * (size // 11), False, ''),
+        ('fence-past-cap', b'---\nslug: x\n', past_cap + b'---\n' + body, False, ''),
+        ('single-huge-line', b'---\n', b'x' * size, False, ''),
+        ('fence-lookalikes', b'---\n', b'----\n--- x\n -- -\n' * (size // 19), False, ''),
+        ('fence-lookalikes-closed', b'---\nslug: x\n----\n--- x\n---  \n', body, True, 'slug: x\n----\n--- x'),
+        ('block-scalar-dashes', b'---\nslug: x\ndescription: |\n  before\n  ---\n  after\n---\n', body,
+         True, 'slug: x\ndescription: |\n  before\n  ---\n  after'),
+        ('bom-crlf', b'\xef\xbb\xbf---\r\nslug: x\r\ntitle: y\r\n---\r\n', body, True, 'slug: x\ntitle: y'),
+        ('huge-body', b'---\nslug: x\n---\n', b'\n' + body * 4, True, 'slug: x'),
+        ('no-front-matter', b'', body, None, ''),
+    ]
+
+
+def check_front_matter(work_dir: Path, log, size: int = 8 * 1024 * 1024) -> Dict[str, Any]:
+    """
+    Run the front matter reader (file and in-memory) and parse_markdown
+    over the pathological cases.
+
+    Every case is checked for the closed flag, the body offset (bytes for
+    the file reader, characters in memory) and the YAML block; times are
+    reported but not asserted.
+
+    Returns:
+        {'cases': {name: {readMs, splitMs, parseMs}}, 'failures': [messages]}
+    """
+    folder = work_dir / 'front-matter'
+    folder.mkdir(parents=True, exist_ok=True)
+    pipeline = IngestPipeline(work_dir, log_callback=lambda msg, lvl: None)
+    cases, failures = {}, []
+
+    for name, head, tail, closed, yaml_text in front_matter_cases(size):
+        data = head + tail
+        path = folder / f"{name}.md"
+        path.write_bytes(data)
+        text = data.decode('utf-8')
+
+        start = time.perf_counter()
+        block = read_front_matter(path)
+        read_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        split = split_front_matter(text)
+        split_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        try:
+            pipeline.parse_markdown(path)
+            error = None
+        except Exception as e:
+            error = e
+        parse_ms = (time.perf_counter() - start) * 1000
+
+        if closed is None:
+            if block is not None or split is not None:
+                failures.append(f"{name}: expected no front matter")
+            if not isinstance(error, MissingFrontMatterError):
+                failures.append(f"{name}: parse_markdown gave {error!r}, expected MissingFrontMatterError")
+        else:
+            byte_offset = len(head) if closed else 0
+            char_offset = len(head.decode('utf-8')) if closed else 0
+            for label, got, offset in (('file', block, byte_offset), ('text', split, char_offset)):
+                if got is None:
+                    failures.append(f"{name}: {label} reader found no front matter")
+                elif (got.closed, got.body_offset, got.yaml_text) != (closed, offset, yaml_text):
+                    failures.append(f"{name}: {label} reader gave closed={got.closed} offset={got.body_offset} "
+                                    f"yaml={got.yaml_text[:40]!r}, expected closed={closed} offset={offset}")
+            if closed and error is not None and not isinstance(error, IngestError):
+                failures.append(f"{name}: parse_markdown raised {type(error).__name__}: {error}")
+            if not closed and not isinstance(error, IngestError):
+                failures.append(f"{name}: parse_markdown gave {error!r}, expected IngestError")
+
+        cases[name] = {'bytes': len(data), 'readMs': round(read_ms, 3),
+                       'splitMs': round(split_ms, 3), 'parseMs': round(parse_ms, 3)}
+        log(f"  front matter {name:<24} read {read_ms:6.2f} ms  split {split_ms:6.2f} ms  parse {parse_ms:7.2f} ms")
+
+    # A draft saved in a legacy encoding is a rejected ingest, not a crash
+    path = folder / 'not-utf8.md'
+    path.write_bytes(b'---\nslug: x\ntitle: Caf\xe9\n---\n# Caf\xe9\n')
+    try:
+        pipeline.parse_markdown(path)
+        failures.append("not-utf8: parse_markdown accepted a non-UTF-8 draft")
+    except IngestError:
+        pass
+    except Exception as e:
+        failures.append(f"not-utf8: parse_markdown raised {type(e).__name__}: {e}")
+
+    for message in failures:
+        log(f"  FAILED {message}")
+    return {'cases': cases, 'failures': failures}
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            min_ms: float) -> List[str]:
+    """
+    Compare mean stage times against a baseline report.
+
+    Returns:
+        Regression messages (stage slower than baseline by more than tolerance,
+        ignoring stages faster than min_ms in both reports)
+    """
+    regressions = []
+    previous = {(r['drafts'], r['phase']): r for r in baseline.get('runs', [])}
+    for run in report['runs']:
+        base = previous.get((run['drafts'], run['phase']))
+        if not base:
+            continue
+        checks = [('(wall)', run['wallMs'], base['wallMs'])]
+        checks.extend((name, stats['meanMs'], base['stages'][name]['meanMs'])
+                      for name, stats in run['stages'].items() if name in base['stages'])
+        for name, now, before in checks:
+            if max(now, before) < min_ms:
+                continue
+            if now > before * (1 + tolerance):
+                regressions.append(f"{run['phase']} @ {run['drafts']} drafts: {name} "
+                                   f"{before:.1f} ms -> {now:.1f} ms (+{(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def parse_size(text: str) -> tuple:
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmark',
+                                     description='Benchmark the ingest pipeline on synthetic corpora.')
+    parser.add_argument('--sizes', default='10,100,1000', help='Comma-separated draft counts')
+    parser.add_argument('--image-size', type=parse_size, default=(1600, 900), help='WIDTHxHEIGHT of synthetic images')
+    parser.add_argument('--image-type', choices=['png', 'jpg'], default='png', help='Synthetic source image format')
+    parser.add_argument('--no-optimize', dest='optimize', action='store_false', help='Copy images byte-for-byte')
+    parser.add_argument('--image-format', choices=IngestPipeline.IMAGE_FORMATS,
+                        default=IngestPipeline.DEFAULT_IMAGE_FORMAT, help='Optimized image format')
+    parser.add_argument('--no-variants', dest='variants', action='store_false', help='Skip responsive variants')
+    parser.add_argument('--workers', type=int, default=None, help='Batch staging workers')
+    parser.add_argument('--generator-worker', action='store_true', help='Use the persistent node generator')
+    parser.add_argument('--seed', type=int, default=1, help='Corpus random seed')
+    parser.add_argument('--output', type=Path, default=None, help='Write the JSON report here')
+    parser.add_argument('--baseline', type=Path, default=None, help='Compare against this JSON report')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='Ignore stages faster than this in both reports')
+    parser.add_argument('--keep', action='store_true', help='Keep the synthetic repos')
+    parser.add_argument('--front-matter', action='store_true', help='Only run the front matter reader checks')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark.
+
+    Returns:
+        0 on success, 1 if a front matter check failed or a baseline comparison
+        found regressions, 2 on setup errors
+    """
+    args = _build_arg_parser().parse_args(argv)
+
+    def log(message: str):
+        print(message, file=sys.stderr, flush=True)
+
+    source_root = find_repo_root(Path(__file__).parent)
+    if not source_root:
+        log("Could not find repository root")
+        return 2
+
+    sizes = [] if args.front_matter else [int(s) for s in args.sizes.split(',') if s.strip()]
+    work_dir = Path(tempfile.mkdtemp(prefix='foxfuel-bench-'))
+    log(f"Benchmark work dir: {work_dir}")
+
+    report = {
+        'version': REPORT_VERSION,
+        'createdAt': datetime.now().isoformat(timespec='seconds'),
+        'machine': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpuCount': os.cpu_count(),
+        },
+        'settings': {
+            'imageSize': list(args.image_size),
+            'imageType': args.image_type,
+            'optimize': args.optimize,
+            'imageFormat': args.image_format,
+            'variants': args.variants,
+            'workers': args.workers,
+            'generatorWorker': args.generator_worker,
+            'seed': args.seed,
+        },
+        'runs': [],
+    }
+
+    try:
+        log("Front matter reader:")
+        report['frontMatter'] = check_front_matter(work_dir, log)
+        for drafts in sizes:
+            report['runs'].extend(run_size(source_root, work_dir, drafts, args, log))
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + '\n', encoding='utf-8')
+        log(f"Report written: {args.output}")
+    else:
+        print(output)
+
+    if report['frontMatter']['failures']:
+        return 1
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if baseline.get('settings') != report['settings']:
+            log("Warning: baseline was recorded with different settings")
+        regressions = compare(report, baseline, args.tolerance, args.min_ms)
+        for message in regressions:
+            log(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        log(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
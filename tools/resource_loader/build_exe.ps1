@@ -132,6 +132,21 @@ if ($HasDnd) {
 # Add the ingest_pipeline module
 $PyInstallerArgs += "--hidden-import", "ingest_pipeline"
 $PyInstallerArgs += "--add-data", "ingest_pipeline.py;."
+$PyInstallerArgs += "--hidden-import", "generator_worker"
+$PyInstallerArgs += "--hidden-import", "image_tools"
+$PyInstallerArgs += "--hidden-import", "staging"
+$PyInstallerArgs += "--hidden-import", "journal"
+$PyInstallerArgs += "--hidden-import", "tracing"
+$PyInstallerArgs += "--hidden-import", "repo_index"
+$PyInstallerArgs += "--hidden-import", "repo_config"
+$PyInstallerArgs += "--hidden-import", "html_validator"
+$PyInstallerArgs += "--hidden-import", "front_matter"
+$PyInstallerArgs += "--hidden-import", "drafts_catalog"
+$PyInstallerArgs += "--hidden-import", "publish_calendar"
+$PyInstallerArgs += "--hidden-import", "inbox_watcher"
+$PyInstallerArgs += "--hidden-import", "ingest_service"
+$PyInstallerArgs += "--hidden-import", "git_outbox"
+$PyInstallerArgs += "--hidden-import", "git_worktree"
 
 # Debug mode
 if ($Debug) {
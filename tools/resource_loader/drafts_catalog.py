@@ -0,0 +1,304 @@
+"""
+Fox Fuel Resource Loader - Drafts Catalog
+
+SQLite catalog of resources/drafts/*.md: one row per draft file (keyed by
+its path, so two drafts claiming the same slug both stay visible) with its
+front matter summary (slug, title, tagType, category, publishDate,
+readTimeMinutes), the draft's SHA-256 and the hero/inline image paths and
+hashes. The database lives in .cache/drafts-catalog.sqlite3 (git-ignored)
+and is only ever a cache of the files on disk:
+
+- IngestPipeline updates the row of every draft it stages or rolls back
+- sync() re-reads drafts whose (mtime, size) changed and drops rows whose
+  draft is gone; rebuild() starts from an empty table
+
+Lookups by slug, publish date or date range are indexed queries. Front
+matter values SQLite cannot store (a list or mapping where a scalar
+belongs) are logged and stored as NULL instead of failing the sync.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, date
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple, Callable
+
+import yaml
+
+from front_matter import read_front_matter, load_yaml
+from staging import file_sha256
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    draft_path TEXT PRIMARY KEY,
+    slug TEXT NOT NULL,
+    title TEXT,
+    tag_type TEXT,
+    category TEXT,
+    publish_date TEXT,
+    read_time_minutes INTEGER,
+    draft_sha256 TEXT NOT NULL,
+    draft_mtime_ns INTEGER NOT NULL,
+    draft_size INTEGER NOT NULL,
+    hero_src TEXT,
+    hero_sha256 TEXT,
+    inline_src TEXT,
+    inline_sha256 TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS drafts_slug ON drafts (slug);
+CREATE INDEX IF NOT EXISTS drafts_publish_date ON drafts (publish_date);
+"""
+
+_COLUMNS = ['draft_path', 'slug', 'title', 'tag_type', 'category', 'publish_date', 'read_time_minutes',
+            'draft_sha256', 'draft_mtime_ns', 'draft_size',
+            'hero_src', 'hero_sha256', 'inline_src', 'inline_sha256', 'updated_at']
+
+
+def _scalar(value: Any) -> Tuple[Any, bool]:
+    """
+    A front matter value as a TEXT column stores it.
+
+    Returns:
+        (value, ok): dates become YYYY-MM-DD, other scalars text; a list or
+        mapping gives (None, False)
+    """
+    if value is None:
+        return None, True
+    if isinstance(value, date):
+        return value.isoformat(), True
+    if isinstance(value, (str, int, float, bool)):
+        return str(value), True
+    return None, False
+
+
+class DraftsCatalog:
+    """Incrementally maintained SQLite index of the drafts folder (thread-safe)."""
+
+    def __init__(self, db_path: Path, resources_dir: Path,
+                 log_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        Open (or create) the catalog.
+
+        Args:
+            db_path: SQLite file (e.g. .cache/drafts-catalog.sqlite3)
+            resources_dir: The repo's resources/ folder
+            log_callback: log(message, level) for front matter values that
+                cannot be stored
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.db_path = Path(db_path)
+        self.resources_dir = Path(resources_dir)
+        self.drafts_dir = self.resources_dir / 'drafts'
+        self.log_callback = log_callback
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                # A cache: an old layout is simply rebuilt
+                self._conn.execute('DROP TABLE IF EXISTS drafts')
+                self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def log(self, message: str, level: str = 'info'):
+        if self.log_callback:
+            self.log_callback(message, level)
+
+    # --- Reading drafts --------------------------------------------------
+
+    def _rel(self, path: Path) -> str:
+        return Path(path).relative_to(self.resources_dir).as_posix()
+
+    def _image_hash(self, src: Optional[str]) -> Optional[str]:
+        if not src:
+            return None
+        try:
+            return file_sha256(self.resources_dir / src)
+        except OSError:
+            return None
+
+    def _row_from_file(self, md_path: Path, draft_sha256: Optional[str] = None,
+                       image_hashes: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Build a row from a draft on disk (None if it has no usable front matter)."""
+        stat = md_path.stat()
+        block = read_front_matter(md_path)
+        if block is None or not block.closed:
+            return None
+        try:
+            front_matter = load_yaml(block.yaml_text)
+        except yaml.YAMLError:
+            return None
+        if not isinstance(front_matter, dict):
+            return None
+
+        # Coerce each stored value to a scalar; one bad field only blanks that column
+        values, skipped = {}, []
+        hero = front_matter.get('hero') if isinstance(front_matter.get('hero'), dict) else {}
+        inline = front_matter.get('inlineImage') if isinstance(front_matter.get('inlineImage'), dict) else {}
+        for column, field, raw in (('slug', 'slug', front_matter.get('slug')),
+                                   ('title', 'title', front_matter.get('title')),
+                                   ('tag_type', 'tagType', front_matter.get('tagType')),
+                                   ('category', 'category', front_matter.get('category')),
+                                   ('publish_date', 'publishDate', front_matter.get('publishDate')),
+                                   ('hero_src', 'hero.src', hero.get('src')),
+                                   ('inline_src', 'inlineImage.src', inline.get('src'))):
+            values[column], ok = _scalar(raw)
+            if not ok:
+                skipped.append(f"{field} ({type(raw).__name__})")
+        if skipped:
+            self.log(f"Drafts catalog: {md_path.name}: not stored, not a single value: "
+                     f"{', '.join(skipped)}", 'warning')
+
+        image_hashes = image_hashes or {}
+        hero_src = values['hero_src']
+        inline_src = values['inline_src']
+        read_time = front_matter.get('readTimeMinutes')
+        return {
+            'draft_path': self._rel(md_path),
+            'slug': values['slug'] or md_path.stem,
+            'title': values['title'],
+            'tag_type': values['tag_type'],
+            'category': values['category'],
+            'publish_date': values['publish_date'],
+            'read_time_minutes': read_time if isinstance(read_time, int) and not isinstance(read_time, bool) else None,
+            'draft_sha256': draft_sha256 or file_sha256(md_path),
+            'draft_mtime_ns': stat.st_mtime_ns,
+            'draft_size': stat.st_size,
+            'hero_src': hero_src,
+            'hero_sha256': image_hashes.get(hero_src) or self._image_hash(hero_src),
+            'inline_src': inline_src,
+            'inline_sha256': image_hashes.get(inline_src) or self._image_hash(inline_src),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def _upsert(self, row: Dict[str, Any]):
+        placeholders = ', '.join('?' for _ in _COLUMNS)
+        self._conn.execute(f"INSERT OR REPLACE INTO drafts ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                           [row[c] for c in _COLUMNS])
+
+    # --- Updates ---------------------------------------------------------
+
+    def update_draft(self, md_path: Path, draft_sha256: Optional[str] = None,
+                     image_hashes: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Record the current state of one draft (removes its row if the file is gone).
+
+        Args:
+            md_path: resources/drafts/<slug>.md
+            draft_sha256: Known hash of the draft (saves re-reading it)
+            image_hashes: Known hashes by front matter src ('images/<name>')
+
+        Returns:
+            True if the draft is in the catalog afterwards
+        """
+        md_path = Path(md_path)
+        try:
+            row = self._row_from_file(md_path, draft_sha256, image_hashes)
+        except (OSError, UnicodeDecodeError):
+            row = None
+        with self._lock, self._conn:
+            if row is None:
+                self._conn.execute('DELETE FROM drafts WHERE draft_path = ?', (self._rel(md_path),))
+                return False
+            self._upsert(row)
+            return True
+
+    def sync(self, full: bool = False) -> Tuple[int, int]:
+        """
+        Bring the catalog in line with drafts/ on disk.
+
+        Only drafts whose (mtime, size) differ from their row are re-read,
+        unless full is set.
+
+        Returns:
+            (rows updated, rows removed)
+        """
+        on_disk = {}
+        try:
+            with os.scandir(self.drafts_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith('.md'):
+                        stat = entry.stat()
+                        on_disk[f"drafts/{entry.name}"] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+
+        with self._lock:
+            known = {r['draft_path']: (r['draft_mtime_ns'], r['draft_size'])
+                     for r in self._conn.execute('SELECT draft_path, draft_mtime_ns, draft_size FROM drafts')}
+        changed = [rel for rel, stamp in on_disk.items() if full or known.get(rel) != stamp]
+        removed = [rel for rel in known if rel not in on_disk]
+
+        updated = 0
+        for rel in sorted(changed):
+            if self.update_draft(self.resources_dir / rel):
+                updated += 1
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM drafts WHERE draft_path = ?', [(rel,) for rel in removed])
+        return updated, len(removed)
+
+    def rebuild(self) -> int:
+        """
+        Drop every row and re-read all drafts.
+
+        Returns:
+            Number of drafts catalogued
+        """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM drafts')
+        updated, _ = self.sync(full=True)
+        return updated
+
+    # --- Queries -----------------------------------------------------------
+
+    def _select(self, where: str = '', params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(f'SELECT * FROM drafts {where}', params).fetchall()
+        return [dict(r) for r in rows]
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        """
+        The row for a slug, or None.
+
+        If several drafts claim the slug, drafts/<slug>.md wins, then the
+        first by path (see by_slug() for all of them).
+        """
+        rows = self.by_slug(slug)
+        for row in rows:
+            if row['draft_path'] == f"drafts/{slug}.md":
+                return row
+        return rows[0] if rows else None
+
+    def by_slug(self, slug: str) -> List[Dict[str, Any]]:
+        """Every draft whose front matter claims slug, by path."""
+        return self._select('WHERE slug = ? ORDER BY draft_path', (slug,))
+
+    def exists(self, slug: str) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM drafts WHERE slug = ?', (slug,)).fetchone() is not None
+
+    def publishing_on(self, day: str) -> List[Dict[str, Any]]:
+        """Drafts whose publishDate is day (YYYY-MM-DD)."""
+        return self._select('WHERE publish_date = ? ORDER BY slug, draft_path', (day,))
+
+    def publishing_between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """Drafts with start <= publishDate <= end, by date."""
+        return self._select('WHERE publish_date BETWEEN ? AND ? ORDER BY publish_date, slug, draft_path',
+                            (start, end))
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self._select('ORDER BY publish_date, slug, draft_path')
@@ -0,0 +1,236 @@
+"""
+Fox Fuel Resource Loader - Persistent Generator Worker
+
+Client for scripts/generator-worker.js, a long-lived node process that
+serves render and index requests over a JSON-lines stdin/stdout protocol.
+
+Handles:
+- Starting the worker once per session (node startup paid once)
+- Bounded number of in-flight requests
+- Restart-on-crash with a per-session restart budget
+- Per-request timeouts (a wedged worker is killed and restarted)
+"""
+
+import json
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, List, Dict, Any, Callable
+
+
+class GeneratorWorkerError(Exception):
+    """Raised when the generator worker cannot serve a request."""
+    pass
+
+
+class GeneratorWorker:
+    """Long-lived node generator process shared by every ingest in a session."""
+
+    # Seconds to wait for a single render/index request
+    REQUEST_TIMEOUT = 120
+
+    def __init__(self, repo_root: Path, log_callback: Optional[Callable[[str, str], None]] = None,
+                 max_in_flight: int = 2, max_restarts: int = 3):
+        """
+        Initialize the worker client (the process starts on first use).
+
+        Args:
+            repo_root: Path to the repository root
+            log_callback: Optional callback for logging (message, level)
+            max_in_flight: Maximum concurrent requests sent to the worker
+            max_restarts: How many times a crashed worker is restarted per session
+        """
+        self.repo_root = Path(repo_root)
+        self.script_path = self.repo_root / 'scripts' / 'generator-worker.js'
+        self.log_callback = log_callback or (lambda msg, lvl: print(f"[{lvl}] {msg}"))
+        self.max_restarts = max_restarts
+        self.restarts = 0
+
+        self._process: Optional[subprocess.Popen] = None
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()  # Guards process lifecycle, ids and pending
+        self._write_lock = threading.Lock()
+        self._next_id = 1
+        self._pending: Dict[int, Dict[str, Any]] = {}
+
+    def log(self, message: str, level: str = 'info'):
+        """Log a message."""
+        self.log_callback(message, level)
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker process is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Start the worker process if it is not already running."""
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self):
+        if self.running:
+            return
+        if not self.script_path.exists():
+            raise GeneratorWorkerError(f"Generator worker script not found: {self.script_path}")
+
+        try:
+            self._process = subprocess.Popen(
+                ['node', str(self.script_path)],
+                cwd=str(self.repo_root),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding='utf-8',
+                bufsize=1
+            )
+        except OSError as e:
+            raise GeneratorWorkerError(f"Failed to start generator worker: {e}")
+
+        process = self._process
+        threading.Thread(target=self._read_stdout, args=(process,), daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(process,), daemon=True).start()
+        self.log(f"Generator worker started (pid {process.pid})", 'info')
+
+    def stop(self):
+        """Stop the worker process (closing stdin lets it exit cleanly)."""
+        with self._lock:
+            process = self._process
+            self._process = None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except Exception:
+            process.kill()
+        self.log("Generator worker stopped", 'info')
+
+    def _read_stdout(self, process: subprocess.Popen):
+        """Dispatch response lines to waiting requests; fail them all on exit."""
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                self.log(f"Generator worker: unexpected output: {line.rstrip()}", 'warning')
+                continue
+            with self._lock:
+                waiter = self._pending.get(message.get('id'))
+            if waiter:
+                waiter['response'] = message
+                waiter['event'].set()
+
+        # EOF: the process exited (crash, kill or stop)
+        with self._lock:
+            for waiter in self._pending.values():
+                if waiter['process'] is process and not waiter['event'].is_set():
+                    waiter['crashed'] = True
+                    waiter['event'].set()
+
+    def _read_stderr(self, process: subprocess.Popen):
+        """Forward worker stderr to the log."""
+        for line in process.stderr:
+            if line.strip():
+                self.log(f"Generator worker stderr: {line.rstrip()}", 'warning')
+
+    def request(self, cmd: str, timeout: Optional[float] = None, **params) -> Dict[str, Any]:
+        """
+        Send one request and wait for its response.
+
+        A request interrupted by a worker crash is retried once after the
+        worker restarts (render and index are idempotent).
+
+        Returns:
+            The response dict ({'id', 'ok', 'output', 'result' | 'error'})
+
+        Raises:
+            GeneratorWorkerError: On timeout, or if the worker cannot be (re)started
+        """
+        timeout = timeout or self.REQUEST_TIMEOUT
+        with self._slots:
+            for attempt in range(2):
+                response = self._send(cmd, timeout, params)
+                if response is not None:
+                    return response
+                self.log(f"Generator worker crashed during '{cmd}' - restarting", 'warning')
+            raise GeneratorWorkerError(f"Generator worker crashed twice during '{cmd}'")
+
+    def _send(self, cmd: str, timeout: float, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send a request; returns None if the worker crashed before answering."""
+        with self._lock:
+            if not self.running:
+                if self._process is not None:
+                    # Previously started process died
+                    if self.restarts >= self.max_restarts:
+                        raise GeneratorWorkerError(
+                            f"Generator worker restart limit reached ({self.max_restarts})"
+                        )
+                    self.restarts += 1
+                    self._process = None
+                self._start_locked()
+            request_id = self._next_id
+            self._next_id += 1
+            waiter = {'event': threading.Event(), 'process': self._process, 'response': None, 'crashed': False}
+            self._pending[request_id] = waiter
+            process = self._process
+
+        try:
+            line = json.dumps({'id': request_id, 'cmd': cmd, **params})
+            try:
+                with self._write_lock:
+                    process.stdin.write(line + '\n')
+                    process.stdin.flush()
+            except (OSError, ValueError):
+                # Broken pipe: the worker is dying; make sure it is gone
+                # without blocking on a process that never exits
+                process.kill()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+                return None
+
+            if not waiter['event'].wait(timeout):
+                self.log(f"Generator worker timed out after {timeout}s on '{cmd}' - killing it", 'error')
+                process.kill()
+                raise GeneratorWorkerError(f"Generator worker timed out on '{cmd}'")
+
+            if waiter['crashed']:
+                return None
+            return waiter['response']
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def render(self, slugs: Optional[List[str]] = None, force: bool = False,
+               timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        Render stale drafts (plus the given slugs).
+
+        Args:
+            timeout: Seconds before the worker is killed (default REQUEST_TIMEOUT)
+
+        Returns:
+            Tuple of (success, output)
+        """
+        response = self.request('render', timeout, slugs=list(slugs or []), force=force)
+        return self._to_result(response)
+
+    def regenerate_index(self, timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        Regenerate resources/index.html.
+
+        Args:
+            timeout: Seconds before the worker is killed (default REQUEST_TIMEOUT)
+
+        Returns:
+            Tuple of (success, output)
+        """
+        return self._to_result(self.request('index', timeout))
+
+    @staticmethod
+    def _to_result(response: Dict[str, Any]) -> Tuple[bool, str]:
+        output = response.get('output', '')
+        if response.get('ok'):
+            return True, output
+        return False, f"{output}\n{response.get('error', '')}".strip()
@@ -0,0 +1,253 @@
+"""
+Fox Fuel Resource Loader - Git Outbox
+
+Commits are made locally right away and recorded in an outbox
+(tools/resource_loader/tmp/outbox.json); a background thread pushes them.
+A failed push is retried with exponential backoff (5s, 10s, 20s, ... up
+to 5 min), every push has a timeout and never prompts for credentials, so
+a flaky connection can no longer hang the loader. All commits waiting in
+the outbox go out in one `git push`.
+
+The outbox survives restarts: entries left by a previous session are
+pushed by the next one (entries the remote already has are dropped).
+"""
+
+import os
+import json
+import time
+import threading
+import subprocess
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable
+
+
+@dataclass
+class OutboxStatus:
+    """Snapshot of the outbox for status displays."""
+    pending: int = 0  # Commits waiting to be pushed
+    state: str = 'idle'  # idle, pushing, waiting (backoff) or stopped
+    attempts: int = 0  # Failed attempts since the last successful push
+    retry_in: float = 0.0  # Seconds until the next attempt (state 'waiting')
+    last_error: str = ''
+    last_pushed: str = ''  # Time of the last successful push
+
+    def describe(self) -> str:
+        """One-line summary (GUI status label)."""
+        if not self.pending:
+            return f"Pushed {self.last_pushed}" if self.last_pushed else "Nothing to push"
+        commits = f"{self.pending} commit{'s' if self.pending != 1 else ''}"
+        if self.state == 'pushing':
+            return f"Pushing {commits}..."
+        if self.state == 'waiting':
+            return f"{commits} queued - push failed, retry in {self.retry_in:.0f}s"
+        return f"{commits} queued"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return asdict(self)
+
+
+class GitOutbox:
+    """Persistent queue of local commits and the thread that pushes them."""
+
+    BASE_DELAY = 5.0  # Seconds before the first retry
+    MAX_DELAY = 300.0
+    PUSH_TIMEOUT = 120  # Seconds before a hanging push is killed
+
+    def __init__(self, repo_root: Path, state_path: Optional[Path] = None,
+                 log_callback: Optional[Callable[[str, str], None]] = None,
+                 status_callback: Optional[Callable[[OutboxStatus], None]] = None):
+        """
+        Args:
+            repo_root: Repository to push
+            state_path: Outbox file (default tools/resource_loader/tmp/outbox.json)
+            log_callback: log(message, level); may be called from the push thread
+            status_callback: Receives an OutboxStatus on every change (push thread)
+        """
+        self.repo_root = Path(repo_root)
+        self.state_path = state_path or self.repo_root / 'tools' / 'resource_loader' / 'tmp' / 'outbox.json'
+        self.log_callback = log_callback
+        self.status_callback = status_callback
+
+        self._cond = threading.Condition()
+        self._entries: List[Dict[str, Any]] = self._load()
+        self._status = OutboxStatus(pending=len(self._entries))
+        self._next_attempt = 0.0  # time.monotonic() of the next push attempt
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def log(self, message: str, level: str = 'info'):
+        if self.log_callback:
+            self.log_callback(message, level)
+
+    # --- Persistence ----------------------------------------------------
+
+    def _load(self) -> List[Dict[str, Any]]:
+        try:
+            data = json.loads(self.state_path.read_text(encoding='utf-8'))
+            return list(data.get('entries', []))
+        except (OSError, ValueError):
+            return []
+
+    def _save(self):
+        """Write the outbox atomically (caller holds the lock)."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({'version': 1, 'entries': self._entries}, indent=2), encoding='utf-8')
+        os.replace(tmp, self.state_path)
+
+    # --- Queue ----------------------------------------------------------
+
+    def enqueue(self, sha: str, message: str):
+        """Record a local commit to be pushed and wake the push thread."""
+        with self._cond:
+            self._entries.append({
+                'sha': sha,
+                'message': message,
+                'queuedAt': datetime.now().isoformat(timespec='seconds'),
+            })
+            self._save()
+            # During a backoff the commit joins the next attempt's push
+            self._update_status(pending=len(self._entries))
+            self._cond.notify_all()
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Commits waiting to be pushed (oldest first)."""
+        with self._cond:
+            return [dict(entry) for entry in self._entries]
+
+    def status(self) -> OutboxStatus:
+        with self._cond:
+            status = OutboxStatus(**asdict(self._status))
+            if status.state == 'waiting':
+                status.retry_in = max(0.0, self._next_attempt - time.monotonic())
+            return status
+
+    def push_now(self):
+        """Skip the current backoff wait and retry immediately."""
+        with self._cond:
+            self._next_attempt = 0.0
+            self._cond.notify_all()
+
+    def _update_status(self, **changes):
+        """Apply status changes and notify (caller holds the lock)."""
+        for key, value in changes.items():
+            setattr(self._status, key, value)
+        if self.status_callback:
+            status = OutboxStatus(**asdict(self._status))
+            if status.state == 'waiting':
+                status.retry_in = max(0.0, self._next_attempt - time.monotonic())
+            self.status_callback(status)
+
+    # --- Pushing --------------------------------------------------------
+
+    def _git(self, args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        env = dict(os.environ, GIT_TERMINAL_PROMPT='0')  # Fail instead of waiting for a password
+        return subprocess.run(['git', *args], cwd=str(self.repo_root), capture_output=True,
+                              text=True, encoding='utf-8', timeout=timeout, env=env)
+
+    def _drop_pushed(self):
+        """Forget entries the upstream already contains (e.g. pushed by hand or a previous session)."""
+        with self._cond:
+            entries = list(self._entries)
+        pushed = set()
+        for entry in entries:
+            try:
+                result = self._git(['merge-base', '--is-ancestor', entry['sha'], '@{upstream}'], timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                return
+            if result.returncode == 0:
+                pushed.add(entry['sha'])
+        if pushed:
+            with self._cond:
+                self._entries = [e for e in self._entries if e['sha'] not in pushed]
+                self._save()
+                self._update_status(pending=len(self._entries))
+
+    def push_once(self) -> bool:
+        """
+        Push every queued commit in one `git push`.
+
+        Returns:
+            True if the outbox is empty afterwards
+        """
+        with self._cond:
+            batch = [entry['sha'] for entry in self._entries]
+            if not batch:
+                return True
+            self._update_status(state='pushing')
+
+        started = time.perf_counter()
+        try:
+            result = self._git(['push'], timeout=self.PUSH_TIMEOUT)
+            error = result.stderr.strip() if result.returncode != 0 else ''
+        except subprocess.TimeoutExpired:
+            error = f"git push timed out after {self.PUSH_TIMEOUT}s"
+        except OSError as e:
+            error = f"git push failed: {e}"
+
+        with self._cond:
+            if not error:
+                # Commits queued while pushing may not have been included
+                self._entries = [e for e in self._entries if e['sha'] not in batch]
+                self._save()
+                self._next_attempt = 0.0
+                self._update_status(pending=len(self._entries), state='idle', attempts=0, last_error='',
+                                    last_pushed=datetime.now().strftime('%H:%M:%S'))
+                self.log(f"Pushed {len(batch)} commit(s) in {time.perf_counter() - started:.1f}s", 'success')
+                return not self._entries
+
+            attempts = self._status.attempts + 1
+            delay = min(self.MAX_DELAY, self.BASE_DELAY * 2 ** (attempts - 1))
+            self._next_attempt = time.monotonic() + delay
+            self._update_status(state='waiting', attempts=attempts, last_error=error)
+            summary = error.splitlines()[0] if error else 'unknown error'
+            self.log(f"Push failed (attempt {attempts}, retry in {delay:.0f}s): {summary}", 'warning')
+            return False
+
+    def flush(self, timeout: float) -> bool:
+        """
+        Push now from the calling thread, retrying with backoff until timeout (headless use).
+
+        Returns:
+            True if every queued commit was pushed
+        """
+        deadline = time.monotonic() + timeout
+        self._drop_pushed()
+        while True:
+            if self.push_once():
+                return True
+            with self._cond:
+                wait = self._next_attempt - time.monotonic()
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(max(0.0, wait))
+
+    def _run(self):
+        self._drop_pushed()
+        while True:
+            with self._cond:
+                while not self._stopping and (not self._entries or time.monotonic() < self._next_attempt):
+                    timeout = None if not self._entries else self._next_attempt - time.monotonic()
+                    self._cond.wait(timeout)
+                if self._stopping:
+                    self._update_status(state='stopped')
+                    return
+            self.push_once()
+
+    def start(self):
+        """Start the push thread (pending entries from earlier sessions are pushed first)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='git-outbox', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the push thread; queued commits stay in the outbox for the next session."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,253 @@
+"""
+Fox Fuel Resource Loader - Ingest Worktrees
+
+Isolated ingest: a bundle is ingested in its own temporary git worktree
+(tools/resource_loader/tmp/worktrees/<name>, a sparse checkout of
+resources/ and scripts/) on a branch ingest/<name> started from HEAD. The
+user's checkout is not touched until the bundle has passed every check:
+
+- success: the bundle's files are committed on the branch, the branch is
+  rebased onto HEAD if another ingest landed first, and HEAD is
+  fast-forwarded to it
+- failure: the worktree and its branch are deleted (no file-by-file rollback)
+
+Every ingest rewrites resources/index.html and resources/image-variants.json,
+so a rebase onto another ingest conflicts there. Both are rebuilt instead
+of merged: the variant manifest is the union of both sides' entries and
+the index is regenerated by regenerate-index.js from the rebased drafts.
+"""
+
+import os
+import re
+import json
+import shutil
+import threading
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Callable
+
+from journal import pid_alive
+
+BRANCH_PREFIX = 'ingest/'
+SPARSE_PATTERNS = ['/resources/', '/scripts/']
+VARIANT_MANIFEST = 'resources/image-variants.json'
+INDEX_PAGE = 'resources/index.html'
+GENERATOR_CACHE = Path('.cache') / 'generate-resources.json'
+
+# Sparse checkout is switched on per command rather than in the worktree's
+# config, which would need extensions.worktreeConfig in the user's repo.
+# Only commands run inside the worktree get it, never the user's checkout.
+_SPARSE_CONFIG = ['-c', 'core.sparseCheckout=true', '-c', 'core.sparseCheckoutCone=false']
+
+
+class WorktreeError(Exception):
+    """A worktree could not be created, committed or merged back."""
+    pass
+
+
+def worktrees_root(repo_root: Path) -> Path:
+    return Path(repo_root) / 'tools' / 'resource_loader' / 'tmp' / 'worktrees'
+
+
+class IngestWorktree:
+    """One temporary worktree and branch for one ingest."""
+
+    # Merge-backs move HEAD of the user's checkout: one at a time
+    _merge_lock = threading.Lock()
+
+    INDEX_TIMEOUT = 120  # Seconds for regenerate-index.js during a rebase
+
+    def __init__(self, repo_root: Path, name: str, log: Optional[Callable[[str, str], None]] = None):
+        self.repo_root = Path(repo_root)
+        self.name = name
+        self.path = worktrees_root(self.repo_root) / name
+        self.branch = f"{BRANCH_PREFIX}{name}"
+        self.base: Optional[str] = None  # Commit the branch started from
+        self.log_callback = log
+
+    def log(self, message: str, level: str = 'info'):
+        if self.log_callback:
+            self.log_callback(message, level)
+
+    # --- git ---------------------------------------------------------------
+
+    def _git(self, args: List[str], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None,
+             check: Optional[str] = None) -> subprocess.CompletedProcess:
+        """
+        Run git in the worktree (or cwd).
+
+        Args:
+            cwd: Directory to run in (default: the worktree); the sparse
+                checkout settings apply only in the worktree
+            check: Raise WorktreeError with this description if git fails
+
+        Raises:
+            WorktreeError: If check is set and git exits non-zero
+        """
+        cwd = Path(cwd) if cwd else self.path
+        sparse = _SPARSE_CONFIG if cwd == self.path else []
+        result = subprocess.run(['git', *sparse, *args], cwd=str(cwd),
+                                capture_output=True, text=True, encoding='utf-8',
+                                env=dict(os.environ, **env) if env else None)
+        if check and result.returncode != 0:
+            raise WorktreeError(f"{check}: {(result.stderr or result.stdout).strip()}")
+        return result
+
+    def _head(self, cwd: Path) -> str:
+        return self._git(['rev-parse', 'HEAD'], cwd=cwd, check='git rev-parse failed').stdout.strip()
+
+    # --- Lifecycle ---------------------------------------------------------
+
+    @classmethod
+    def create(cls, repo_root: Path, label: str,
+               log: Optional[Callable[[str, str], None]] = None) -> 'IngestWorktree':
+        """
+        Check out HEAD of repo_root into a new worktree on its own branch.
+
+        Args:
+            repo_root: The user's checkout
+            label: Readable part of the worktree/branch name (e.g. the bundle folder)
+            log: Optional log(message, level)
+
+        Raises:
+            WorktreeError: If git cannot create the worktree
+        """
+        safe_label = re.sub(r'[^A-Za-z0-9._-]+', '-', label).strip('-.') or 'ingest'
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        worktree = cls(repo_root, f"{safe_label}-{timestamp}-{os.getpid()}", log)
+        worktree._create()
+        return worktree
+
+    def _create(self):
+        self.base = self._head(self.repo_root)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._git(['worktree', 'add', '--no-checkout', '-b', self.branch, str(self.path), self.base],
+                  cwd=self.repo_root, check='git worktree add failed')
+        try:
+            sparse_file = Path(self._git(['rev-parse', '--git-path', 'info/sparse-checkout'],
+                                         check='git rev-parse failed').stdout.strip())
+            if not sparse_file.is_absolute():
+                sparse_file = self.path / sparse_file
+            sparse_file.parent.mkdir(parents=True, exist_ok=True)
+            sparse_file.write_text(''.join(f"{p}\n" for p in SPARSE_PATTERNS), encoding='utf-8')
+            self._git(['checkout'], check='git checkout failed')
+
+            # Start from the main checkout's build cache: only the new draft renders
+            cache = self.repo_root / GENERATOR_CACHE
+            if cache.exists():
+                (self.path / GENERATOR_CACHE).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(cache, self.path / GENERATOR_CACHE)
+        except (WorktreeError, OSError):
+            self.remove()
+            raise
+        self.log(f"Worktree: {self.path.relative_to(self.repo_root).as_posix()} ({self.branch})", 'info')
+
+    def remove(self, keep_branch: bool = False):
+        """Delete the worktree (and the branch unless keep_branch)."""
+        self._git(['worktree', 'remove', '--force', str(self.path)], cwd=self.repo_root)
+        if self.path.exists():
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._git(['worktree', 'prune'], cwd=self.repo_root)
+        if not keep_branch:
+            self._git(['branch', '-D', self.branch], cwd=self.repo_root)
+
+    @classmethod
+    def prune(cls, repo_root: Path, log: Optional[Callable[[str, str], None]] = None) -> List[str]:
+        """
+        Remove worktrees left behind by ingests whose process is gone (crash, kill).
+
+        Returns:
+            Names of the removed worktrees
+        """
+        removed = []
+        root = worktrees_root(repo_root)
+        try:
+            names = sorted(e.name for e in os.scandir(root) if e.is_dir())
+        except OSError:
+            return removed
+        for name in names:
+            pid = name.rsplit('-', 1)[-1]
+            if pid.isdigit() and pid_alive(int(pid)):
+                continue
+            cls(repo_root, name, log).remove()
+            removed.append(name)
+        if removed and log:
+            log(f"Removed {len(removed)} abandoned ingest worktree(s)", 'warning')
+        return removed
+
+    # --- Commit and merge back ---------------------------------------------
+
+    def commit(self, message: str) -> bool:
+        """
+        Commit everything the ingest changed under resources/ on the worktree's branch.
+
+        Returns:
+            False if there was nothing to commit
+
+        Raises:
+            WorktreeError: If git add or commit fails
+        """
+        self._git(['add', '-A', '--', 'resources'], check='git add failed')
+        if self._git(['diff', '--cached', '--quiet']).returncode == 0:
+            return False
+        self._git(['commit', '-m', message], check='git commit failed')
+        return True
+
+    def merge_back(self) -> str:
+        """
+        Fast-forward the user's HEAD to the branch (rebasing it first if HEAD moved).
+
+        Returns:
+            The new HEAD commit
+
+        Raises:
+            WorktreeError: If the rebase has conflicts outside the rebuilt files,
+                or the checkout has local changes the fast-forward would overwrite
+        """
+        with self._merge_lock:
+            head = self._head(self.repo_root)
+            if head != self.base:
+                self.log(f"HEAD moved since {self.base[:8]}: rebasing {self.branch}", 'info')
+                self._rebase(head)
+            self._git(['merge', '--ff-only', self.branch], cwd=self.repo_root,
+                      check=f"Fast-forward to {self.branch} failed")
+            return self._head(self.repo_root)
+
+    def _rebase(self, onto: str):
+        result = self._git(['rebase', onto])
+        if result.returncode == 0:
+            return
+        conflicted = [p for p in self._git(['diff', '--name-only', '--diff-filter=U']).stdout.splitlines() if p]
+        unexpected = [p for p in conflicted if p not in (VARIANT_MANIFEST, INDEX_PAGE)]
+        if not conflicted or unexpected:
+            self._git(['rebase', '--abort'])
+            raise WorktreeError(f"Rebase onto {onto[:8]} failed: "
+                                f"{', '.join(unexpected) or result.stderr.strip()}")
+        try:
+            if VARIANT_MANIFEST in conflicted:
+                self._union_variant_manifest()
+            if INDEX_PAGE in conflicted:
+                self._regenerate_index()
+            self._git(['add', '--', *conflicted], check='git add failed')
+            self._git(['rebase', '--continue'], env={'GIT_EDITOR': 'true'}, check='git rebase --continue failed')
+        except (WorktreeError, OSError, ValueError, subprocess.TimeoutExpired):
+            self._git(['rebase', '--abort'])
+            raise
+
+    def _union_variant_manifest(self):
+        """Both sides' variant entries (stage 2: HEAD being rebased onto, stage 3: this ingest)."""
+        manifest = json.loads(self._git(['show', f':2:{VARIANT_MANIFEST}'], check='git show failed').stdout)
+        ours = json.loads(self._git(['show', f':3:{VARIANT_MANIFEST}'], check='git show failed').stdout)
+        manifest.setdefault('images', {}).update(ours.get('images', {}))
+        content = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+        (self.path / VARIANT_MANIFEST).write_bytes(content.encode('utf-8'))
+
+    def _regenerate_index(self):
+        """Rebuild index.html from HEAD's page and the rebased drafts, as a sequential ingest would."""
+        self._git(['checkout', '--ours', '--', INDEX_PAGE], check='git checkout failed')
+        result = subprocess.run(['node', str(self.path / 'scripts' / 'regenerate-index.js')],
+                                cwd=str(self.path), capture_output=True, text=True, encoding='utf-8',
+                                errors='replace', timeout=self.INDEX_TIMEOUT)
+        if result.returncode != 0:
+            raise WorktreeError(f"regenerate-index.js failed: {result.stderr.strip()}")
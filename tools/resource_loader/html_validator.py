@@ -0,0 +1,234 @@
+"""
+Fox Fuel Resource Loader - Generated HTML Validator
+
+Checks a generated resource page against the publish-gate rules in one
+streaming html.parser pass. Every rule sees the same start/end tag events,
+so adding a rule does not add another scan of the document (and there are
+no backtracking regexes over the whole page).
+
+Findings carry a rule id and the line/column of the offending tag.
+"""
+
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict
+
+# Read size for validate_file (the parser is fed incrementally)
+CHUNK_SIZE = 64 * 1024
+
+SITE_URL = 'https://pro.foxfuel.com'
+
+Attrs = Dict[str, Optional[str]]
+
+
+@dataclass
+class Finding:
+    """One rule violation."""
+    rule: str
+    message: str
+    line: int = 0  # 1-based; 0 when the finding is about the whole page
+    column: int = 0  # 1-based
+
+    def __str__(self) -> str:
+        if self.line:
+            return f"{self.message} (line {self.line}, col {self.column})"
+        return self.message
+
+
+def class_tokens(attrs: Attrs) -> List[str]:
+    """Class names of an element."""
+    return (attrs.get('class') or '').split()
+
+
+class Rule:
+    """
+    Base class for validation rules.
+
+    Subclasses override start()/end() to watch tags and finish() to report
+    whole-page findings once the document is parsed.
+    """
+
+    rule_id = ''
+
+    def __init__(self):
+        self.findings: List[Finding] = []
+
+    def report(self, message: str, pos: Tuple[int, int] = (0, -1)):
+        self.findings.append(Finding(self.rule_id, message, pos[0], pos[1] + 1))
+
+    def start(self, tag: str, attrs: Attrs, pos: Tuple[int, int]):
+        pass
+
+    def end(self, tag: str, pos: Tuple[int, int]):
+        pass
+
+    def finish(self):
+        pass
+
+
+class ExactlyOneClassRule(Rule):
+    """Exactly one element carries a class (e.g. .article-header)."""
+
+    def __init__(self, rule_id: str, class_name: str):
+        super().__init__()
+        self.rule_id = rule_id
+        self.class_name = class_name
+        self.positions: List[Tuple[int, int]] = []
+
+    def start(self, tag, attrs, pos):
+        if self.class_name in class_tokens(attrs):
+            self.positions.append(pos)
+
+    def finish(self):
+        if len(self.positions) != 1:
+            pos = self.positions[1] if len(self.positions) > 1 else (0, -1)
+            self.report(f"Expected exactly 1 .{self.class_name}, found {len(self.positions)}", pos)
+
+
+class CanonicalRule(Rule):
+    """<link rel="canonical"> points at the page's own URL (and, if required, exists)."""
+
+    rule_id = 'canonical-url'
+
+    def __init__(self, expected: str, required: bool = False):
+        super().__init__()
+        self.expected = expected
+        self.required = required
+        self.found = False
+
+    def start(self, tag, attrs, pos):
+        if tag == 'link' and 'canonical' in (attrs.get('rel') or '').split():
+            self.found = True
+            if attrs.get('href') != self.expected:
+                self.report(f"Canonical link URL mismatch (expected: {self.expected})", pos)
+
+    def finish(self):
+        if self.required and not self.found:
+            self.report(f"Canonical link missing (expected: {self.expected})")
+
+
+class RequiredClassRule(Rule):
+    """At least one element carries a class (e.g. the page's tag type)."""
+
+    def __init__(self, rule_id: str, class_name: str, message: str):
+        super().__init__()
+        self.rule_id = rule_id
+        self.class_name = class_name
+        self.message = message
+        self.found = False
+
+    def start(self, tag, attrs, pos):
+        if not self.found and self.class_name in class_tokens(attrs):
+            self.found = True
+
+    def finish(self):
+        if not self.found:
+            self.report(self.message)
+
+
+class NoH1InBodyRule(Rule):
+    """No <h1> inside <article class="content-body"> (the title is in the header)."""
+
+    rule_id = 'no-h1-in-body'
+
+    def __init__(self):
+        super().__init__()
+        self.depth = 0  # <article> nesting depth inside the content body
+        self.positions: List[Tuple[int, int]] = []
+
+    def start(self, tag, attrs, pos):
+        if tag == 'article':
+            if self.depth or 'content-body' in class_tokens(attrs):
+                self.depth += 1
+        elif tag == 'h1' and self.depth:
+            self.positions.append(pos)
+
+    def end(self, tag, pos):
+        if tag == 'article' and self.depth:
+            self.depth -= 1
+
+    def finish(self):
+        if self.positions:
+            self.report(f"Found {len(self.positions)} H1 tag(s) inside article body (should be 0)",
+                        self.positions[0])
+
+
+def resource_page_rules(slug: str, tag_type: str = '', require_canonical: bool = False) -> List[Rule]:
+    """
+    The publish-gate rules for resources/<slug>.html.
+
+    Args:
+        slug: Page slug (canonical URL)
+        tag_type: Expected resource-card__tag--<tagType> class (skipped if empty)
+        require_canonical: Also fail pages without a canonical link (as the CI gate does)
+    """
+    rules: List[Rule] = [
+        ExactlyOneClassRule('single-article-header', 'article-header'),
+        ExactlyOneClassRule('single-hero-image', 'article-hero-image'),
+        CanonicalRule(f"{SITE_URL}/resources/{slug}.html", require_canonical),
+        NoH1InBodyRule(),
+    ]
+    if tag_type:
+        tag_class = f"resource-card__tag--{tag_type}"
+        rules.append(RequiredClassRule('tag-class', tag_class, f"Missing tag class: {tag_class}"))
+    return rules
+
+
+class _RuleParser(HTMLParser):
+    """Dispatches tag events to every rule."""
+
+    def __init__(self, rules: List[Rule]):
+        super().__init__(convert_charrefs=True)
+        self.rules = rules
+
+    def handle_starttag(self, tag, attrs):
+        attr_map = dict(attrs)
+        pos = self.getpos()
+        for rule in self.rules:
+            rule.start(tag, attr_map, pos)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        pos = self.getpos()
+        for rule in self.rules:
+            rule.end(tag, pos)
+
+
+class HtmlValidator:
+    """Incremental validator: feed() chunks, then close() for the findings."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self._parser = _RuleParser(rules)
+
+    def feed(self, chunk: str):
+        self._parser.feed(chunk)
+
+    def close(self) -> List[Finding]:
+        """Finish parsing and return every rule's findings, ordered by position."""
+        self._parser.close()
+        findings = []
+        for rule in self.rules:
+            rule.finish()
+            findings.extend(rule.findings)
+        return sorted(findings, key=lambda f: (f.line == 0, f.line, f.column))
+
+
+def validate_html(content: str, rules: List[Rule]) -> List[Finding]:
+    """Validate an HTML string."""
+    validator = HtmlValidator(rules)
+    validator.feed(content)
+    return validator.close()
+
+
+def validate_file(path: Path, rules: List[Rule]) -> List[Finding]:
+    """Validate an HTML file, reading it in chunks."""
+    validator = HtmlValidator(rules)
+    with open(path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+            validator.feed(chunk)
+    return validator.close()
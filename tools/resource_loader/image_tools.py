@@ -0,0 +1,257 @@
+"""
+Fox Fuel Resource Loader - Image Optimization
+
+Handles:
+- Capping the longest edge (never below the pipeline's minimum width)
+- Stripping EXIF/XMP/text metadata (orientation is applied first)
+- Re-encoding to WebP or AVIF, falling back to the source format
+- Responsive width variants ({stem}-480.webp, ...) for srcset
+- Content-addressed cache keyed by source hash + settings
+- Running several images in parallel in a shared process pool
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from PIL import Image, ImageOps, features
+
+from staging import file_sha256, clone_file
+
+
+# Output formats: file extension and Pillow format name
+FORMAT_EXTENSIONS = {'webp': '.webp', 'avif': '.avif'}
+ORIGINAL_FORMATS = {'.png': 'PNG', '.jpg': 'JPEG', '.jpeg': 'JPEG'}
+
+# Responsive width ladder (variants wider than the optimized image are skipped)
+VARIANT_WIDTHS = [480, 768, 1024, 1600]
+
+# Bump when the encoding logic changes so cached outputs are rebuilt
+CACHE_VERSION = 1
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def resolve_image_format(requested: str) -> str:
+    """
+    Return the output format actually available in this Pillow build.
+
+    AVIF falls back to WebP, WebP falls back to 'original' (re-encode in
+    the source format).
+    """
+    if requested == 'avif' and features.check('avif'):
+        return 'avif'
+    if requested in ('avif', 'webp') and features.check('webp'):
+        return 'webp'
+    return 'original'
+
+
+def format_bytes(size: int) -> str:
+    """Human-readable byte count."""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.2f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+def optimize_image(src: str, dest_stem: str, image_format: str, quality: int,
+                   max_edge: int, min_width: int = 0, widths: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    Optimize one image and write it (and its width variants) next to dest_stem.
+
+    Runs in a worker process, so it takes and returns plain picklable values.
+
+    Args:
+        src: Source image path
+        dest_stem: Destination path without extension
+        image_format: 'webp', 'avif' or 'original' (see resolve_image_format)
+        quality: Encoder quality (1-100)
+        max_edge: Longest edge in pixels after resizing
+        min_width: Never scale the width below this
+        widths: Variant widths to write as {dest_stem}-{width}{ext}
+
+    Returns:
+        Dict with path, format, width, height, src_bytes, out_bytes and
+        variants (list of dicts with path, width, height, bytes)
+    """
+    src_path = Path(src)
+    src_ext = src_path.suffix.lower()
+
+    with Image.open(src_path) as opened:
+        # Apply EXIF orientation before the EXIF block is dropped
+        img = ImageOps.exif_transpose(opened)
+        icc_profile = opened.info.get('icc_profile')
+
+        width, height = img.size
+        scale = min(1.0, max_edge / max(width, height))
+        if min_width and width >= min_width:
+            scale = max(scale, min_width / width)
+        if scale < 1.0:
+            img = img.resize((round(width * scale), round(height * scale)), Image.LANCZOS)
+
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+        # New pixel data carries no EXIF/XMP/text chunks; keep only the colour profile
+        save_args: Dict[str, Any] = {}
+        if icc_profile:
+            save_args['icc_profile'] = icc_profile
+
+        if image_format in FORMAT_EXTENSIONS:
+            ext = FORMAT_EXTENSIONS[image_format]
+            pil_format = image_format.upper()
+            save_args['quality'] = quality
+            if image_format == 'webp':
+                save_args['method'] = 6  # Slowest/smallest encoder setting
+        else:
+            ext = '.jpg' if src_ext == '.jpeg' else src_ext
+            pil_format = ORIGINAL_FORMATS.get(src_ext, 'PNG')
+            if pil_format == 'JPEG':
+                if has_alpha:
+                    img = img.convert('RGB')
+                save_args.update(quality=quality, optimize=True, progressive=True)
+            else:
+                save_args.update(optimize=True)
+
+        dest = Path(f"{dest_stem}{ext}")
+        img.save(dest, pil_format, **save_args)
+
+        variants = []
+        full_width, full_height = img.size
+        for width in sorted(set(widths or [])):
+            if width >= full_width:
+                continue
+            variant_path = Path(f"{dest_stem}-{width}{ext}")
+            variant_height = round(full_height * width / full_width)
+            img.resize((width, variant_height), Image.LANCZOS).save(variant_path, pil_format, **save_args)
+            variants.append({
+                'path': str(variant_path),
+                'width': width,
+                'height': variant_height,
+                'bytes': variant_path.stat().st_size,
+            })
+
+        return {
+            'path': str(dest),
+            'format': pil_format.lower(),
+            'width': full_width,
+            'height': full_height,
+            'src_bytes': src_path.stat().st_size,
+            'out_bytes': dest.stat().st_size,
+            'variants': variants,
+        }
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared process pool (one per process, sized to the CPU count)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 2)
+        return _pool
+
+
+def _cache_key(job: Dict[str, Any], source_hash: str) -> str:
+    """Cache key: source bytes plus every setting that affects the output."""
+    settings = {k: v for k, v in job.items() if k not in ('src', 'dest_stem')}
+    settings['widths'] = sorted(set(settings.get('widths') or []))
+    payload = json.dumps({'v': CACHE_VERSION, 'source': source_hash, 'settings': settings}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _restore_from_cache(entry_dir: Path, dest_stem: str) -> Optional[Dict[str, Any]]:
+    """
+    Copy a cached image set to dest_stem; None on a cache miss.
+
+    Outputs are reflinked or copied, never hardlinked: a hardlink would
+    share one inode between the cache and the published image.
+    """
+    meta_path = entry_dir / 'result.json'
+    if not meta_path.exists():
+        return None
+    try:
+        result = json.loads(meta_path.read_text(encoding='utf-8'))
+        ext = Path(result['path']).suffix
+        dest = Path(f"{dest_stem}{ext}")
+        clone_file(entry_dir / f"full{ext}", dest, allow_hardlink=False)
+        result['path'] = str(dest)
+        for variant in result['variants']:
+            variant_path = Path(f"{dest_stem}-{variant['width']}{ext}")
+            clone_file(entry_dir / f"w{variant['width']}{ext}", variant_path, allow_hardlink=False)
+            variant['path'] = str(variant_path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return result
+
+
+def _store_in_cache(entry_dir: Path, result: Dict[str, Any]):
+    """Save an image set under its cache key (best effort; reflink or copy, as above)."""
+    try:
+        tmp_dir = entry_dir.with_name(f"{entry_dir.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        ext = Path(result['path']).suffix
+        clone_file(Path(result['path']), tmp_dir / f"full{ext}", allow_hardlink=False)
+        for variant in result['variants']:
+            clone_file(Path(variant['path']), tmp_dir / f"w{variant['width']}{ext}", allow_hardlink=False)
+        (tmp_dir / 'result.json').write_text(json.dumps(result, indent=2), encoding='utf-8')
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def optimize_images(jobs: List[Dict[str, Any]], cache_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Optimize several images in parallel.
+
+    With cache_dir set, each job is keyed by the SHA-256 of its source plus
+    its settings; a hit copies the cached outputs instead of re-encoding.
+
+    Args:
+        jobs: keyword-argument dicts for optimize_image()
+        cache_dir: Optional content-addressed cache directory
+
+    Returns:
+        optimize_image() results, in job order, each with source_hash and
+        cached (True when served from the cache)
+    """
+    global _pool
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    entry_dirs: List[Optional[Path]] = [None] * len(jobs)
+    hashes = [file_sha256(Path(job['src'])) for job in jobs]
+
+    misses = []
+    for i, job in enumerate(jobs):
+        if cache_dir is not None:
+            entry_dirs[i] = Path(cache_dir) / _cache_key(job, hashes[i])
+            results[i] = _restore_from_cache(entry_dirs[i], job['dest_stem'])
+        if results[i] is None:
+            misses.append(i)
+        else:
+            results[i]['cached'] = True
+
+    if misses:
+        try:
+            pool = _get_pool()
+            futures = {i: pool.submit(optimize_image, **jobs[i]) for i in misses}
+            for i, future in futures.items():
+                results[i] = future.result()
+        except (BrokenProcessPool, OSError):
+            # No usable worker processes (e.g. restricted environment) - run inline
+            with _pool_lock:
+                _pool = None
+            for i in misses:
+                results[i] = optimize_image(**jobs[i])
+
+        for i in misses:
+            results[i]['cached'] = False
+            if entry_dirs[i] is not None:
+                _store_in_cache(entry_dirs[i], results[i])
+
+    for i, result in enumerate(results):
+        result['source_hash'] = hashes[i]
+    return results
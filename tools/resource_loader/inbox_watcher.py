@@ -0,0 +1,409 @@
+"""
+Fox Fuel Resource Loader - Inbox Watcher
+
+Watch mode for unattended ingest. Editors drop bundle folders (1 .md + 2
+images each) into an inbox; once a folder is complete and has had no file
+activity for the debounce window, it is ingested through
+IngestPipeline.ingest_batch() and moved to done/ or failed/ together with
+an ingest-result.json report.
+
+    inbox/
+    ├── winter-guide/        <- watched bundle
+    ├── done/winter-guide/   <- ingested (+ ingest-result.json)
+    └── failed/other-guide/  <- failed (+ ingest-result.json)
+
+Changes are picked up with inotify on Linux (ctypes, no extra package) and
+by polling folder listings elsewhere (Windows, network shares). Ready
+bundles are ingested in batches of at most max_batch with a bounded number
+of staging workers, and one generator run per batch, so a large drop is
+worked through in chunks.
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import select
+import shutil
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Set, Tuple, Callable
+
+from tracing import Tracer
+
+DONE_DIR = 'done'
+FAILED_DIR = 'failed'
+RESULT_FILE = 'ingest-result.json'
+
+
+def _is_ignored(name: str) -> bool:
+    """Hidden/partial files and the watcher's own output folders."""
+    return name in (DONE_DIR, FAILED_DIR) or name.startswith(('.', '~')) or name.endswith(('.tmp', '.part'))
+
+
+class PollingChangeSource:
+    """Reports bundle folders whose listing (names, sizes, mtimes) changed between scans."""
+
+    def __init__(self, inbox_dir: Path, interval: float = 2.0):
+        self.inbox_dir = Path(inbox_dir)
+        self.interval = interval
+        self._signatures: Dict[str, Tuple] = {}
+        self._last_scan = 0.0
+
+    def _signature(self, bundle_dir: Path) -> Tuple:
+        try:
+            with os.scandir(bundle_dir) as entries:
+                return tuple(sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns)
+                                    for e in entries if e.is_file()))
+        except OSError:
+            return ()
+
+    def _scan(self) -> Dict[str, Tuple]:
+        signatures = {}
+        try:
+            with os.scandir(self.inbox_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and not _is_ignored(entry.name):
+                        signatures[entry.name] = self._signature(Path(entry.path))
+        except OSError:
+            pass
+        return signatures
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Block up to timeout seconds (at least until the next scan is due).
+
+        Returns:
+            Names of bundle folders that appeared, changed or disappeared
+        """
+        delay = self._last_scan + self.interval - time.monotonic()
+        if delay > 0:
+            time.sleep(min(delay, max(timeout, 0)))
+            if time.monotonic() < self._last_scan + self.interval:
+                return set()
+        self._last_scan = time.monotonic()
+        signatures = self._scan()
+        changed = {name for name, sig in signatures.items() if self._signatures.get(name) != sig}
+        changed.update(name for name in self._signatures if name not in signatures)
+        self._signatures = signatures
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyChangeSource:
+    """
+    Reports bundle folders with file activity, from Linux inotify events.
+
+    Watches the inbox and every bundle folder in it (one level deep).
+
+    Raises:
+        OSError: From the constructor if inotify is unavailable
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+    _EVENT = struct.Struct('iIII')  # wd, mask, cookie, len
+
+    def __init__(self, inbox_dir: Path):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        import ctypes
+        import ctypes.util
+
+        self.inbox_dir = Path(inbox_dir)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._watches: Dict[int, str] = {}  # wd -> '' (inbox) or bundle folder name
+        self._rescan_needed = False
+        self._add_watch(self.inbox_dir, '')
+        self._watch_bundles()
+
+    def _add_watch(self, path: Path, name: str):
+        import ctypes
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if name == '':
+                raise OSError(err, f"Cannot watch {path}: {os.strerror(err)}")
+            return  # Bundle folder vanished or unreadable; picked up again on its next event
+        self._watches[wd] = name
+
+    def _watch_bundles(self) -> Set[str]:
+        """Watch every bundle folder in the inbox (re-adding a watch is harmless)."""
+        names = set()
+        try:
+            with os.scandir(self.inbox_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and not _is_ignored(entry.name):
+                        self._add_watch(Path(entry.path), entry.name)
+                        names.add(entry.name)
+        except OSError:
+            pass
+        return names
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Block up to timeout seconds for inotify events.
+
+        Returns:
+            Names of bundle folders that saw activity (all folders after a
+            queue overflow)
+        """
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                self._rescan_needed = True
+                continue
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            owner = self._watches.get(wd)
+            if owner is None:
+                continue
+            if owner and mask & (self.IN_MOVE_SELF | self.IN_DELETE_SELF):
+                # The watch would follow the folder into done/ or failed/
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._watches.pop(wd, None)
+                changed.add(owner)
+                continue
+            if owner == '':
+                # Event in the inbox itself: a bundle folder came or went
+                if not name or _is_ignored(name):
+                    continue
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_watch(self.inbox_dir / name, name)
+                    # Files written before the watch existed
+                    changed.add(name)
+                elif mask & self.IN_ISDIR:
+                    changed.add(name)
+            elif not _is_ignored(name):
+                changed.add(owner)
+
+        if self._rescan_needed:
+            self._rescan_needed = False
+            changed.update(self._watch_bundles())
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_change_source(inbox_dir: Path, poll_interval: float = 2.0, polling: bool = False,
+                         log: Optional[Callable[[str, str], None]] = None):
+    """
+    inotify where available, polling otherwise.
+
+    Args:
+        inbox_dir: Folder to watch
+        poll_interval: Seconds between scans when polling
+        polling: Force polling (e.g. inboxes on network shares, where inotify sees no remote writes)
+        log: Optional log callback
+    """
+    if not polling:
+        try:
+            return InotifyChangeSource(inbox_dir)
+        except (OSError, AttributeError) as e:
+            if log and sys.platform.startswith('linux'):
+                log(f"inotify unavailable ({e}) - polling every {poll_interval:g}s", 'warning')
+    return PollingChangeSource(inbox_dir, poll_interval)
+
+
+class InboxWatcher:
+    """Debounced auto-ingest of bundle folders dropped into an inbox."""
+
+    def __init__(self, pipeline, inbox_dir: Path, debounce: float = 5.0, max_workers: Optional[int] = None,
+                 max_batch: int = 10, force_overwrite: bool = False, poll_interval: float = 2.0,
+                 polling: bool = False):
+        """
+        Args:
+            pipeline: IngestPipeline used for every batch (its settings apply)
+            inbox_dir: Folder editors drop bundle folders into
+            debounce: Seconds a bundle must be complete and quiet before it is ingested
+            max_workers: Staging workers per batch
+            max_batch: Most bundles per batch (one generator run each)
+            force_overwrite: Overwrite existing slugs
+            poll_interval: Seconds between scans in polling mode
+            polling: Poll even where inotify is available
+        """
+        self.pipeline = pipeline
+        self.inbox_dir = Path(inbox_dir)
+        self.done_dir = self.inbox_dir / DONE_DIR
+        self.failed_dir = self.inbox_dir / FAILED_DIR
+        self.debounce = debounce
+        self.max_workers = max_workers
+        self.max_batch = max(1, max_batch)
+        self.force_overwrite = force_overwrite
+        self.poll_interval = poll_interval
+        self.polling = polling
+        self.stop_event = threading.Event()
+        self._pending: Dict[str, float] = {}  # Bundle name -> monotonic time of last activity
+        self.processed = 0
+        self.failed = 0
+
+    def log(self, message: str, level: str = 'info'):
+        self.pipeline.log(message, level)
+
+    def stop(self):
+        """Ask run() to return after the current batch."""
+        self.stop_event.set()
+
+    # --- Bundle state ---------------------------------------------------
+
+    def _bundle_state(self, bundle_dir: Path) -> Tuple[str, str]:
+        """
+        Whether a quiet bundle folder can be ingested.
+
+        Returns:
+            ('complete', ''), ('incomplete', reason) - keep waiting for files -
+            or ('invalid', reason) - more files than a bundle holds
+        """
+        try:
+            with os.scandir(bundle_dir) as entries:
+                names = [e.name for e in entries if e.is_file() and not _is_ignored(e.name)]
+        except OSError as e:
+            return 'incomplete', str(e)
+        md_count = sum(1 for n in names if n.lower().endswith('.md'))
+        image_count = sum(1 for n in names if Path(n).suffix.lower() in self.pipeline.IMAGE_EXTENSIONS)
+        if md_count > 1 or image_count > 2:
+            return 'invalid', f"Expected 1 markdown file and 2 images, found {md_count} and {image_count}"
+        if md_count < 1 or image_count < 2:
+            return 'incomplete', f"{md_count} markdown file(s), {image_count} image(s) so far"
+        return 'complete', ''
+
+    def _collect_ready(self, now: float) -> List[Path]:
+        """Quiet, complete bundles (invalid ones are moved to failed/ on the spot)."""
+        ready = []
+        for name, last_change in sorted(self._pending.items(), key=lambda item: item[1]):
+            if now - last_change < self.debounce:
+                continue
+            del self._pending[name]
+            bundle_dir = self.inbox_dir / name
+            if not bundle_dir.is_dir():
+                continue
+            state, reason = self._bundle_state(bundle_dir)
+            if state == 'complete':
+                ready.append(bundle_dir)
+            elif state == 'invalid':
+                self.log(f"Bundle {name}: {reason}", 'error')
+                self._finish(bundle_dir, {'bundle': str(bundle_dir), 'success': False,
+                                          'stage': 'watch', 'errors': [reason]})
+            else:
+                self.log(f"Bundle {name} not complete yet ({reason}) - waiting", 'info')
+        return ready
+
+    # --- Results ----------------------------------------------------------
+
+    def _finish(self, bundle_dir: Path, report: Dict):
+        """Move a bundle to done/ or failed/ and write its report."""
+        target_root = self.done_dir if report.get('success') else self.failed_dir
+        target_root.mkdir(parents=True, exist_ok=True)
+        target = target_root / bundle_dir.name
+        if target.exists():
+            target = target_root / f"{bundle_dir.name}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        report = dict(report, finishedAt=datetime.now().isoformat(timespec='seconds'))
+        try:
+            shutil.move(str(bundle_dir), str(target))
+            (target / RESULT_FILE).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        except OSError as e:
+            self.log(f"Could not move {bundle_dir.name} to {target_root.name}/: {e}", 'error')
+            return
+        if report.get('success'):
+            self.processed += 1
+        else:
+            self.failed += 1
+        self.log(f"  {bundle_dir.name} -> {target_root.name}/{target.name}",
+                 'success' if report.get('success') else 'warning')
+
+    def _ingest(self, bundles: List[Path]):
+        """Ingest ready bundles in batches of max_batch."""
+        for start in range(0, len(bundles), self.max_batch):
+            if self.stop_event.is_set():
+                return
+            chunk = bundles[start:start + self.max_batch]
+            # Pick up repo changes made since the last batch (git pull, Explorer)
+            self.pipeline.get_repo_index().refresh_if_changed()
+            # A fresh tracer per batch keeps a long-running watcher's memory flat
+            self.pipeline.tracer = Tracer()
+            results = self.pipeline.ingest_batch(chunk, self.force_overwrite, self.max_workers)
+            for result in results:
+                self._finish(result.bundle_dir, result.to_dict())
+
+    # --- Main loop ------------------------------------------------------
+
+    def run(self):
+        """
+        Watch until stop() (or KeyboardInterrupt).
+
+        Bundles already in the inbox are treated as just changed, so they
+        are ingested after one debounce window.
+
+        Raises:
+            OSError: If the inbox cannot be watched
+        """
+        self.inbox_dir.mkdir(parents=True, exist_ok=True)
+        source = create_change_source(self.inbox_dir, self.poll_interval, self.polling, self.log)
+        mode = 'inotify' if isinstance(source, InotifyChangeSource) else f"polling every {self.poll_interval:g}s"
+        self.log(f"Watching {self.inbox_dir} ({mode}, debounce {self.debounce:g}s, "
+                 f"batches of up to {self.max_batch})", 'info')
+
+        now = time.monotonic()
+        with os.scandir(self.inbox_dir) as entries:
+            for entry in entries:
+                if entry.is_dir() and not _is_ignored(entry.name):
+                    self._pending[entry.name] = now
+        try:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                if self._pending:
+                    timeout = max(0.05, min(self.debounce - (now - t) for t in self._pending.values()))
+                    timeout = min(timeout, 1.0)
+                else:
+                    timeout = 1.0  # Wake up regularly to notice stop()
+                for name in source.wait(timeout):
+                    self._pending[name] = time.monotonic()
+                ready = self._collect_ready(time.monotonic())
+                if ready:
+                    self._ingest(ready)
+        finally:
+            source.close()
+            self.log(f"Watcher stopped: {self.processed} ingested, {self.failed} failed", 'info')
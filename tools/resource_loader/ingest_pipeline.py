@@ -2,29 +2,69 @@
 Fox Fuel Resource Loader - Ingest Pipeline
 
 Handles:
-- YAML front matter parsing and validation
+- YAML front matter parsing (bounded head scan, libyaml) and validation
 - Image validation (dimensions, file size)
-- Slug collision detection
+- Slug collision detection against an in-memory repo index
+- Manifest/template configuration snapshot revalidated by (mtime, size)
 - Atomic staging with rollback
 - HTML generation via node scripts
-- Post-generation validation
+- Post-generation validation (single-pass rule engine)
 - Temp bundle creation with normalized filenames
 - UTF-8 (no BOM) and LF newline encoding
+- Batch ingest of many bundle folders with a single generator run
+- Headless command-line entry point (python -m ingest_pipeline)
+- Optional persistent generator worker shared across ingests
+- Image optimization (resize, strip metadata, WebP/AVIF) at staging
+- Responsive image variants (width ladder) recorded in resources/image-variants.json
+- Single-pass hash-while-copy staging with atomic, reflink/hardlink placement
+- Write-ahead rollback journal with startup recovery of interrupted ingests
+- Stage/generator/git timing spans with Chrome trace or JSON Lines export
+- Parallel site-wide publish-gate validation (validate-all)
+- SQLite drafts catalog (.cache/drafts-catalog.sqlite3) synced with drafts/
+- Publish calendar: index preview for any date via regenerate-index.js
+- Watch-folder auto-ingest with debounce (watch)
+- Local HTTP ingest service with a job queue (serve)
+- Git status, add and commit scoped to the files an ingest touched
+- Background push outbox with retry and backoff
+- Session commits grouping several ingests into one commit
+- Streamed generator output with a timeout sized by the drafts count
+- Optional per-bundle git worktrees fast-forwarded into HEAD
 """
 
 import os
 import re
+import sys
 import json
+import argparse
+import multiprocessing
 import shutil
+import signal
+import sqlite3
 import subprocess
 import tempfile
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime, date
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any, Callable
+from typing import Optional, Tuple, List, Dict, Any, Callable, Set
 
 import yaml
 from PIL import Image
 
+from generator_worker import GeneratorWorker, GeneratorWorkerError
+from image_tools import optimize_images, resolve_image_format, format_bytes, VARIANT_WIDTHS
+from staging import copy_with_hash, write_with_hash, place_file, UNCHANGED
+from journal import IngestJournal
+from tracing import Tracer
+from repo_index import RepoIndex
+from repo_config import RepoConfigCache, RepoConfigError
+from drafts_catalog import DraftsCatalog
+from git_outbox import GitOutbox
+from html_validator import Finding, validate_file, resource_page_rules
+from front_matter import read_front_matter, split_front_matter, read_body, load_yaml, DEFAULT_MAX_BYTES
+
 
 class IngestError(Exception):
     """Custom exception for ingest pipeline errors."""
@@ -45,6 +85,62 @@ class PreGeneratorValidationError(Exception):
     pass
 
 
+class IngestCancelledError(IngestError):
+    """Raised at the next stage boundary after cancel() was requested."""
+    pass
+
+
+@dataclass
+class BundleResult:
+    """Outcome of ingesting one bundle folder during a batch run."""
+    bundle_dir: Path
+    slug: str = ''
+    success: bool = False
+    stage: str = ''  # Last pipeline stage attempted
+    errors: List[str] = field(default_factory=list)
+    staged_files: List[Path] = field(default_factory=list)
+    commit: str = ''  # Commit the bundle landed as (worktree ingests)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            'bundle': str(self.bundle_dir),
+            'slug': self.slug,
+            'success': self.success,
+            'stage': self.stage,
+            'errors': list(self.errors),
+            'stagedFiles': [str(p) for p in self.staged_files],
+            'commit': self.commit,
+        }
+
+
+@dataclass
+class FileValidation:
+    """Outcome of validating one draft, page or manifest entry in validate_all()."""
+    path: Path
+    kind: str  # 'draft', 'page' or 'manifest'
+    slug: str = ''
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    tag_type: str = ''
+    publish_date: str = ''
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            'path': str(self.path),
+            'kind': self.kind,
+            'slug': self.slug,
+            'success': self.success,
+            'errors': list(self.errors),
+            'warnings': list(self.warnings),
+        }
+
+
 def slugify(text: str) -> str:
     """
     Convert text to URL-safe slug.
@@ -81,17 +177,17 @@ def normalize_newlines(text: str) -> str:
     return text.replace('\r\n', '\n').replace('\r', '\n')
 
 
-def write_utf8_lf(path: Path, content: str):
+def write_utf8_lf(path: Path, content: str) -> str:
     """
     Write text to file with:
     - UTF-8 encoding (no BOM)
     - LF newlines only
+
+    Returns:
+        SHA-256 hex digest of the written bytes
     """
-    # Normalize newlines to LF
-    content = normalize_newlines(content)
-    # Write with explicit encoding and newline handling
-    with open(path, 'w', encoding='utf-8', newline='\n') as f:
-        f.write(content)
+    # Normalize newlines to LF, encode explicitly (no BOM)
+    return write_with_hash(normalize_newlines(content).encode('utf-8'), path)
 
 
 def ensure_front_matter(md_text: str, front_matter_dict: Dict[str, Any]) -> str:
@@ -112,12 +208,10 @@ def ensure_front_matter(md_text: str, front_matter_dict: Dict[str, Any]) -> str:
     md_text = strip_bom(md_text)
     md_text = normalize_newlines(md_text)
 
-    # Check if front matter already exists
-    if md_text.lstrip().startswith('---'):
-        # Already has front matter - verify it's valid
-        match = re.match(r'^---\s*\n(.*?)\n---\s*\n', md_text.lstrip(), re.DOTALL)
-        if match:
-            return md_text  # Valid front matter exists
+    # Check if front matter already exists (opening and closing fence)
+    block = split_front_matter(md_text.lstrip())
+    if block and block.closed:
+        return md_text  # Valid front matter exists
 
     # No valid front matter - prepend it
     yaml_str = yaml.dump(front_matter_dict, default_flow_style=False, allow_unicode=True, sort_keys=False)
@@ -143,28 +237,22 @@ def assert_yaml_front_matter(path: Path, max_chars: int = 2000) -> Tuple[bool, s
     if not path.exists():
         return False, f"File does not exist: {path}"
 
+    # Only the file head is read (BOM skipped, fences found line by line)
     try:
-        content = path.read_text(encoding='utf-8')
-    except Exception as e:
+        block = read_front_matter(path, max_chars)
+    except (OSError, UnicodeDecodeError) as e:
         return False, f"Cannot read file: {e}"
 
-    # Strip BOM if present
-    content = strip_bom(content)
-
     # Must start with ---
-    if not content.startswith('---\n') and not content.startswith('---\r\n'):
+    if block is None:
         return False, f"File does not start with '---\\n': {path.name}"
 
-    # Find closing --- within max_chars
-    search_content = content[:max_chars]
-    # Find the second occurrence of ---
-    first_end = search_content.find('\n---', 3)  # Start after opening ---
-    if first_end == -1:
+    # Closing --- within max_chars
+    if not block.closed:
         return False, f"No closing '---' found within first {max_chars} chars: {path.name}"
 
     # Verify there's content between the delimiters
-    yaml_content = content[4:first_end].strip()
-    if not yaml_content:
+    if not block.yaml_text.strip():
         return False, f"Empty YAML front matter in: {path.name}"
 
     return True, ""
@@ -184,6 +272,24 @@ class IngestPipeline:
     # Minimum image width
     MIN_IMAGE_WIDTH = 1024
 
+    # Image extensions accepted for hero/inline images
+    IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg']
+
+    # Image optimization defaults (see image_tools.py)
+    IMAGE_FORMATS = ['webp', 'avif', 'original']
+    DEFAULT_IMAGE_FORMAT = 'webp'
+    DEFAULT_IMAGE_QUALITY = 82
+    MAX_IMAGE_EDGE = 2400
+
+    # Generator script timeout: base + per draft in drafts/, capped at
+    # generator_timeout_ceiling (seconds)
+    GENERATOR_TIMEOUT_BASE = 30
+    GENERATOR_TIMEOUT_PER_DRAFT = 0.5
+    DEFAULT_GENERATOR_TIMEOUT_CEILING = 600
+
+    # Serializes read-modify-write of the image variant manifest across batch workers
+    _variant_manifest_lock = threading.Lock()
+
     def __init__(self, repo_root: Path, log_callback: Optional[Callable[[str, str], None]] = None):
         """
         Initialize the pipeline.
@@ -202,6 +308,13 @@ class IngestPipeline:
         self.images_dir = self.resources_dir / 'images'
         self.scripts_dir = self.repo_root / 'scripts'
         self.manifest_path = self.resources_dir / 'resources.manifest.json'
+        self.variant_manifest_path = self.resources_dir / 'image-variants.json'
+        self.index_path = self.resources_dir / 'index.html'
+        self.journal_root = self.repo_root / 'tools' / 'resource_loader' / 'tmp' / 'journal'
+        # Same folder as git_worktree.worktrees_root()
+        self.worktrees_dir = self.repo_root / 'tools' / 'resource_loader' / 'tmp' / 'worktrees'
+        self.image_cache_dir = self.repo_root / '.cache' / 'image-variants'
+        self.drafts_catalog_path = self.repo_root / '.cache' / 'drafts-catalog.sqlite3'
 
         # State
         self.front_matter: Dict[str, Any] = {}
@@ -211,34 +324,109 @@ class IngestPipeline:
         self.hero_image_path: Optional[Path] = None
         self.inline_image_path: Optional[Path] = None
         self.staged_files: List[Path] = []
-        self.backup_files: Dict[Path, bytes] = {}
+        self.journal: Optional[IngestJournal] = None  # Open staging transaction
+        self.file_hashes: Dict[str, str] = {}  # Temp bundle file name -> SHA-256
         self.temp_bundle_dir: Optional[Path] = None
         self.yaml_was_injected: bool = False
         self.keep_temp_folder: bool = False
         self.debug_mode: bool = False  # Set from GUI
 
+        # Image optimization settings (applied by stage_files)
+        self.optimize_images: bool = True
+        self.image_format: str = self.DEFAULT_IMAGE_FORMAT
+        self.image_quality: int = self.DEFAULT_IMAGE_QUALITY
+        self.max_image_edge: int = self.MAX_IMAGE_EDGE
+        self.variant_widths: List[int] = list(VARIANT_WIDTHS)  # Empty disables variants
+        self.generator_timeout_ceiling: float = self.DEFAULT_GENERATOR_TIMEOUT_CEILING
+        self.hero_ext: str = ''  # Extensions of the staged images
+        self.inline_ext: str = ''
+        self.image_variants: Dict[str, Dict[str, Any]] = {}  # Variant manifest entries for this bundle
+        self.html_findings: List[Finding] = []  # Structured results of validate_generated_html
+
+        # Persistent node generator (optional; shared across ingests in a session)
+        self.generator_worker: Optional[GeneratorWorker] = None
+
+        # Manifest/template snapshot and slug/file index (shared with batch
+        # children and GUI sessions; see repo_config.py and repo_index.py)
+        self.repo_config = RepoConfigCache(self.resources_dir)
+        self.repo_index: Optional[RepoIndex] = None
+
+        # SQLite catalog of drafts (opened on first use; see drafts_catalog.py)
+        self.drafts_catalog: Optional[DraftsCatalog] = None
+
+        # Repo files changed by completed ingests (from their journals); git
+        # status/add/commit are scoped to these paths
+        self.touched_paths: Set[Path] = set()
+        # Resources those ingests added (slug -> publishDate). In session
+        # commit mode both carry over to the next pipeline (carry_session())
+        # and commit_session() commits them all in one commit and one push
+        self.session_resources: Dict[str, str] = {}
+
+        # Stage progress and cancellation (used by background workers)
+        self.progress_callback: Optional[Callable[[str], None]] = None
+        # (drafts processed, drafts found) while generate-resources.js runs
+        self.generator_progress_callback: Optional[Callable[[int, int], None]] = None
+        self.cancel_event = threading.Event()
+
+        # Timing spans (shared with batch children; see tracing.py)
+        self.tracer = Tracer()
+        self._stage_span: Optional[Dict[str, Any]] = None
+
         # Original source paths (from any location on disk)
         self.original_md_path: Optional[Path] = None
         self.original_hero_path: Optional[Path] = None
         self.original_inline_path: Optional[Path] = None
 
+    # Pipeline stages in execution order (reported through progress_callback)
+    STAGES = ['parse', 'validate_front_matter', 'validate_images', 'collision_check',
+              'stage', 'pre_generator', 'generate', 'validate_html', 'done']
+
     def log(self, message: str, level: str = 'info'):
         """Log a message."""
         self.log_callback(message, level)
 
+    def cancel(self):
+        """Request cancellation; takes effect at the next stage boundary."""
+        self.cancel_event.set()
+
+    def enter_stage(self, stage: str):
+        """
+        Mark the start of a pipeline stage.
+
+        Raises:
+            IngestCancelledError: If cancellation was requested
+        """
+        if self.cancel_event.is_set():
+            raise IngestCancelledError(f"Ingest cancelled before stage: {stage}")
+        # Each stage is timed until the next one starts (or the step returns)
+        self._end_stage_span()
+        if stage != 'done':
+            self._stage_span = self.tracer.begin(stage, 'stage', self.log, slug=self.slug)
+        if self.progress_callback:
+            self.progress_callback(stage)
+
+    def _end_stage_span(self):
+        """Close the timing span of the current stage, if any."""
+        if self._stage_span is not None:
+            span, self._stage_span = self._stage_span, None
+            self.tracer.end(span)
+
+    def span(self, name: str, category: str = 'stage', **args):
+        """Time a block (see Tracer.span); the timing line goes to this pipeline's log."""
+        return self.tracer.span(name, category, self.log, **args)
+
     def _load_manifest(self) -> Dict[str, Any]:
-        """Load the resources manifest."""
-        if not self.manifest_path.exists():
-            raise IngestError(f"Manifest not found: {self.manifest_path}")
-        with open(self.manifest_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """The resources manifest (cached; re-read only after it changes)."""
+        try:
+            return self.repo_config.get().manifest
+        except RepoConfigError as e:
+            raise IngestError(str(e))
 
     def _get_valid_tag_types(self) -> List[str]:
         """Get valid tagTypes from manifest."""
         try:
-            manifest = self._load_manifest()
-            return list(manifest.get('categoryTags', {}).keys())
-        except Exception:
+            return self.repo_config.get().tag_types
+        except RepoConfigError:
             return self.VALID_TAG_TYPES
 
     def parse_markdown(self, md_path: Path) -> Tuple[Dict[str, Any], str]:
@@ -250,28 +438,32 @@ class IngestPipeline:
 
         Raises:
             MissingFrontMatterError: If no front matter found (signals need for user input)
-            IngestError: If front matter is invalid
+            IngestError: If front matter is invalid or the file is not UTF-8
         """
         self.log(f"Parsing markdown: {md_path.name}")
         self.original_md_path = md_path
 
-        content = md_path.read_text(encoding='utf-8')
-        # Strip BOM and normalize newlines
-        content = strip_bom(content)
-        content = normalize_newlines(content)
-
-        # Match YAML front matter
-        match = re.match(r'^---\s*\n(.*?)\n---\s*\n(.*)', content, re.DOTALL)
-        if not match:
-            # No front matter - extract H1 title if present and raise special error
-            extracted_title = extract_h1_title(content)
-            raise MissingFrontMatterError(md_path, content, extracted_title)
-
-        yaml_str = match.group(1)
-        body = match.group(2)
+        try:
+            # Find the fences by reading only the head of the file
+            block = read_front_matter(md_path)
+            if block is None:
+                # No front matter - extract H1 title if present and raise special error
+                content = normalize_newlines(strip_bom(md_path.read_text(encoding='utf-8')))
+                extracted_title = extract_h1_title(content)
+                raise MissingFrontMatterError(md_path, content, extracted_title)
+            if not block.closed:
+                raise IngestError(f"Front matter has no closing '---' within the first "
+                                  f"{DEFAULT_MAX_BYTES // 1024} KB of {md_path.name}")
+            body = normalize_newlines(read_body(md_path, block.body_offset))
+        except UnicodeDecodeError as e:
+            raise IngestError(f"{md_path.name} is not valid UTF-8 (byte {e.start}); "
+                              f"save the markdown file as UTF-8")
+
+        yaml_str = block.yaml_text
+        content = f"---\n{yaml_str}\n---\n{body}"
 
         try:
-            front_matter = yaml.safe_load(yaml_str)
+            front_matter = load_yaml(yaml_str)
         except yaml.YAMLError as e:
             raise IngestError(f"Invalid YAML front matter: {e}")
 
@@ -429,6 +621,41 @@ class IngestPipeline:
         # No clear mapping - ambiguous
         return None, None, True
 
+    def find_bundle_files(self, bundle_dir: Path) -> Tuple[Path, Path, Path]:
+        """
+        Locate the markdown, hero and inline files inside a bundle folder.
+
+        A bundle folder holds exactly 1 markdown file and 2 images whose
+        roles can be detected from their filenames.
+
+        Returns:
+            Tuple of (md_path, hero_path, inline_path)
+
+        Raises:
+            IngestError: If the folder does not hold a complete, unambiguous bundle
+        """
+        bundle_dir = Path(bundle_dir)
+        if not bundle_dir.is_dir():
+            raise IngestError(f"Bundle folder not found: {bundle_dir}")
+
+        files = sorted(p for p in bundle_dir.iterdir() if p.is_file())
+        md_files = [p for p in files if p.suffix.lower() == '.md']
+        img_files = [p for p in files if p.suffix.lower() in self.IMAGE_EXTENSIONS]
+
+        if len(md_files) != 1:
+            raise IngestError(f"Expected exactly 1 markdown file in {bundle_dir.name}, found {len(md_files)}")
+        if len(img_files) != 2:
+            raise IngestError(f"Expected exactly 2 images in {bundle_dir.name}, found {len(img_files)}")
+
+        hero_path, inline_path, ambiguous = self.detect_image_roles(img_files)
+        if ambiguous:
+            raise IngestError(
+                f"Cannot determine image roles in {bundle_dir.name}: "
+                "name one image with 'header'/'hero' or 'inline'"
+            )
+
+        return md_files[0], hero_path, inline_path
+
     def check_slug_collision(self, slug: str, force_overwrite: bool = False) -> List[str]:
         """
         Check if slug conflicts with existing files.
@@ -442,17 +669,18 @@ class IngestPipeline:
         draft_path = self.drafts_dir / f"{slug}.md"
         html_path = self.resources_dir / f"{slug}.html"
 
-        # Check for any image with the slug prefix
-        header_patterns = list(self.images_dir.glob(f"{slug}-header.*"))
-        inline_patterns = list(self.images_dir.glob(f"{slug}-inline.*"))
-
+        # Answered from the repo index (no directory scans per bundle)
+        index = self.get_repo_index()
         existing = []
-        if draft_path.exists():
-            existing.append(f"drafts/{slug}.md")
-        if html_path.exists():
-            existing.append(f"{slug}.html")
-        existing.extend([f"images/{p.name}" for p in header_patterns])
-        existing.extend([f"images/{p.name}" for p in inline_patterns])
+        if index.has_draft(slug):
+            existing.append(f"drafts/{draft_path.name}")
+        if index.has_html(slug):
+            existing.append(html_path.name)
+        # Check for any image with the slug prefix (including width variants)
+        existing.extend([f"images/{p.name}" for p in self._existing_image_files(slug)])
+        # Published before drafts existed: the new draft would replace its index card
+        if index.is_legacy(slug) and not existing:
+            existing.append(f"{self.manifest_path.name} (legacy entry)")
 
         if existing:
             if force_overwrite:
@@ -471,6 +699,7 @@ class IngestPipeline:
         This method:
         1. Creates a temp bundle folder: tools/resource_loader/tmp/<slug>-<timestamp>/
         2. Copies source files to temp bundle with normalized names
+           (images are optimized on the way when optimize_images is set)
         3. Injects YAML front matter if missing
         4. Updates image paths in front matter
         5. Copies finalized files to repo destinations
@@ -506,22 +735,17 @@ class IngestPipeline:
             self.drafts_dir.mkdir(parents=True, exist_ok=True)
             self.images_dir.mkdir(parents=True, exist_ok=True)
 
-            # Get image extensions
-            hero_ext = hero_path.suffix.lower()
-            inline_ext = inline_path.suffix.lower()
+            # Copy (or optimize) images to temp bundle with normalized names (preserves originals)
+            temp_hero, temp_inline = self._stage_images_into_bundle(slug, hero_path, inline_path, temp_bundle_dir)
+            hero_ext = temp_hero.suffix
+            inline_ext = temp_inline.suffix
+            self.hero_ext = hero_ext
+            self.inline_ext = inline_ext
 
             # Normalized filenames
             normalized_md_name = f"{slug}.md"
-            normalized_hero_name = f"{slug}-header{hero_ext}"
-            normalized_inline_name = f"{slug}-inline{inline_ext}"
-
-            # Copy images to temp bundle with normalized names (preserves originals)
-            temp_hero = temp_bundle_dir / normalized_hero_name
-            temp_inline = temp_bundle_dir / normalized_inline_name
-            shutil.copy2(hero_path, temp_hero)
-            shutil.copy2(inline_path, temp_inline)
-            self.log(f"  Copied hero -> {normalized_hero_name}", 'info')
-            self.log(f"  Copied inline -> {normalized_inline_name}", 'info')
+            normalized_hero_name = temp_hero.name
+            normalized_inline_name = temp_inline.name
 
             # Update front matter with correct image paths (relative to resources/)
             self.front_matter['hero']['src'] = f"images/{normalized_hero_name}"
@@ -535,7 +759,7 @@ class IngestPipeline:
 
             # Write markdown to temp bundle with UTF-8 (no BOM) and LF newlines
             temp_md = temp_bundle_dir / normalized_md_name
-            write_utf8_lf(temp_md, updated_md)
+            self.file_hashes[normalized_md_name] = write_utf8_lf(temp_md, updated_md)
             self.log(f"  Created {normalized_md_name} (UTF-8, LF)", 'info')
 
             if self.yaml_was_injected:
@@ -543,28 +767,56 @@ class IngestPipeline:
             else:
                 self.log("  YAML front matter: PRESERVED (was in source)", 'success')
 
+            # Width variants produced alongside the optimized images
+            variant_names = [variant['file'] for entry in self.image_variants.values()
+                             for variant in entry['variants']]
+
+            # Open the rollback journal; nothing in the repo changes before this
+            self._begin_journal(slug)
+
             # Backup existing files if force_overwrite
             if force_overwrite:
-                self._backup_existing_files(slug, hero_ext, inline_ext)
+                self._backup_existing_files(slug, {normalized_hero_name, normalized_inline_name, *variant_names})
+            self._journal_generated_files(slug)
 
-            # === Copy finalized files to repo destinations ===
+            # === Place finalized files at repo destinations ===
             self.log("=== Final Destination Paths ===", 'info')
 
-            final_md = self.drafts_dir / normalized_md_name
-            final_hero = self.images_dir / normalized_hero_name
-            final_inline = self.images_dir / normalized_inline_name
-
-            self.log(f"  drafts/{normalized_md_name}", 'info')
-            self.log(f"  images/{normalized_hero_name}", 'info')
-            self.log(f"  images/{normalized_inline_name}", 'info')
-
-            # Copy from temp bundle to final destinations
-            shutil.copy2(temp_md, final_md)
-            shutil.copy2(temp_hero, final_hero)
-            shutil.copy2(temp_inline, final_inline)
-
-            self.staged_files = [final_md, final_hero, final_inline]
-            self.log(f"Staged 3 files for slug: {slug}", 'success')
+            placements = [(temp_md, self.drafts_dir / normalized_md_name)]
+            placements.extend((temp_bundle_dir / name, self.images_dir / name)
+                              for name in [normalized_hero_name, normalized_inline_name, *variant_names])
+
+            # Atomic os.replace from a clone in the destination folder;
+            # byte-identical destinations are left untouched
+            self.staged_files = []
+            methods: Dict[str, int] = {}
+            with self.span('place_files', 'io', files=len(placements)):
+                for src, dest in placements:
+                    self.journal.record_create(dest)
+                    method = place_file(src, dest, self.file_hashes.get(src.name))
+                    self.get_repo_index().add(dest)
+                    methods[method] = methods.get(method, 0) + 1
+                    rel = dest.relative_to(self.resources_dir).as_posix()
+                    if method == UNCHANGED:
+                        self.journal.discard(dest)
+                        self.log(f"  {rel} (unchanged)", 'info')
+                    else:
+                        self.staged_files.append(dest)
+                        if dest.name not in variant_names:
+                            self.log(f"  {rel}", 'info')
+            if variant_names:
+                self.log(f"  images/ + {len(variant_names)} responsive variants", 'info')
+            self.log("  Placement: " + ', '.join(f"{n} {m}" for m, n in sorted(methods.items())), 'info')
+
+            self._update_variant_manifest(slug)
+            self._catalog_draft(self.drafts_dir / normalized_md_name, self.file_hashes.get(normalized_md_name),
+                                {f"images/{name}": self.file_hashes[name]
+                                 for name in (normalized_hero_name, normalized_inline_name)
+                                 if name in self.file_hashes})
+            if self.staged_files:
+                self.log(f"Staged {len(self.staged_files)} files for slug: {slug}", 'success')
+            else:
+                self.log(f"All files for slug {slug} are byte-identical - nothing staged", 'success')
 
             return temp_bundle_dir
 
@@ -573,6 +825,83 @@ class IngestPipeline:
             # Don't cleanup temp bundle on failure - keep for debugging
             raise IngestError(f"Failed to stage files: {e}")
 
+    def _stage_images_into_bundle(self, slug: str, hero_path: Path, inline_path: Path,
+                                  temp_bundle_dir: Path) -> Tuple[Path, Path]:
+        """
+        Put the hero and inline images into the temp bundle.
+
+        With optimize_images set, both images are resized to max_image_edge,
+        stripped of metadata and re-encoded (WebP/AVIF, or the source format
+        as a fallback) in parallel worker processes, and a width variant is
+        written for each entry of variant_widths narrower than the image.
+        Results are cached under .cache/image-variants/ by source hash, so
+        re-ingesting the same image skips encoding. Otherwise they are copied.
+
+        Sets image_variants to the variant manifest entries for this bundle.
+
+        Returns:
+            Tuple of (temp_hero, temp_inline) paths
+        """
+        hero_stem = temp_bundle_dir / f"{slug}-header"
+        inline_stem = temp_bundle_dir / f"{slug}-inline"
+        self.image_variants = {}
+
+        if not self.optimize_images:
+            temp_hero = hero_stem.with_name(hero_stem.name + hero_path.suffix.lower())
+            temp_inline = inline_stem.with_name(inline_stem.name + inline_path.suffix.lower())
+            # One streaming read per source; the hash is reused at placement
+            self.file_hashes[temp_hero.name] = copy_with_hash(hero_path, temp_hero)
+            self.file_hashes[temp_inline.name] = copy_with_hash(inline_path, temp_inline)
+            self.log(f"  Copied hero -> {temp_hero.name}", 'info')
+            self.log(f"  Copied inline -> {temp_inline.name}", 'info')
+            return temp_hero, temp_inline
+
+        image_format = resolve_image_format(self.image_format)
+        if image_format != self.image_format:
+            self.log(f"  {self.image_format.upper()} encoding unavailable - using {image_format}", 'warning')
+
+        common = {
+            'image_format': image_format,
+            'quality': self.image_quality,
+            'max_edge': max(self.max_image_edge, self.MIN_IMAGE_WIDTH),
+            'min_width': self.MIN_IMAGE_WIDTH,
+            'widths': sorted(set(self.variant_widths)),
+        }
+        with self.span('optimize_images', 'image') as span_args:
+            results = optimize_images([
+                {'src': str(hero_path), 'dest_stem': str(hero_stem), **common},
+                {'src': str(inline_path), 'dest_stem': str(inline_stem), **common},
+            ], cache_dir=self.image_cache_dir)
+            span_args['cached'] = sum(1 for r in results if r['cached'])
+
+        total_before = 0
+        total_after = 0
+        for role, result in zip(('hero', 'inline'), results):
+            before, after = result['src_bytes'], result['out_bytes']
+            total_before += before
+            total_after += after
+            saved = 100 * (before - after) / before if before else 0
+            source = 'cached' if result['cached'] else 'encoded'
+            self.log(f"  Optimized {role} -> {Path(result['path']).name}: {format_bytes(before)} -> "
+                     f"{format_bytes(after)} ({saved:.0f}% saved, {result['width']}x{result['height']}, "
+                     f"{source})", 'info')
+            if result['variants']:
+                widths = ', '.join(str(v['width']) for v in result['variants'])
+                self.log(f"    Variants: {widths}w", 'info')
+
+            self.image_variants[Path(result['path']).name] = {
+                'width': result['width'],
+                'height': result['height'],
+                'sourceHash': result['source_hash'],
+                'variants': [
+                    {'file': Path(v['path']).name, 'width': v['width'], 'height': v['height']}
+                    for v in result['variants']
+                ],
+            }
+        self.log(f"  Image bytes saved: {format_bytes(max(0, total_before - total_after))}", 'success')
+
+        return Path(results[0]['path']), Path(results[1]['path'])
+
     def _regenerate_markdown_with_front_matter(self) -> str:
         """Regenerate markdown with updated front matter, ensuring proper format."""
         # Use stored body if available, otherwise parse from content
@@ -581,8 +910,8 @@ class IngestPipeline:
         else:
             # Parse existing content to get body
             content = normalize_newlines(strip_bom(self.markdown_content))
-            match = re.match(r'^---\s*\n.*?\n---\s*\n(.*)', content, re.DOTALL)
-            body = match.group(1) if match else content
+            block = split_front_matter(content)
+            body = content[block.body_offset:] if block and block.closed else content
 
         # Generate new YAML front matter
         yaml_str = yaml.dump(self.front_matter, default_flow_style=False, allow_unicode=True, sort_keys=False)
@@ -593,20 +922,214 @@ class IngestPipeline:
         # Return with proper format: ---\nyaml\n---\n\nbody
         return f"---\n{yaml_str}---\n\n{body}"
 
-    def _backup_existing_files(self, slug: str, hero_ext: str, inline_ext: str):
-        """Backup existing files before overwriting."""
-        paths_to_backup = [
-            self.drafts_dir / f"{slug}.md",
-            self.images_dir / f"{slug}-header{hero_ext}",
-            self.images_dir / f"{slug}-inline{inline_ext}",
-            self.resources_dir / f"{slug}.html"
-        ]
+    def get_repo_index(self) -> RepoIndex:
+        """The repo index, built by one scan of resources/ on first use."""
+        if self.repo_index is None:
+            with self.span('repo_index', 'io'):
+                self.repo_index = RepoIndex(self.resources_dir, self.repo_config)
+        return self.repo_index
+
+    def get_drafts_catalog(self) -> Optional[DraftsCatalog]:
+        """
+        The drafts catalog, opened and synced with drafts/ on first use.
+
+        Returns:
+            The catalog, or None if the database cannot be used (the catalog
+            is a cache; ingest never fails because of it)
+        """
+        if self.drafts_catalog is None:
+            try:
+                with self.span('drafts_catalog', 'io') as span_args:
+                    catalog = DraftsCatalog(self.drafts_catalog_path, self.resources_dir, self.log)
+                    span_args['updated'], span_args['removed'] = catalog.sync()
+                self.drafts_catalog = catalog
+            except sqlite3.Error as e:
+                self.log(f"Drafts catalog unavailable: {e}", 'warning')
+        return self.drafts_catalog
+
+    def _catalog_draft(self, md_path: Path, draft_sha256: Optional[str] = None,
+                       image_hashes: Optional[Dict[str, str]] = None):
+        """Update (or drop) one draft's catalog row; failures are only logged."""
+        catalog = self.get_drafts_catalog()
+        if catalog is None:
+            return
+        try:
+            catalog.update_draft(md_path, draft_sha256, image_hashes)
+        except sqlite3.Error as e:
+            self.log(f"Drafts catalog update failed for {md_path.name}: {e}", 'warning')
+
+    def _existing_image_files(self, slug: str) -> List[Path]:
+        """Hero/inline images for a slug already in images/, including width variants."""
+        return [self.images_dir / name for name in self.get_repo_index().image_names(slug)]
+
+    def _begin_journal(self, slug: str):
+        """
+        Start the write-ahead journal for this ingest.
+
+        Failed transactions for the same slug (kept for inspection) are
+        superseded: their files are about to be replaced anyway. So are
+        pending ones this process left behind (an ingest that died on an
+        unexpected error); startup recovery would otherwise replay them over
+        this ingest's files.
+        """
+        for old in IngestJournal.find(self.journal_root, self.repo_root):
+            if old.slug != slug:
+                continue
+            if old.state == IngestJournal.FAILED:
+                old.remove()
+                self.log(f"Superseded failed ingest journal: {old.txid}", 'info')
+            elif old.state == IngestJournal.PENDING and old.is_own():
+                old.remove()
+                self.log(f"Superseded abandoned ingest journal: {old.txid}", 'warning')
+        self.journal = IngestJournal.begin(self.journal_root, self.repo_root, slug)
+        self.log(f"  Journal: {self.journal.tx_dir.relative_to(self.repo_root).as_posix()}", 'info')
+
+    def _backup_existing_files(self, slug: str, new_image_names: set):
+        """
+        Backup existing files before overwriting.
+
+        Backups go to the rollback journal (no file contents are held in
+        memory). Files that staging replaces with os.replace are backed up by
+        reflink or hardlink; the HTML, which the generator rewrites in place,
+        by reflink or copy.
+
+        Existing images that the new bundle does not replace (e.g. a .png
+        replaced by a .webp, or a variant width no longer produced) are
+        moved into the journal so they are not left orphaned.
+        """
+        html_path = self.resources_dir / f"{slug}.html"
+        paths_to_backup = [self.drafts_dir / f"{slug}.md", html_path]
+        paths_to_backup.extend(self._existing_image_files(slug))
 
         for path in paths_to_backup:
-            if path.exists():
-                self.backup_files[path] = path.read_bytes()
+            if path.parent == self.images_dir and path.name not in new_image_names:
+                if self.journal.backup(path, IngestJournal.MOVE):
+                    self.get_repo_index().discard(path)
+                    self.log(f"Removed superseded image: {path.name}", 'info')
+                continue
+            mode = IngestJournal.COPY if path == html_path else IngestJournal.LINK
+            if self.journal.backup(path, mode):
                 self.log(f"Backed up: {path.name}", 'info')
 
+    def _journal_generated_files(self, slug: str):
+        """Journal the files the generator will write: the page and the index."""
+        self.journal.backup(self.index_path, IngestJournal.COPY)
+        self.journal.record_create(self.resources_dir / f"{slug}.html")
+
+    def commit_journal(self):
+        """Finish the transaction: the ingest is complete and stays on disk."""
+        if self.journal:
+            self.touched_paths.update(self.journal.paths())
+            if 'variantManifest' in self.journal.meta:
+                self.touched_paths.add(self.variant_manifest_path)
+            if self.slug:
+                publish_date = self.front_matter.get('publishDate', '')
+                self.session_resources[self.slug] = (publish_date.isoformat() if isinstance(publish_date, date)
+                                                     else str(publish_date))
+            self.journal.close(IngestJournal.COMMITTED)
+            self.journal = None
+
+    def fail_journal(self):
+        """Keep a failed ingest's files for inspection (and its backups on disk)."""
+        if self.journal:
+            self.journal.close(IngestJournal.FAILED)
+            self.log(f"Rollback journal kept: {self.journal.tx_dir}", 'warning')
+            self.journal = None
+
+    def recover_interrupted(self) -> List[str]:
+        """
+        Undo ingests interrupted by a crash or kill.
+
+        Pending journals whose process is gone are rolled back (files,
+        index.html and image-variants.json entries); leftover committed
+        journals are deleted; failed ones are kept for inspection. Worktrees
+        of dead worktree ingests are deleted with their branches.
+
+        Returns:
+            Transaction ids that were rolled back
+        """
+        recovered = []
+        for journal in IngestJournal.find(self.journal_root, self.repo_root):
+            if journal.state == IngestJournal.COMMITTED:
+                journal.remove()
+            elif journal.state == IngestJournal.PENDING and journal.is_orphaned():
+                self.log(f"Recovering interrupted ingest: {journal.slug} ({journal.txid})", 'warning')
+                self._replay_journal(journal)
+                recovered.append(journal.txid)
+        if recovered:
+            self.log(f"Rolled back {len(recovered)} interrupted ingest(s)", 'warning')
+        # Git only runs when a worktree ingest left its folder behind
+        try:
+            leftover = any(entry.is_dir() for entry in os.scandir(self.worktrees_dir))
+        except OSError:
+            leftover = False  # No worktree ingest has run in this checkout
+        if leftover:
+            from git_worktree import IngestWorktree
+            IngestWorktree.prune(self.repo_root, self.log)
+        return recovered
+
+    def _replay_journal(self, journal: IngestJournal):
+        """Roll back one journal, including its variant manifest entries."""
+        journal.rollback(self.log)
+        if self.repo_index is not None:
+            self.repo_index.sync(journal.paths())
+        if self.drafts_catalog is not None:
+            for path in journal.paths():
+                if path.parent == self.drafts_dir and path.suffix == '.md':
+                    self._catalog_draft(path)
+        variant_entries = journal.meta.get('variantManifest')
+        if variant_entries is not None:
+            try:
+                self._restore_variant_manifest(variant_entries)
+            except Exception as e:
+                self.log(f"Failed to restore {self.variant_manifest_path.name}: {e}", 'error')
+        journal.close(IngestJournal.ROLLED_BACK)
+
+    def _load_variant_manifest(self) -> Dict[str, Any]:
+        """Load resources/image-variants.json (empty manifest if missing or unreadable)."""
+        try:
+            with open(self.variant_manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault('version', 1)
+        manifest.setdefault('images', {})
+        return manifest
+
+    def _write_variant_manifest(self, manifest: Dict[str, Any]):
+        """Write the variant manifest with sorted keys (stable diffs), UTF-8 and LF."""
+        write_utf8_lf(self.variant_manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+
+    def _update_variant_manifest(self, slug: str):
+        """
+        Replace this slug's entries in the variant manifest with image_variants.
+
+        The previous entries are journaled first so rollback can restore them.
+        """
+        own_image = re.compile(rf"^{re.escape(slug)}-(header|inline)\.\w+$")
+        with self._variant_manifest_lock:
+            manifest = self._load_variant_manifest()
+            images = manifest['images']
+            previous = {name: entry for name, entry in images.items() if own_image.match(name)}
+            if previous == self.image_variants:
+                return
+            self.journal.set_meta('variantManifest', {'names': sorted(self.image_variants), 'previous': previous})
+            for name in previous:
+                del images[name]
+            images.update(self.image_variants)
+            self._write_variant_manifest(manifest)
+
+    def _restore_variant_manifest(self, journaled: Dict[str, Any]):
+        """Undo _update_variant_manifest from its journaled entries."""
+        with self._variant_manifest_lock:
+            manifest = self._load_variant_manifest()
+            images = manifest['images']
+            for name in journaled['names']:
+                images.pop(name, None)
+            images.update(journaled['previous'])
+            self._write_variant_manifest(manifest)
+        self.log(f"Restored: {self.variant_manifest_path.name}", 'info')
+
     def _cleanup_staging(self, staging_dir: Path):
         """Clean up staging directory."""
         try:
@@ -668,6 +1191,7 @@ class IngestPipeline:
         2. Exactly 2 images staged in images/
         3. drafts/<slug>.md starts with '---\\n' and has closing '\\n---\\n'
         4. Both images exist at destination paths
+        5. The page template exists
 
         Returns:
             List of validation errors (empty if all pass)
@@ -692,9 +1216,16 @@ class IngestPipeline:
             else:
                 self.log(f"  [OK] drafts/{slug}.md has valid YAML front matter", 'success')
 
-        # Check images exist
-        hero_ext = self.original_hero_path.suffix.lower() if self.original_hero_path else '.png'
-        inline_ext = self.original_inline_path.suffix.lower() if self.original_inline_path else '.png'
+        # The generator renders into this template
+        try:
+            if self.repo_config.get().template_sha256 is None:
+                errors.append(f"Template not found: {self.repo_config.get().template_path}")
+        except RepoConfigError as e:
+            errors.append(str(e))
+
+        # Check images exist (under the extensions they were staged with)
+        hero_ext = self.hero_ext or (self.original_hero_path.suffix.lower() if self.original_hero_path else '.png')
+        inline_ext = self.inline_ext or (self.original_inline_path.suffix.lower() if self.original_inline_path else '.png')
 
         final_hero = self.images_dir / f"{slug}-header{hero_ext}"
         final_inline = self.images_dir / f"{slug}-inline{inline_ext}"
@@ -717,49 +1248,536 @@ class IngestPipeline:
         return errors
 
     def rollback(self):
-        """Rollback staged files and restore backups."""
+        """Rollback staged files and restore backups by replaying the journal."""
         self.log("Rolling back changes...", 'warning')
 
-        # Remove staged files
-        for path in self.staged_files:
+        if self.journal:
+            self._replay_journal(self.journal)
+            self.journal = None
+
+        self.staged_files = []
+        self.log("Rollback complete", 'warning')
+
+    def prepare_bundle(self, md_path: Path, hero_path: Path, inline_path: Path,
+                       force_overwrite: bool = False) -> Tuple[str, List[str]]:
+        """
+        Run every pre-generator step for an already parsed bundle.
+
+        Steps: validate front matter, validate images, check slug collision,
+        stage files, pre-generator validation. parse_markdown (or
+        set_generated_front_matter) must have been called first.
+
+        Returns:
+            Tuple of (stage, errors). stage names the last step attempted;
+            errors is empty if the bundle is staged and ready for the generator.
+
+        Raises:
+            IngestCancelledError: If cancel() was called between stages
+        """
+        try:
+            return self._prepare_bundle_stages(md_path, hero_path, inline_path, force_overwrite)
+        finally:
+            self._end_stage_span()
+
+    def _prepare_bundle_stages(self, md_path: Path, hero_path: Path, inline_path: Path,
+                               force_overwrite: bool) -> Tuple[str, List[str]]:
+        """Body of prepare_bundle (each enter_stage() starts a timing span)."""
+        self.enter_stage('validate_front_matter')
+        self.log("Validating front matter...", 'info')
+        errors = self.validate_front_matter(self.front_matter)
+        if errors:
+            for err in errors:
+                self.log(err, 'error')
+            return 'validate_front_matter', errors
+        self.log("Front matter validation passed", 'success')
+
+        self.enter_stage('validate_images')
+        self.log("Validating images...", 'info')
+        errors = []
+        for img in [hero_path, inline_path]:
+            errors.extend(self.validate_image(img))
+        if errors:
+            for err in errors:
+                self.log(err, 'error')
+            return 'validate_images', errors
+        self.log("Image validation passed", 'success')
+
+        self.enter_stage('collision_check')
+        self.log(f"Checking for slug collision: {self.slug}", 'info')
+        collisions = self.check_slug_collision(self.slug, force_overwrite)
+        blocking = [msg for msg in collisions if 'Will overwrite' not in msg]
+        for msg in collisions:
+            self.log(msg, 'error' if blocking else 'warning')
+        if blocking:
+            return 'collision_check', blocking
+
+        self.enter_stage('stage')
+        try:
+            self.stage_files(md_path, hero_path, inline_path, force_overwrite)
+        except IngestError as e:
+            self.log(str(e), 'error')
+            self.fail_journal()
+            return 'stage', [str(e)]
+
+        self.enter_stage('pre_generator')
+        errors = self.validate_pre_generator()
+        if errors:
+            for err in errors:
+                self.log(err, 'error')
+            self.log(f"Keeping temp bundle for debugging: {self.temp_bundle_dir}", 'warning')
+            self.fail_journal()
+            return 'pre_generator', errors
+
+        return 'pre_generator', []
+
+    def finish_bundle(self) -> Tuple[str, List[str]]:
+        """
+        Run the generator and post-generation steps for a staged bundle.
+
+        Failed bundles are left in place for inspection (no rollback; the
+        journal is kept with the originals); in debug mode the failed
+        artifacts are also copied to tmp/last_failed/. On success the
+        rollback journal is committed.
+
+        Returns:
+            Tuple of (stage, errors). stage is 'done' on success.
+
+        Raises:
+            IngestCancelledError: If cancel() was called between stages
+        """
+        try:
+            return self._finish_bundle_stages()
+        finally:
+            self._end_stage_span()
+
+    def _finish_bundle_stages(self) -> Tuple[str, List[str]]:
+        """Body of finish_bundle (each enter_stage() starts a timing span)."""
+        self.enter_stage('generate')
+        success, output = self.run_generators([self.slug])
+        if not success:
+            self.log(output, 'error')
+            self.log("Generator failed - keeping temp bundle for debugging", 'warning')
+            self.fail_journal()
+            return 'generate', [output]
+        if self.debug_mode:
+            self.log(output, 'info')
+
+        self.enter_stage('validate_html')
+        errors = self.validate_generated_html(self.slug)
+        if errors:
+            for err in errors:
+                self.log(err, 'error')
+            self.log("HTML validation FAILED", 'error')
+            self.preserve_failed_artifacts(self.slug)
+            self.log(f"Keeping temp bundle for debugging: {self.temp_bundle_dir}", 'warning')
+            self.fail_journal()
+            return 'validate_html', errors
+        self.log("HTML validation PASSED", 'success')
+
+        self.cleanup_temp_bundle()
+        self.enter_stage('done')
+        self.commit_journal()
+        return 'done', []
+
+    def ingest(self, md_path: Path, hero_path: Path, inline_path: Path,
+               force_overwrite: bool = False) -> BundleResult:
+        """
+        Run the complete ingest sequence for one bundle without any UI.
+
+        parse_markdown -> validate_front_matter -> validate images ->
+        collision check -> stage_files -> validate_pre_generator ->
+        run_generators -> validate_generated_html
+
+        If cancel() is called mid-run, staged files are rolled back.
+
+        Returns:
+            BundleResult describing the outcome
+        """
+        md_path = Path(md_path)
+        result = BundleResult(bundle_dir=md_path.parent, stage='parse')
+
+        try:
+            self.enter_stage('parse')
             try:
-                if path.exists():
-                    path.unlink()
-                    self.log(f"Removed: {path.name}", 'info')
-            except Exception as e:
-                self.log(f"Failed to remove {path.name}: {e}", 'error')
+                self.parse_markdown(md_path)
+            except MissingFrontMatterError:
+                result.errors.append("No YAML front matter found in markdown file")
+                return result
+            except (IngestError, OSError) as e:
+                result.errors.append(str(e))
+                return result
+            result.slug = self.slug
+
+            result.stage, result.errors = self.prepare_bundle(md_path, Path(hero_path), Path(inline_path),
+                                                              force_overwrite)
+            result.staged_files = list(self.staged_files)
+            if result.errors:
+                return result
+
+            result.stage, result.errors = self.finish_bundle()
+        except IngestCancelledError as e:
+            result.errors.append(str(e))
+            self.rollback()
+            return result
+        finally:
+            self._end_stage_span()
+
+        result.success = not result.errors
+        return result
+
+    def ingest_batch(self, bundle_dirs: List[Path], force_overwrite: bool = False,
+                     max_workers: Optional[int] = None) -> List[BundleResult]:
+        """
+        Ingest many bundle folders with a single generator run.
+
+        Each bundle folder holds 1 markdown file and 2 images. Bundles are
+        parsed, validated and staged in parallel (one child pipeline per
+        bundle), then the generator scripts run once and every staged bundle
+        gets its generated HTML validated.
 
-        # Restore backups
-        for path, content in self.backup_files.items():
+        A failing bundle never blocks the others; bundles that fail after
+        staging are kept on disk for inspection, matching the single-bundle flow.
+
+        Returns:
+            One BundleResult per input folder, in input order
+        """
+        bundle_dirs = [Path(d) for d in bundle_dirs]
+        results = [BundleResult(bundle_dir=d) for d in bundle_dirs]
+        children: List[Optional['IngestPipeline']] = [None] * len(bundle_dirs)
+        sources: List[Optional[Tuple[Path, Path, Path]]] = [None] * len(bundle_dirs)
+
+        if not bundle_dirs:
+            return results
+
+        self.log(f"=== Batch Ingest: {len(bundle_dirs)} bundle(s) ===", 'info')
+        self.get_repo_index()  # Built once, before the workers share it
+        self.get_drafts_catalog()
+
+        def parse(index: int):
+            result = results[index]
+            child = self._spawn_child(bundle_dirs[index].name)
+            children[index] = child
+            result.stage = 'parse'
             try:
-                path.write_bytes(content)
-                self.log(f"Restored: {path.name}", 'info')
-            except Exception as e:
-                self.log(f"Failed to restore {path.name}: {e}", 'error')
+                with child.span('parse'):
+                    md_path, hero_path, inline_path = child.find_bundle_files(bundle_dirs[index])
+                    child.parse_markdown(md_path)
+            except MissingFrontMatterError:
+                result.errors.append("No YAML front matter found in markdown file")
+                return
+            except (IngestError, OSError) as e:
+                result.errors.append(str(e))
+                return
+            result.slug = child.slug
+            sources[index] = (md_path, hero_path, inline_path)
+
+        def prepare(index: int):
+            child = children[index]
+            md_path, hero_path, inline_path = sources[index]
+            try:
+                results[index].stage, results[index].errors = child.prepare_bundle(
+                    md_path, hero_path, inline_path, force_overwrite
+                )
+            except IngestCancelledError as e:
+                results[index].errors = [str(e)]
+            results[index].staged_files = list(child.staged_files)
+
+        workers = max(1, max_workers or min(len(bundle_dirs), os.cpu_count() or 4))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(parse, range(len(bundle_dirs))))
+
+            # First bundle (in input order) claiming a slug wins
+            claimed_slugs: Dict[str, Path] = {}
+            for index, result in enumerate(results):
+                if result.errors or not result.slug:
+                    continue
+                if result.slug in claimed_slugs:
+                    result.errors.append(
+                        f"Duplicate slug '{result.slug}' in batch (also in {claimed_slugs[result.slug].name})"
+                    )
+                else:
+                    claimed_slugs[result.slug] = result.bundle_dir
+
+            ready = [i for i, r in enumerate(results) if not r.errors]
+            list(executor.map(prepare, ready))
+
+        if self.cancel_event.is_set():
+            self.log("Batch cancelled - rolling back staged bundles", 'warning')
+            for child in children:
+                if child and child.journal:
+                    child.rollback()
+            for result in results:
+                if not result.errors:
+                    result.errors.append("Batch cancelled")
+                result.staged_files = []
+
+        staged = [i for i, r in enumerate(results) if not r.errors]
+        self.log(f"Staged {len(staged)} of {len(bundle_dirs)} bundle(s)",
+                 'success' if len(staged) == len(bundle_dirs) else 'warning')
+
+        if staged:
+            success, output = self.run_generators([results[i].slug for i in staged])
+            for i in staged:
+                results[i].stage = 'generate'
+                if not success:
+                    results[i].errors.append(output)
+                    children[i].fail_journal()
+
+            if success:
+                for i in staged:
+                    child = children[i]
+                    results[i].stage = 'validate_html'
+                    with child.span('validate_html'):
+                        results[i].errors = child.validate_generated_html(child.slug)
+                    if results[i].errors:
+                        child.preserve_failed_artifacts(child.slug)
+                        child.fail_journal()
+                    else:
+                        results[i].success = True
+                        results[i].stage = 'done'
+                        child.cleanup_temp_bundle()
+                        child.commit_journal()
+                        self.touched_paths.update(child.touched_paths)
+                        self.session_resources.update(child.session_resources)
+
+        for result in results:
+            if result.success:
+                self.log(f"  [OK] {result.slug}", 'success')
+            else:
+                name = result.slug or result.bundle_dir.name
+                self.log(f"  [FAILED] {name} ({result.stage}): {'; '.join(result.errors)}", 'error')
 
-        # Remove generated HTML if it exists
-        slug = self.front_matter.get('slug', '')
-        if slug:
-            html_path = self.resources_dir / f"{slug}.html"
-            if html_path.exists() and html_path not in self.backup_files:
-                try:
-                    html_path.unlink()
-                    self.log(f"Removed generated: {html_path.name}", 'info')
-                except Exception:
-                    pass
+        return results
 
-        self.staged_files = []
-        self.backup_files = {}
-        self.log("Rollback complete", 'warning')
+    def ingest_in_worktree(self, md_path: Path, hero_path: Path, inline_path: Path,
+                           force_overwrite: bool = False, label: Optional[str] = None) -> BundleResult:
+        """
+        Ingest one bundle in its own git worktree and land it as a commit.
+
+        The bundle is ingested into a temporary worktree of HEAD (see
+        git_worktree.py); on success its files are committed there and HEAD
+        of this checkout is fast-forwarded to that commit. On failure the
+        worktree is deleted (kept in debug mode), so this checkout never sees
+        a half-finished ingest. Runs concurrently with other worktree ingests.
+
+        Drafts that are not committed yet are not in the worktree, so they
+        are not seen by the slug collision check.
 
-    def run_generators(self) -> Tuple[bool, str]:
+        Returns:
+            BundleResult (result.commit is the new commit on success)
+        """
+        from git_worktree import IngestWorktree, WorktreeError
+
+        md_path = Path(md_path)
+        label = label or md_path.parent.name
+        result = BundleResult(bundle_dir=md_path.parent, stage='parse')
+        try:
+            worktree = IngestWorktree.create(self.repo_root, label, self.log)
+        except WorktreeError as e:
+            result.errors.append(str(e))
+            return result
+
+        keep_worktree = keep_branch = False
+        try:
+            child = self._spawn_child(label, worktree.path)
+            result = child.ingest(md_path, hero_path, inline_path, force_overwrite)
+            result.staged_files = [self.repo_root / p.relative_to(worktree.path) for p in result.staged_files]
+            if not result.success:
+                keep_worktree = self.debug_mode
+                return result
+
+            result.stage = 'merge'
+            commit_msg = f"Add scheduled resource: {result.slug}"
+            with self.span('git merge (worktree)', 'git', slug=result.slug):
+                if not worktree.commit(commit_msg):
+                    result.success = False
+                    result.errors.append("Nothing to commit - the resource is already in HEAD")
+                    return result
+                keep_branch = True  # The ingest's commit survives a failed merge
+                result.commit = worktree.merge_back()
+            keep_branch = False
+            result.stage = 'done'
+            self.log(f"Merged {result.slug}: {result.commit[:8]} ({commit_msg})", 'success')
+        except WorktreeError as e:
+            result.success = False
+            result.errors.append(str(e))
+            if keep_branch:
+                self.log(f"Branch {worktree.branch} kept for a manual merge", 'warning')
+        finally:
+            if keep_worktree:
+                self.log(f"Failed worktree kept: {worktree.path}", 'warning')
+            else:
+                worktree.remove(keep_branch=keep_branch)
+        self._refresh_after_merge()
+        return result
+
+    def ingest_worktrees(self, bundle_dirs: List[Path], force_overwrite: bool = False,
+                         max_workers: Optional[int] = None) -> List[BundleResult]:
+        """
+        Ingest bundle folders concurrently, each in its own worktree (see ingest_in_worktree).
+
+        Every bundle runs its own generator pass and lands as its own commit;
+        merge-backs are serialized.
+
+        Returns:
+            One BundleResult per input folder, in input order
+        """
+        bundle_dirs = [Path(d) for d in bundle_dirs]
+        if not bundle_dirs:
+            return []
+        self.log(f"=== Worktree Ingest: {len(bundle_dirs)} bundle(s) ===", 'info')
+
+        def run(bundle_dir: Path) -> BundleResult:
+            try:
+                md_path, hero_path, inline_path = self.find_bundle_files(bundle_dir)
+            except (IngestError, OSError) as e:
+                return BundleResult(bundle_dir=bundle_dir, stage='parse', errors=[str(e)])
+            return self.ingest_in_worktree(md_path, hero_path, inline_path, force_overwrite, bundle_dir.name)
+
+        workers = max(1, min(max_workers or 2, len(bundle_dirs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, bundle_dirs))
+
+        for result in results:
+            if result.success:
+                self.log(f"  [OK] {result.slug} ({result.commit[:8]})", 'success')
+            else:
+                name = result.slug or result.bundle_dir.name
+                self.log(f"  [FAILED] {name} ({result.stage}): {'; '.join(result.errors)}", 'error')
+        return results
+
+    def _refresh_after_merge(self):
+        """Pick up files a merge-back brought into this checkout."""
+        if self.repo_index is not None:
+            self.repo_index.refresh_if_changed()
+        if self.drafts_catalog is not None:
+            try:
+                self.drafts_catalog.sync()
+            except sqlite3.Error as e:
+                self.log(f"Drafts catalog sync failed: {e}", 'warning')
+
+    def _spawn_child(self, label: str, repo_root: Optional[Path] = None) -> 'IngestPipeline':
+        """
+        Create a pipeline for one bundle that shares this pipeline's settings and log.
+
+        Args:
+            label: Log prefix
+            repo_root: A worktree to ingest into instead of this checkout (the
+                manifest snapshot, repo index and catalog are then its own)
+        """
+        child = IngestPipeline(
+            repo_root or self.repo_root,
+            log_callback=lambda msg, lvl: self.log(f"[{label}] {msg}", lvl)
+        )
+        child.keep_temp_folder = self.keep_temp_folder
+        child.debug_mode = self.debug_mode
+        child.optimize_images = self.optimize_images
+        child.image_format = self.image_format
+        child.image_quality = self.image_quality
+        child.max_image_edge = self.max_image_edge
+        child.variant_widths = list(self.variant_widths)
+        child.generator_timeout_ceiling = self.generator_timeout_ceiling
+        child.image_cache_dir = self.image_cache_dir
+        child.cancel_event = self.cancel_event
+        child.tracer = self.tracer
+        if repo_root is not None:
+            return child
+        child.repo_config = self.repo_config
+        child.repo_index = self.get_repo_index()
+        child.drafts_catalog = self.get_drafts_catalog()
+        return child
+
+    # generate-resources.js output lines that drive the progress counter
+    # (one status line per draft: generated, unchanged, cached, skipped or invalid)
+    _FOUND_DRAFTS = re.compile(r'^Found (\d+) Markdown files')
+    _DRAFT_STATUS = ('\u2713 Generated:', '= Unchanged:', '\u00b7 Up to date:', '\u26a0 Skipping', '\u2717 Invalid:')
+    _UP_TO_DATE = '\u00b7 Up to date:'  # Counted but not logged (most of a large drafts folder)
+
+    def generator_timeout(self) -> float:
+        """Timeout for one generator script: grows with the drafts folder, capped at the ceiling."""
+        try:
+            with os.scandir(self.drafts_dir) as entries:
+                drafts = sum(1 for e in entries if e.name.endswith('.md'))
+        except OSError:
+            drafts = 0
+        return min(self.generator_timeout_ceiling,
+                   self.GENERATOR_TIMEOUT_BASE + self.GENERATOR_TIMEOUT_PER_DRAFT * drafts)
+
+    def _run_node_script(self, cmd: List[str], timeout: float,
+                         on_line: Optional[Callable[[str], None]] = None) -> Tuple[int, str, str]:
+        """
+        Run a node script, handing each stdout line to on_line as it arrives.
+
+        stderr is drained on a thread (so a chatty script cannot block on a
+        full pipe); a watchdog kills the process after timeout seconds.
+
+        Returns:
+            Tuple of (returncode, stdout, stderr)
+
+        Raises:
+            subprocess.TimeoutExpired: If the script was killed by the watchdog
+        """
+        process = subprocess.Popen(
+            cmd,
+            cwd=str(self.repo_root),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        watchdog = threading.Timer(timeout, kill)
+        watchdog.daemon = True
+        watchdog.start()
+        stderr_lines: List[str] = []
+        stderr_reader = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+        stderr_reader.start()
+
+        stdout_lines = []
+        try:
+            for line in process.stdout:
+                line = line.rstrip('\r\n')
+                stdout_lines.append(line)
+                if on_line:
+                    on_line(line)
+            process.wait()
+            stderr_reader.join()
+        finally:
+            watchdog.cancel()
+            process.stdout.close()
+            process.stderr.close()
+
+        stdout, stderr = '\n'.join(stdout_lines), ''.join(stderr_lines)
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout, stdout, stderr)
+        return process.returncode, stdout, stderr
+
+    def run_generators(self, slugs: Optional[List[str]] = None) -> Tuple[bool, str]:
         """
         Run the node.js generation scripts.
 
+        generate-resources.js keeps a content-hash build cache, so only stale
+        drafts are re-rendered and unchanged outputs are not rewritten. Its
+        output is logged line by line while it runs, and every draft it
+        processes is reported through generator_progress_callback.
+
+        Args:
+            slugs: Slugs to always re-render (the bundles just staged)
+
         Returns:
             Tuple of (success, output)
         """
         self.log("=== Running Generator Scripts ===", 'info')
+        timeout = self.generator_timeout()
+
+        if self.generator_worker is not None:
+            return self._run_generators_in_worker(slugs, timeout)
 
         outputs = []
 
@@ -769,28 +1787,41 @@ class IngestPipeline:
             return False, f"Generator script not found: {gen_script}"
 
         cmd = ['node', str(gen_script)]
+        for slug in slugs or []:
+            cmd.extend(['--slug', slug])
         self.log(f"  Command: {' '.join(cmd)}", 'info')
         self.log(f"  Working dir: {self.repo_root}", 'info')
+        self.log(f"  Timeout: {timeout:g}s", 'info')
+
+        progress = {'found': 0, 'processed': 0}
+
+        def on_line(line: str):
+            if not line.strip():
+                return
+            if not line.startswith(self._UP_TO_DATE):
+                self.log(f"  {line.strip()}", 'info')
+            found = self._FOUND_DRAFTS.match(line)
+            if found:
+                progress['found'] = int(found.group(1))
+            elif line.startswith(self._DRAFT_STATUS):
+                progress['processed'] += 1
+            else:
+                return
+            if self.generator_progress_callback:
+                self.generator_progress_callback(progress['processed'], progress['found'])
 
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=str(self.repo_root),
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            # Log both stdout and stderr for visibility
-            if result.stdout.strip():
-                self.log(f"Generator output:\n{result.stdout.strip()}", 'info')
-            if result.stderr.strip():
-                self.log(f"Generator stderr:\n{result.stderr.strip()}", 'warning')
-            outputs.append(f"generate-resources.js:\n{result.stdout}")
-            if result.returncode != 0:
-                return False, f"generate-resources.js failed:\n{result.stderr}"
+            with self.span('generate-resources.js', 'generator'):
+                returncode, stdout, stderr = self._run_node_script(cmd, timeout, on_line)
+            if stderr.strip():
+                self.log(f"Generator stderr:\n{stderr.strip()}", 'warning')
+            outputs.append(f"generate-resources.js:\n{stdout}")
+            if returncode != 0:
+                return False, f"generate-resources.js failed:\n{stderr}"
             self.log("Generated HTML from markdown", 'success')
         except subprocess.TimeoutExpired:
-            return False, "generate-resources.js timed out"
+            return False, (f"generate-resources.js timed out after {timeout:g}s "
+                           f"({progress['processed']} of {progress['found']} drafts processed)")
         except Exception as e:
             return False, f"Failed to run generate-resources.js: {e}"
 
@@ -800,24 +1831,60 @@ class IngestPipeline:
             return False, f"Index script not found: {index_script}"
 
         try:
-            result = subprocess.run(
-                ['node', str(index_script)],
-                cwd=str(self.repo_root),
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            outputs.append(f"regenerate-index.js:\n{result.stdout}")
-            if result.returncode != 0:
-                return False, f"regenerate-index.js failed:\n{result.stderr}"
+            with self.span('regenerate-index.js', 'generator'):
+                returncode, stdout, stderr = self._run_node_script(['node', str(index_script)], timeout)
+            outputs.append(f"regenerate-index.js:\n{stdout}")
+            if returncode != 0:
+                return False, f"regenerate-index.js failed:\n{stderr}"
             self.log("Regenerated resource index", 'success')
         except subprocess.TimeoutExpired:
-            return False, "regenerate-index.js timed out"
+            return False, f"regenerate-index.js timed out after {timeout:g}s"
         except Exception as e:
             return False, f"Failed to run regenerate-index.js: {e}"
 
         return True, '\n'.join(outputs)
 
+    def start_generator_worker(self) -> GeneratorWorker:
+        """
+        Start a persistent generator worker for this session.
+
+        Subsequent run_generators() calls send render/index requests to it
+        instead of spawning two node processes per ingest.
+        """
+        if self.generator_worker is None:
+            self.generator_worker = GeneratorWorker(self.repo_root, log_callback=self.log_callback)
+        self.generator_worker.start()
+        return self.generator_worker
+
+    def stop_generator_worker(self):
+        """Stop the persistent generator worker, if any."""
+        if self.generator_worker is not None:
+            self.generator_worker.stop()
+            self.generator_worker = None
+
+    def _run_generators_in_worker(self, slugs: Optional[List[str]], timeout: float) -> Tuple[bool, str]:
+        """Run render + index through the persistent generator worker (output arrives per request)."""
+        self.log(f"  Generator worker: render {', '.join(slugs or []) or '(stale drafts)'}", 'info')
+        try:
+            with self.span('generate-resources.js (worker)', 'generator'):
+                success, output = self.generator_worker.render(slugs, timeout=timeout)
+            logged = '\n'.join(line for line in output.strip().splitlines() if not line.startswith(self._UP_TO_DATE))
+            if logged:
+                self.log(f"Generator output:\n{logged}", 'info')
+            if not success:
+                return False, f"generate-resources.js failed:\n{output}"
+            self.log("Generated HTML from markdown", 'success')
+
+            with self.span('regenerate-index.js (worker)', 'generator'):
+                index_success, index_output = self.generator_worker.regenerate_index(timeout=timeout)
+            if not index_success:
+                return False, f"regenerate-index.js failed:\n{index_output}"
+            self.log("Regenerated resource index", 'success')
+        except GeneratorWorkerError as e:
+            return False, str(e)
+
+        return True, f"generate-resources.js:\n{output}\nregenerate-index.js:\n{index_output}"
+
     def validate_generated_html(self, slug: str) -> List[str]:
         """
         Validate the generated HTML file matches publish-gate requirements.
@@ -834,147 +1901,391 @@ class IngestPipeline:
 
         if not html_path.exists():
             # List what files ARE in resources/ to help debug
-            try:
-                existing_html = [f.name for f in self.resources_dir.glob("*.html")]
-                self.log(f"Existing HTML files in resources/: {existing_html[:10]}", 'info')
-            except Exception:
-                pass
+            existing_html = self.get_repo_index().html_names()
+            self.log(f"Existing HTML files in resources/: {existing_html[:10]}", 'info')
             errors.append(f"Generated HTML not found: {html_path}")
             return errors
+        self.get_repo_index().add(html_path)
 
-        content = html_path.read_text(encoding='utf-8')
-
-        # Check for exactly one .article-header section (not __meta or other BEM variants)
-        # Match class="article-header" but NOT class="article-header__*"
-        header_matches = re.findall(r'class="article-header"', content)
-        if len(header_matches) != 1:
-            errors.append(f"Expected exactly 1 .article-header, found {len(header_matches)}")
-
-        # Check for exactly one .article-hero-image
-        hero_matches = re.findall(r'class="[^"]*article-hero-image[^"]*"', content)
-        if len(hero_matches) != 1:
-            errors.append(f"Expected exactly 1 .article-hero-image, found {len(hero_matches)}")
-
-        # Check canonical link
-        expected_canonical = f'https://pro.foxfuel.com/resources/{slug}.html'
-        canonical_pattern = rf'<link[^>]*rel="canonical"[^>]*href="{re.escape(expected_canonical)}"'
-        alt_pattern = rf'href="{re.escape(expected_canonical)}"[^>]*rel="canonical"'
-        if not re.search(canonical_pattern, content) and not re.search(alt_pattern, content):
-            # Check if canonical exists at all
-            if 'rel="canonical"' in content:
-                errors.append(f"Canonical link URL mismatch (expected: {expected_canonical})")
-
-        # Check for correct tag type class
-        tag_type = self.front_matter.get('tagType', '')
-        if tag_type:
-            tag_class = f'resource-card__tag--{tag_type}'
-            if tag_class not in content:
-                errors.append(f"Missing tag class: {tag_class}")
-
-        # Check for no second H1 in article body
-        # Find content within article body
-        body_match = re.search(r'<article[^>]*class="[^"]*content-body[^"]*"[^>]*>(.*?)</article>', content, re.DOTALL)
-        if body_match:
-            body_content = body_match.group(1)
-            h1_in_body = re.findall(r'<h1[^>]*>', body_content)
-            if len(h1_in_body) > 0:
-                errors.append(f"Found {len(h1_in_body)} H1 tag(s) inside article body (should be 0)")
+        # All publish-gate rules in one streaming parse (see html_validator.py)
+        findings = validate_file(html_path, resource_page_rules(slug, self.front_matter.get('tagType', '')))
+        self.html_findings = findings
+        errors.extend(str(finding) for finding in findings)
 
         return errors
 
-    def get_git_status(self) -> Tuple[List[str], List[str]]:
+    def validate_draft_file(self, md_path: Path) -> FileValidation:
+        """
+        Apply the front matter and image-reference rules to a draft in drafts/.
+
+        Missing images are warnings (they may be added before publish), as
+        in the publish-gate workflow.
+        """
+        result = FileValidation(path=md_path, kind='draft', slug=md_path.stem)
+        try:
+            front_matter, _ = self.parse_markdown(md_path)
+        except MissingFrontMatterError:
+            result.errors.append("No YAML front matter found")
+            return result
+        except (IngestError, OSError, UnicodeDecodeError) as e:
+            result.errors.append(str(e))
+            return result
+
+        result.errors.extend(self.validate_front_matter(front_matter))
+        slug = front_matter.get('slug') or ''
+        if slug and md_path.name != f"{slug}.md":
+            result.errors.append(f"Filename should match slug (expected {slug}.md)")
+        result.slug = slug or md_path.stem
+        result.tag_type = str(front_matter.get('tagType') or '')
+        result.publish_date = str(front_matter.get('publishDate') or '')
+
+        for section, label in (('hero', 'Hero'), ('inlineImage', 'Inline')):
+            entry = front_matter.get(section)
+            src = entry.get('src') if isinstance(entry, dict) else None
+            if not src:
+                result.errors.append(f"Missing required field: {section}.src")
+            elif not (self.resources_dir / str(src)).is_file():
+                result.warnings.append(f"{label} image not found: {src}")
+        return result
+
+    def validate_page_file(self, html_path: Path, tag_type: str = '') -> FileValidation:
+        """Apply the generated-HTML rules (canonical link required) to resources/<slug>.html."""
+        result = FileValidation(path=html_path, kind='page', slug=html_path.stem, tag_type=tag_type)
+        try:
+            findings = validate_file(html_path, resource_page_rules(html_path.stem, tag_type, require_canonical=True))
+        except (OSError, UnicodeDecodeError) as e:
+            result.errors.append(f"Cannot read page: {e}")
+            return result
+        result.errors.extend(str(finding) for finding in findings)
+        if not tag_type:
+            result.warnings.append("No draft or manifest entry (tag class not checked)")
+        return result
+
+    def _validate_manifest_entries(self) -> List[FileValidation]:
+        """Check legacy manifest resources for required fields and date format."""
+        try:
+            config = self.repo_config.get()
+        except RepoConfigError as e:
+            return [FileValidation(path=self.manifest_path, kind='manifest', errors=[str(e)])]
+
+        results = []
+        for number, resource in enumerate(config.legacy_resources, 1):
+            result = FileValidation(path=self.manifest_path, kind='manifest',
+                                    slug=resource.get('slug') or f"resource {number}",
+                                    tag_type=str(resource.get('tagType') or ''),
+                                    publish_date=str(resource.get('publishDate') or ''))
+            for name in self.REQUIRED_FIELDS:
+                if name != 'readTimeMinutes' and not resource.get(name):
+                    result.errors.append(f"Missing required field: {name}")
+            if result.publish_date and not re.match(r'^\d{4}-\d{2}-\d{2}$', result.publish_date):
+                result.errors.append(f"publishDate must be YYYY-MM-DD format, got: {result.publish_date}")
+            results.append(result)
+        return results
+
+    def validate_all(self, max_workers: Optional[int] = None) -> List[FileValidation]:
         """
-        Get git status to check for unrelated changes.
+        Validate the whole site: every draft, every resources/*.html page and
+        every legacy manifest entry (the publish-gate checks, run locally).
+
+        Drafts are validated first (their tagType drives each page's tag
+        check), then pages; both fan out over a process pool. Published
+        resources (publishDate today or earlier) without a page are errors.
 
         Returns:
-            Tuple of (related_changes, unrelated_changes)
+            One FileValidation per manifest entry, draft and page
         """
+        self.log("=== Site Validation ===", 'info')
+        index = self.get_repo_index()
+        index.refresh_if_changed()
+
+        results = self._validate_manifest_entries()
+        legacy = {r.slug: r for r in results if r.kind == 'manifest'}
+
+        drafts = [self.drafts_dir / name for name in sorted(index.drafts)]
+        with self.span('validate_drafts', 'validate', files=len(drafts)):
+            draft_results = self._run_validation_jobs(
+                _validate_draft_job, [(str(self.repo_root), str(path)) for path in drafts], max_workers)
+        results.extend(draft_results)
+        by_slug = {r.slug: r for r in draft_results}
+
+        pages = [self.resources_dir / name for name in index.html_names()
+                 if name != self.index_path.name and not name.startswith('TEMPLATE-')]
+        jobs = []
+        for page in pages:
+            owner = by_slug.get(page.stem) or legacy.get(page.stem)
+            jobs.append((str(self.repo_root), str(page), owner.tag_type if owner else ''))
+        with self.span('validate_pages', 'validate', files=len(pages)):
+            results.extend(self._run_validation_jobs(_validate_page_job, jobs, max_workers))
+
+        # Published resources must have a page (published as the generators
+        # see it: today in America/New_York, not the local date)
+        from publish_calendar import today_et
+        today = today_et()
+        page_slugs = {page.stem for page in pages}
+        for owner in [*legacy.values(), *by_slug.values()]:
+            if owner.slug not in page_slugs and owner.publish_date and owner.publish_date <= today:
+                owner.errors.append(f"HTML file missing for published resource: {owner.slug}.html")
+
+        self._log_validation_summary(results)
+        return results
+
+    def _run_validation_jobs(self, job: Callable[..., FileValidation], args: List[Tuple],
+                             max_workers: Optional[int]) -> List[FileValidation]:
+        """Run validation jobs in a process pool (inline for a handful of files)."""
+        workers = max(1, max_workers or os.cpu_count() or 2)
+        if workers == 1 or len(args) < VALIDATION_POOL_MIN_FILES:
+            return [job(*a) for a in args]
         try:
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(args) // (workers * 4))
+                return list(pool.map(job, *zip(*args), chunksize=chunksize))
+        except (BrokenProcessPool, OSError):
+            # No usable worker processes (e.g. restricted environment) - run inline
+            return [job(*a) for a in args]
+
+    def _log_validation_summary(self, results: List[FileValidation]):
+        """Log every error and warning, then one summary line."""
+        for result in results:
+            label = result.slug if result.kind == 'manifest' else result.path.relative_to(self.resources_dir).as_posix()
+            for message in result.errors:
+                self.log(f"  [{result.kind}] {label}: {message}", 'error')
+            for message in result.warnings:
+                self.log(f"  [{result.kind}] {label}: {message}", 'warning')
+
+        counts = {kind: sum(1 for r in results if r.kind == kind) for kind in ('manifest', 'draft', 'page')}
+        errors = sum(len(r.errors) for r in results)
+        warnings = sum(len(r.warnings) for r in results)
+        summary = (f"Validated {counts['draft']} drafts, {counts['page']} pages, "
+                   f"{counts['manifest']} manifest entries: {errors} errors, {warnings} warnings")
+        self.log(summary, 'error' if errors else 'success')
+
+    def _run_git(self, args: List[str], input: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Run a git command in the repo root (timed as a 'git <command>' span)."""
+        with self.span(f"git {args[0]}", 'git'):
+            return subprocess.run(
+                ['git', *args],
                 cwd=str(self.repo_root),
                 capture_output=True,
-                text=True
+                text=True,
+                encoding='utf-8',
+                input=input
             )
 
-            if result.returncode != 0:
-                return [], []
+    # Where ingests write; foreign changes are only looked for here, so
+    # status time does not grow with the rest of the tree (assets/, ...)
+    GIT_SCOPE = ['resources']
+
+    def git_paths(self) -> List[str]:
+        """Repo-relative paths of every file this pipeline's completed ingests touched."""
+        paths = []
+        for path in self.touched_paths:
+            try:
+                paths.append(path.relative_to(self.repo_root).as_posix())
+            except ValueError:
+                continue
+        return sorted(paths)
+
+    @staticmethod
+    def _pathspec_input(paths: List[str]) -> str:
+        """NUL-separated pathspecs for --pathspec-from-file=- --pathspec-file-nul (no command-line limit)."""
+        return ''.join(f":(literal){p}\0" for p in paths)
 
-            slug = self.front_matter.get('slug', '')
-            related = []
-            unrelated = []
+    # git status has no --pathspec-from-file; long path lists are split
+    GIT_STATUS_CHUNK = 200
 
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
+    def _git_changed_paths(self, pathspecs: List[str]) -> List[str]:
+        """
+        Changed, deleted and untracked files under pathspecs (git status -z).
+
+        Raises:
+            IngestError: If git status fails
+        """
+        changed = []
+        for start in range(0, len(pathspecs), self.GIT_STATUS_CHUNK):
+            chunk = pathspecs[start:start + self.GIT_STATUS_CHUNK]
+            result = self._run_git(['status', '--porcelain=v1', '-z', '--untracked-files=all', '--',
+                                    *(f":(literal){p}" for p in chunk)])
+            if result.returncode != 0:
+                raise IngestError(f"git status failed: {result.stderr.strip()}")
+            entries = iter(result.stdout.split('\0'))
+            for entry in entries:
+                if len(entry) < 4:
                     continue
+                changed.append(entry[3:])
+                if entry[0] in 'RC':
+                    next(entries, None)  # Rename/copy source path
+        return changed
 
-                # Extract file path (skip status chars)
-                file_path = line[3:].strip()
+    def get_git_status(self) -> Tuple[List[str], List[str]]:
+        """
+        Split pending changes into this pipeline's files and foreign ones.
 
-                # Check if related to our resource
-                if slug and slug in file_path:
-                    related.append(file_path)
-                elif 'resources/index.html' in file_path:
-                    related.append(file_path)
-                elif file_path:
-                    unrelated.append(file_path)
+        Ours are the changed files among touched_paths. Foreign are other
+        changes under GIT_SCOPE plus anything already staged in the index
+        (which a plain git commit would sweep up). Neither walks the whole
+        working tree.
 
-            return related, unrelated
+        Returns:
+            Tuple of (related_changes, unrelated_changes)
+        """
+        try:
+            ours = set(self.git_paths())
+            related = self._git_changed_paths(sorted(ours)) if ours else []
 
-        except Exception:
+            foreign = set(self._git_changed_paths(self.GIT_SCOPE))
+            staged = self._run_git(['diff', '--cached', '--name-only', '-z'])
+            if staged.returncode == 0:
+                foreign.update(p for p in staged.stdout.split('\0') if p)
+            return sorted(related), sorted(foreign - ours)
+
+        except (IngestError, OSError) as e:
+            self.log(f"git status failed: {e}", 'warning')
             return [], []
 
-    def commit_and_push(self, slug: str) -> Tuple[bool, str]:
+    def carry_session(self, previous: 'IngestPipeline'):
+        """Continue previous's commit session: its completed ingests are committed with this pipeline's."""
+        self.touched_paths.update(previous.touched_paths)
+        self.session_resources.update(previous.session_resources)
+
+    @staticmethod
+    def session_commit_message(resources: Dict[str, str]) -> str:
+        """
+        Commit message for a set of resources.
+
+        One resource keeps the single-ingest message; several get a summary
+        line and one "- slug (publishDate)" line each, by publish date.
+        """
+        if len(resources) == 1:
+            slug, = resources
+            return f"Add scheduled resource: {slug}"
+        lines = [f"Add {len(resources)} scheduled resources", '']
+        for slug, publish_date in sorted(resources.items(), key=lambda item: (item[1], item[0])):
+            lines.append(f"- {slug} ({publish_date})")
+        return '\n'.join(lines)
+
+    def commit_and_push(self, slug: str, extra_paths: Optional[List[str]] = None,
+                        outbox: Optional[GitOutbox] = None) -> Tuple[bool, str]:
+        """
+        Commit and push exactly the files this pipeline changed.
+
+        Args:
+            slug: Resource slug (commit message)
+            extra_paths: Other repo-relative paths to include (foreign changes the user allowed)
+            outbox: Queue the commit for a background push instead of pushing now
+
+        Returns:
+            Tuple of (success, output)
         """
-        Commit and push changes.
+        return self._commit_paths(f"Add scheduled resource: {slug}", extra_paths, outbox)
+
+    def commit_session(self, extra_paths: Optional[List[str]] = None,
+                       outbox: Optional[GitOutbox] = None) -> Tuple[bool, str]:
+        """
+        Commit every resource of the session in one commit, then push once.
+
+        The message lists each slug with its publishDate. On success the
+        session is emptied, so the next ingest starts a new one.
+
+        Args:
+            extra_paths: Other repo-relative paths to include (foreign changes the user allowed)
+            outbox: Queue the commit for a background push instead of pushing now
 
         Returns:
             Tuple of (success, output)
         """
+        if not self.session_resources:
+            return False, "Nothing to commit - no completed ingests in this session"
+        success, output = self._commit_paths(self.session_commit_message(self.session_resources),
+                                             extra_paths, outbox)
+        if success:
+            self.touched_paths.clear()
+            self.session_resources.clear()
+        return success, output
+
+    def _commit_paths(self, commit_msg: str, extra_paths: Optional[List[str]],
+                      outbox: Optional[GitOutbox]) -> Tuple[bool, str]:
+        """git add/commit touched_paths (plus extra_paths) with commit_msg, then push or queue the push."""
         outputs = []
 
         try:
-            # Git add
-            result = subprocess.run(
-                ['git', 'add', '-A'],
-                cwd=str(self.repo_root),
-                capture_output=True,
-                text=True
-            )
+            paths = sorted(set(self.git_paths()) | set(extra_paths or []))
+            changed = self._git_changed_paths(paths) if paths else []
+            if not changed:
+                return False, "Nothing to commit - files may already be committed"
+            pathspecs = self._pathspec_input(changed)
+
+            # Git add (only our paths; deletions included)
+            result = self._run_git(['add', '-A', '--pathspec-from-file=-', '--pathspec-file-nul'],
+                                   input=pathspecs)
             if result.returncode != 0:
                 return False, f"git add failed: {result.stderr}"
-            outputs.append("git add -A: OK")
+            outputs.append(f"git add: {len(changed)} file(s)")
 
-            # Git commit
-            commit_msg = f"Add scheduled resource: {slug}"
-            result = subprocess.run(
-                ['git', 'commit', '-m', commit_msg],
-                cwd=str(self.repo_root),
-                capture_output=True,
-                text=True
-            )
+            # Git commit (--only: other staged changes stay staged, uncommitted)
+            result = self._run_git(['commit', '-m', commit_msg, '--only',
+                                    '--pathspec-from-file=-', '--pathspec-file-nul'], input=pathspecs)
             if result.returncode != 0:
                 if 'nothing to commit' in result.stdout or 'nothing to commit' in result.stderr:
                     return False, "Nothing to commit - files may already be committed"
                 return False, f"git commit failed: {result.stderr}"
-            outputs.append(f"git commit: {commit_msg}")
+            outputs.append(f"git commit: {commit_msg.splitlines()[0]}")
 
-            # Git push
-            result = subprocess.run(
-                ['git', 'push'],
-                cwd=str(self.repo_root),
-                capture_output=True,
-                text=True
-            )
-            if result.returncode != 0:
-                return False, f"git push failed: {result.stderr}"
-            outputs.append("git push: OK")
+            if outbox is not None:
+                result = self._run_git(['rev-parse', 'HEAD'])
+                if result.returncode != 0:
+                    return False, f"git rev-parse failed: {result.stderr}"
+                outbox.enqueue(result.stdout.strip(), commit_msg.splitlines()[0])
+                outputs.append("git push: queued")
+                return True, '\n'.join(outputs)
 
-            return True, '\n'.join(outputs)
+            # Git push
+            success, output = self.push()
+            outputs.append(output)
+            return success, '\n'.join(outputs)
 
         except Exception as e:
             return False, f"Git operation failed: {e}"
 
+    def push(self) -> Tuple[bool, str]:
+        """
+        Push the current branch (e.g. after worktree ingests landed their commits).
+
+        Returns:
+            Tuple of (success, output)
+        """
+        try:
+            result = self._run_git(['push'])
+        except OSError as e:
+            return False, f"git push failed: {e}"
+        if result.returncode != 0:
+            return False, f"git push failed: {result.stderr}"
+        return True, "git push: OK"
+
+
+# validate_all() runs fewer files than this inline (pool startup costs more)
+VALIDATION_POOL_MIN_FILES = 16
+
+# One quiet pipeline per worker process for validate_all() jobs
+_validation_pipelines: Dict[str, IngestPipeline] = {}
+
+
+def _validation_pipeline(repo_root: str) -> IngestPipeline:
+    pipeline = _validation_pipelines.get(repo_root)
+    if pipeline is None:
+        pipeline = IngestPipeline(Path(repo_root), log_callback=lambda msg, lvl: None)
+        _validation_pipelines[repo_root] = pipeline
+    return pipeline
+
+
+def _validate_draft_job(repo_root: str, md_path: str) -> FileValidation:
+    """Process pool entry point for IngestPipeline.validate_draft_file."""
+    return _validation_pipeline(repo_root).validate_draft_file(Path(md_path))
+
+
+def _validate_page_job(repo_root: str, html_path: str, tag_type: str) -> FileValidation:
+    """Process pool entry point for IngestPipeline.validate_page_file."""
+    return _validation_pipeline(repo_root).validate_page_file(Path(html_path), tag_type)
+
 
 def find_repo_root(start_path: Path) -> Optional[Path]:
     """
@@ -989,3 +2300,376 @@ def find_repo_root(start_path: Path) -> Optional[Path]:
         current = current.parent
 
     return None
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the headless CLI."""
+    from ingest_service import DEFAULT_HOST, DEFAULT_PORT
+
+    parser = argparse.ArgumentParser(
+        prog='python -m ingest_pipeline',
+        description='Fox Fuel resource ingest pipeline (headless). '
+                    'Logs go to stderr; JSON results go to stdout.'
+    )
+    parser.add_argument('--repo-root', type=Path, default=None,
+                        help='Repository root (default: detected from the current directory)')
+    parser.add_argument('--quiet', action='store_true', help='Only log warnings and errors')
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_ingest_options(sub: argparse.ArgumentParser):
+        sub.add_argument('--force', action='store_true', help='Overwrite files if the slug exists')
+        sub.add_argument('--keep-temp', action='store_true', help='Keep temp bundle folders')
+        sub.add_argument('--debug', action='store_true', help='Preserve failed artifacts in tmp/last_failed/')
+        sub.add_argument('--no-optimize', action='store_true', help='Copy images byte-for-byte')
+        sub.add_argument('--image-format', choices=IngestPipeline.IMAGE_FORMATS,
+                         default=IngestPipeline.DEFAULT_IMAGE_FORMAT, help='Optimized image format')
+        sub.add_argument('--image-quality', type=int, default=IngestPipeline.DEFAULT_IMAGE_QUALITY,
+                         help='Encoder quality (1-100)')
+        sub.add_argument('--max-image-edge', type=int, default=IngestPipeline.MAX_IMAGE_EDGE,
+                         help='Longest image edge in pixels')
+        sub.add_argument('--no-variants', action='store_true',
+                         help='Skip responsive width variants (srcset)')
+        sub.add_argument('--generator-timeout', type=float,
+                         default=IngestPipeline.DEFAULT_GENERATOR_TIMEOUT_CEILING, metavar='SECONDS',
+                         help='Longest a generator script may run (the timeout grows with the drafts count up to this)')
+
+    ingest = subparsers.add_parser('ingest', help='Ingest one markdown file and its two images')
+    ingest.add_argument('markdown', type=Path)
+    ingest.add_argument('hero', type=Path)
+    ingest.add_argument('inline', type=Path)
+    add_ingest_options(ingest)
+
+    batch = subparsers.add_parser('batch', help='Ingest bundle folders (1 .md + 2 images each)')
+    batch.add_argument('bundles', type=Path, nargs='+')
+    batch.add_argument('--workers', type=int, default=None, help='Parallel staging workers')
+    add_ingest_options(batch)
+
+    watch = subparsers.add_parser('watch', help='Auto-ingest bundle folders dropped into an inbox')
+    watch.add_argument('inbox', type=Path)
+    watch.add_argument('--debounce', type=float, default=5.0, metavar='SECONDS',
+                       help='Quiet time before a complete bundle is ingested')
+    watch.add_argument('--workers', type=int, default=2, help='Staging workers per batch')
+    watch.add_argument('--max-batch', type=int, default=10,
+                       help='Most bundles per batch (one generator run each)')
+    watch.add_argument('--poll-interval', type=float, default=2.0, metavar='SECONDS',
+                       help='Scan interval when polling')
+    watch.add_argument('--polling', action='store_true',
+                       help='Poll instead of inotify (network shares)')
+    add_ingest_options(watch)
+
+    serve = subparsers.add_parser('serve', help='Local HTTP ingest service (job queue)')
+    serve.add_argument('--host', default=DEFAULT_HOST, help='Bind address (default: localhost only)')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    serve.add_argument('--workers', type=int, default=2, help='Staging workers per batch')
+    serve.add_argument('--max-batch', type=int, default=10, help='Most jobs per batch (one generator run each)')
+    serve.add_argument('--max-upload-mb', type=int, default=64, help='Largest accepted upload')
+    add_ingest_options(serve)
+
+    validate_all = subparsers.add_parser('validate-all',
+                                         help='Validate every draft, page and manifest entry (publish gate)')
+    validate_all.add_argument('--workers', type=int, default=None, help='Validation processes')
+
+    catalog = subparsers.add_parser('catalog', help='Query the drafts catalog (.cache/drafts-catalog.sqlite3)')
+    catalog.add_argument('--rebuild', action='store_true', help='Re-read every draft instead of changed ones')
+    catalog.add_argument('--slug', default=None, help='Show one draft')
+    catalog.add_argument('--on', default=None, metavar='YYYY-MM-DD', help='Drafts publishing on a date')
+    catalog.add_argument('--between', nargs=2, default=None, metavar=('START', 'END'),
+                         help='Drafts publishing in a date range (inclusive)')
+
+    calendar = subparsers.add_parser('calendar', help='Preview the resources index on any date (writes nothing)')
+    calendar.add_argument('--date', default=None, metavar='YYYY-MM-DD',
+                          help='Date to preview (default: today in America/New_York)')
+    calendar.add_argument('--ahead', type=int, default=30, metavar='DAYS',
+                          help='List resources publishing within this many days after --date')
+    calendar.add_argument('--cluster', type=int, default=2, metavar='N',
+                          help='Flag days with at least N publishes')
+    calendar.add_argument('--gap', type=int, default=14, metavar='DAYS',
+                          help='Flag stretches of at least DAYS without a publish')
+    calendar.add_argument('--html', type=Path, default=None, metavar='FILE',
+                          help='Write the previewed index.html to FILE')
+
+    outbox = subparsers.add_parser('outbox', help='Show (or push) commits waiting in the push outbox')
+    outbox.add_argument('--push', action='store_true', help='Push queued commits now, retrying with backoff')
+    outbox.add_argument('--timeout', type=float, default=60.0, metavar='SECONDS',
+                        help='Give up retrying --push after this long')
+
+    for sub in (ingest, batch, watch, serve):
+        sub.add_argument('--generator-worker', action='store_true',
+                         help='Use one persistent node process for render + index')
+    for sub in (ingest, batch):
+        sub.add_argument('--commit', action='store_true',
+                         help='Commit the ingested resources (one commit listing every slug) and push')
+        sub.add_argument('--worktree', action='store_true',
+                         help='Ingest each bundle in its own git worktree and fast-forward HEAD to its commit '
+                              '(bundles run concurrently)')
+    for sub in (ingest, batch, validate_all):
+        sub.add_argument('--trace', type=Path, default=None, metavar='FILE',
+                         help='Write stage timings (Chrome trace JSON, or JSON Lines for .jsonl)')
+
+    return parser
+
+
+def _validate_all_command(pipeline: IngestPipeline, args: argparse.Namespace) -> int:
+    """Run validate-all (read-only: no journal recovery) and print the JSON report."""
+    try:
+        with pipeline.span(args.command, 'run'):
+            results = pipeline.validate_all(args.workers)
+    finally:
+        if args.trace:
+            pipeline.log(f"Trace written: {pipeline.tracer.write(args.trace)}", 'info')
+
+    success = all(r.success for r in results)
+    print(json.dumps({
+        'command': args.command,
+        'repoRoot': str(pipeline.repo_root),
+        'success': success,
+        'errors': sum(len(r.errors) for r in results),
+        'warnings': sum(len(r.warnings) for r in results),
+        'results': [r.to_dict() for r in results if r.errors or r.warnings],
+    }, indent=2))
+    return 0 if success else 1
+
+
+def _catalog_command(pipeline: IngestPipeline, args: argparse.Namespace) -> int:
+    """Sync (or rebuild) the drafts catalog and print the requested rows as JSON."""
+    catalog = pipeline.get_drafts_catalog()
+    if catalog is None:
+        print(json.dumps({'command': args.command, 'success': False, 'error': 'Drafts catalog unavailable'}))
+        return 2
+    try:
+        if args.rebuild:
+            pipeline.log(f"Catalogued {catalog.rebuild()} drafts", 'success')
+        if args.slug:
+            rows = catalog.by_slug(args.slug)
+        elif args.on:
+            rows = catalog.publishing_on(args.on)
+        elif args.between:
+            rows = catalog.publishing_between(*args.between)
+        else:
+            rows = catalog.all()
+    finally:
+        catalog.close()
+
+    print(json.dumps({
+        'command': args.command,
+        'repoRoot': str(pipeline.repo_root),
+        'success': True,
+        'count': len(rows),
+        'drafts': rows,
+    }, indent=2))
+    return 0
+
+
+def _calendar_command(pipeline: IngestPipeline, args: argparse.Namespace) -> int:
+    """Print the index as of --date and the schedule around it as JSON."""
+    from publish_calendar import PublishCalendar, CalendarError, today_et, add_days
+
+    try:
+        day = date.fromisoformat(args.date).isoformat() if args.date else today_et()
+    except ValueError:
+        print(json.dumps({'command': args.command, 'success': False,
+                          'error': f"Invalid --date (expected YYYY-MM-DD): {args.date}"}))
+        return 2
+    try:
+        calendar = PublishCalendar.load(pipeline.repo_root)
+        if args.html:
+            args.html.write_text(calendar.render_index(day), encoding='utf-8')
+            pipeline.log(f"Index preview for {day} written: {args.html}", 'success')
+    except (CalendarError, OSError) as e:
+        print(json.dumps({'command': args.command, 'success': False, 'error': str(e)}))
+        return 2
+
+    print(json.dumps({
+        'command': args.command,
+        'repoRoot': str(pipeline.repo_root),
+        'success': True,
+        'date': day,
+        'published': [e.slug for e in calendar.published(day)],
+        'publishingToday': [e.to_dict() for e in calendar.events_on(day)],
+        'upcoming': [e.to_dict() for e in calendar.changes_between(day, add_days(day, args.ahead))],
+        'nextPublish': calendar.next_publish(day),
+        'clusters': [{'date': d, 'slugs': slugs} for d, slugs in calendar.clusters(args.cluster, day)],
+        'gaps': [{'from': a, 'to': b, 'days': n} for a, b, n in calendar.gaps(args.gap, day)],
+    }, indent=2))
+    return 0
+
+
+def _outbox_command(pipeline: IngestPipeline, args: argparse.Namespace) -> int:
+    """Print the push outbox as JSON (after pushing it with --push)."""
+    outbox = GitOutbox(pipeline.repo_root, log_callback=pipeline.log_callback)
+    success = outbox.flush(args.timeout) if args.push else True
+    status = outbox.status()
+    print(json.dumps({
+        'command': args.command,
+        'repoRoot': str(pipeline.repo_root),
+        'success': success,
+        'status': status.to_dict(),
+        'pending': outbox.pending(),
+    }, indent=2))
+    return 0 if success else 1
+
+
+def _watch_command(pipeline: IngestPipeline, args: argparse.Namespace) -> int:
+    """Run the inbox watcher until Ctrl+C / SIGTERM (a running batch is cancelled and rolled back)."""
+    from inbox_watcher import InboxWatcher
+
+    watcher = InboxWatcher(pipeline, args.inbox, debounce=args.debounce, max_workers=args.workers,
+                           max_batch=args.max_batch, force_overwrite=args.force,
+                           poll_interval=args.poll_interval, polling=args.polling)
+
+    def shutdown(signum, frame):
+        pipeline.log("Stopping watcher...", 'warning')
+        watcher.stop()
+        pipeline.cancel()
+
+    signal.signal(signal.SIGINT, shutdown)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, shutdown)
+
+    if args.generator_worker:
+        pipeline.start_generator_worker()
+    try:
+        watcher.run()
+    except OSError as e:
+        print(json.dumps({'command': args.command, 'success': False, 'error': str(e)}))
+        return 2
+    finally:
+        pipeline.stop_generator_worker()
+
+    print(json.dumps({
+        'command': args.command,
+        'inbox': str(watcher.inbox_dir),
+        'success': watcher.failed == 0,
+        'ingested': watcher.processed,
+        'failed': watcher.failed,
+    }, indent=2))
+    return 0 if watcher.failed == 0 else 1
+
+
+def _serve_command(pipeline: IngestPipeline, args: argparse.Namespace) -> int:
+    """Run the HTTP ingest service until Ctrl+C / SIGTERM."""
+    from ingest_service import IngestService, IngestHTTPServer
+
+    service = IngestService(pipeline, max_workers=args.workers, max_batch=args.max_batch,
+                            force_overwrite=args.force, log_callback=pipeline.log_callback)
+    try:
+        server = IngestHTTPServer((args.host, args.port), service, args.max_upload_mb * 1024 * 1024)
+    except OSError as e:
+        print(json.dumps({'command': args.command, 'success': False, 'error': str(e)}))
+        return 2
+    if args.host not in ('127.0.0.1', 'localhost', '::1'):
+        pipeline.log(f"Listening on {args.host} - the service has no authentication", 'warning')
+
+    def shutdown(signum, frame):
+        pipeline.log("Stopping service...", 'warning')
+        # shutdown() waits for serve_forever(), which runs on this thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, shutdown)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, shutdown)
+
+    if args.generator_worker:
+        pipeline.start_generator_worker()
+    service.start()
+    pipeline.log(f"Ingest service listening on http://{args.host}:{server.server_address[1]}", 'success')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.stop()
+        pipeline.stop_generator_worker()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Headless command-line entry point.
+
+    Returns:
+        Process exit code (0 on success, 1 if any bundle or check failed, 2 on setup errors)
+    """
+    args = _build_arg_parser().parse_args(argv)
+
+    repo_root = args.repo_root or find_repo_root(Path.cwd()) or find_repo_root(Path(__file__).parent)
+    if not repo_root:
+        print(json.dumps({'command': args.command, 'success': False,
+                          'error': 'Could not find repository root'}))
+        return 2
+
+    def log_to_stderr(message: str, level: str):
+        if args.quiet and level in ('info', 'success'):
+            return
+        print(f"[{level}] {message}", file=sys.stderr, flush=True)
+
+    pipeline = IngestPipeline(repo_root, log_callback=log_to_stderr)
+    if args.command == 'validate-all':
+        return _validate_all_command(pipeline, args)
+    if args.command == 'catalog':
+        return _catalog_command(pipeline, args)
+    if args.command == 'calendar':
+        return _calendar_command(pipeline, args)
+    if args.command == 'outbox':
+        return _outbox_command(pipeline, args)
+    pipeline.keep_temp_folder = args.keep_temp
+    pipeline.debug_mode = args.debug
+    pipeline.optimize_images = not args.no_optimize
+    pipeline.image_format = args.image_format
+    pipeline.image_quality = args.image_quality
+    pipeline.max_image_edge = args.max_image_edge
+    if args.no_variants:
+        pipeline.variant_widths = []
+    pipeline.generator_timeout_ceiling = args.generator_timeout
+
+    # Undo ingests a previous run left half-done (crash, kill, power loss)
+    pipeline.recover_interrupted()
+
+    if args.command == 'watch':
+        return _watch_command(pipeline, args)
+    if args.command == 'serve':
+        return _serve_command(pipeline, args)
+
+    if args.generator_worker:
+        pipeline.start_generator_worker()
+    try:
+        with pipeline.span(args.command, 'run'):
+            if args.command == 'ingest' and args.worktree:
+                results = [pipeline.ingest_in_worktree(args.markdown, args.hero, args.inline, args.force)]
+            elif args.command == 'ingest':
+                results = [pipeline.ingest(args.markdown, args.hero, args.inline, args.force)]
+            elif args.worktree:
+                results = pipeline.ingest_worktrees(args.bundles, args.force, args.workers)
+            else:
+                results = pipeline.ingest_batch(args.bundles, args.force, args.workers)
+    finally:
+        pipeline.stop_generator_worker()
+        if args.trace:
+            pipeline.log(f"Trace written: {pipeline.tracer.write(args.trace)}", 'info')
+
+    success = all(r.success for r in results)
+    report = {
+        'command': args.command,
+        'repoRoot': str(repo_root),
+        'success': success,
+        'results': [r.to_dict() for r in results],
+    }
+    if args.commit and args.worktree and any(r.success for r in results):
+        # Worktree ingests are already committed: one push for all of them
+        committed, output = pipeline.push()
+        pipeline.log(output, 'info' if committed else 'error')
+        report['commit'] = {'success': committed, 'output': output}
+        report['success'] = success = success and committed
+    elif args.commit and pipeline.session_resources:
+        # One commit and one push for every bundle that succeeded
+        committed, output = pipeline.commit_session()
+        pipeline.log(output, 'info' if committed else 'error')
+        report['commit'] = {'success': committed, 'output': output}
+        report['success'] = success = success and committed
+    print(json.dumps(report, indent=2))
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
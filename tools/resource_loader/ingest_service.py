@@ -0,0 +1,475 @@
+"""
+Fox Fuel Resource Loader - Local Ingest Service
+
+A small HTTP API around IngestPipeline for other local tools (CMS export,
+image team scripts). Stdlib only, offline, bound to 127.0.0.1 by default.
+
+    POST   /jobs             multipart upload: 1 .md + 2 images (+ optional force=1|0)
+                             -> 202 {"job": {...}}
+    GET    /jobs             all jobs (newest first, without logs)
+    GET    /jobs/<id>        one job: state, stage, errors, staged files, timings
+    GET    /jobs/<id>/log    log lines (?since=N returns lines N and later)
+    DELETE /jobs/<id>        cancel a queued job
+    GET    /health           queue depth and the job being processed
+
+Uploads are saved under tools/resource_loader/tmp/service/<job id>/ and
+queued. One dispatcher thread takes up to max_batch queued jobs at a time
+and runs them through IngestPipeline.ingest_batch() with a pool of staging
+workers and one generator run, holding the repo lock so no two batches
+write to the repo at once. Upload folders of successful jobs are removed;
+failed ones are kept for inspection.
+
+Example:
+    curl -F md=@guide.md -F hero=@guide-header.png -F inline=@guide-inline.png \\
+         http://127.0.0.1:8765/jobs
+"""
+
+import re
+import json
+import uuid
+import queue
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from tracing import Tracer
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Jobs kept in memory (oldest finished jobs are dropped first)
+MAX_JOBS = 500
+# Log lines kept per job
+MAX_LOG_LINES = 5000
+
+UPLOAD_EXTENSIONS = ('.md', '.png', '.jpg', '.jpeg')
+
+# Batch children log as "[<bundle folder name>] message"; folders are named after the job id
+_JOB_LOG_PATTERN = re.compile(r'^\[([0-9a-f]{12})\] (.*)$', re.DOTALL)
+
+
+class ServiceError(Exception):
+    """A request the service rejects (carries the HTTP status)."""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class IngestJob:
+    """One uploaded bundle and its progress."""
+    id: str
+    bundle_dir: Path
+    files: List[str]
+    force_overwrite: bool = False
+    state: str = 'queued'  # queued, running, succeeded, failed, cancelled
+    created: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+    started: Optional[str] = None
+    finished: Optional[str] = None
+    slug: str = ''
+    stage: str = ''
+    errors: List[str] = field(default_factory=list)
+    staged_files: List[str] = field(default_factory=list)
+    timings: Dict[str, Any] = field(default_factory=dict)
+    logs: List[Dict[str, str]] = field(default_factory=list)
+    logs_dropped: int = 0  # Oldest lines dropped beyond MAX_LOG_LINES
+
+    def add_log(self, message: str, level: str):
+        self.logs.append({'time': datetime.now().isoformat(timespec='milliseconds'),
+                          'level': level, 'message': message})
+        if len(self.logs) > MAX_LOG_LINES:
+            del self.logs[0]
+            self.logs_dropped += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation (without log lines)."""
+        return {
+            'id': self.id,
+            'state': self.state,
+            'files': list(self.files),
+            'force': self.force_overwrite,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'slug': self.slug,
+            'stage': self.stage,
+            'errors': list(self.errors),
+            'stagedFiles': list(self.staged_files),
+            'timings': self.timings,
+            'logLines': self.logs_dropped + len(self.logs),
+        }
+
+
+def parse_multipart(content_type: str, body: bytes) -> Tuple[Dict[str, str], List[Tuple[str, bytes]]]:
+    """
+    Split a multipart/form-data body.
+
+    Returns:
+        (form fields, [(file name, content), ...])
+
+    Raises:
+        ServiceError: If the body is not multipart/form-data
+    """
+    if not content_type.lower().startswith('multipart/form-data'):
+        raise ServiceError("Expected multipart/form-data", HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+    message = BytesParser(policy=HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    if not message.is_multipart():
+        raise ServiceError("Malformed multipart body")
+
+    fields: Dict[str, str] = {}
+    files: List[Tuple[str, bytes]] = []
+    for part in message.iter_parts():
+        filename = part.get_filename()
+        payload = part.get_payload(decode=True) or b''
+        if filename:
+            files.append((filename, payload))
+        else:
+            name = part.get_param('name', header='content-disposition')
+            if name:
+                fields[name] = payload.decode('utf-8', 'replace')
+    return fields, files
+
+
+class IngestService:
+    """Job queue and dispatcher around one IngestPipeline."""
+
+    def __init__(self, pipeline, max_workers: int = 2, max_batch: int = 10,
+                 force_overwrite: bool = False, log_callback=None):
+        """
+        Args:
+            pipeline: IngestPipeline whose settings apply to every job. Its
+                log_callback is replaced: log lines are routed to their jobs
+            max_workers: Staging workers per batch
+            max_batch: Most jobs ingested together (one generator run)
+            force_overwrite: Default for uploads without a force field
+            log_callback: Optional service-wide log(message, level) (e.g. stderr)
+        """
+        self.pipeline = pipeline
+        self.max_workers = max(1, max_workers)
+        self.max_batch = max(1, max_batch)
+        self.force_overwrite = force_overwrite
+        self.log_callback = log_callback
+        self.upload_root = pipeline.repo_root / 'tools' / 'resource_loader' / 'tmp' / 'service'
+
+        self.jobs: 'OrderedDict[str, IngestJob]' = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._queue: 'queue.Queue[Optional[str]]' = queue.Queue()
+        self.repo_lock = threading.Lock()  # Held while a batch writes to the repo
+        self._batch: List[IngestJob] = []  # Jobs of the running batch
+        self._dispatcher: Optional[threading.Thread] = None
+
+        pipeline.log_callback = self._route_log
+
+    def log(self, message: str, level: str = 'info'):
+        if self.log_callback:
+            self.log_callback(message, level)
+
+    def _route_log(self, message: str, level: str):
+        """Pipeline log lines go to their job (batch-wide lines to every job in the batch)."""
+        match = _JOB_LOG_PATTERN.match(message)
+        with self._jobs_lock:
+            job = self.jobs.get(match.group(1)) if match else None
+            if job is not None:
+                job.add_log(match.group(2), level)
+            else:
+                for batch_job in self._batch:
+                    batch_job.add_log(message, level)
+        self.log(message, level)
+
+    # --- Jobs -------------------------------------------------------------
+
+    def submit(self, files: List[Tuple[str, bytes]], force_overwrite: bool = False) -> IngestJob:
+        """
+        Save an uploaded bundle and queue it.
+
+        Raises:
+            ServiceError: If the upload is not 1 markdown file and 2 images
+        """
+        names = []
+        for filename, _ in files:
+            name = Path(filename.replace('\\', '/')).name  # Never a path from the client
+            if not name or name.startswith('.') or Path(name).suffix.lower() not in UPLOAD_EXTENSIONS:
+                raise ServiceError(f"Unsupported file: {filename!r} (expected .md, .png, .jpg, .jpeg)")
+            names.append(name)
+        if len(set(n.lower() for n in names)) != len(names):
+            raise ServiceError("Duplicate file names in upload")
+        md_count = sum(1 for n in names if n.lower().endswith('.md'))
+        if md_count != 1 or len(names) != 3:
+            raise ServiceError(f"Expected 1 markdown file and 2 images, got {len(names)} file(s) "
+                               f"({md_count} markdown)")
+
+        job_id = uuid.uuid4().hex[:12]
+        bundle_dir = self.upload_root / job_id
+        bundle_dir.mkdir(parents=True)
+        for name, (_, content) in zip(names, files):
+            (bundle_dir / name).write_bytes(content)
+
+        job = IngestJob(id=job_id, bundle_dir=bundle_dir, files=names, force_overwrite=force_overwrite)
+        with self._jobs_lock:
+            self.jobs[job_id] = job
+            self._trim_jobs()
+        self._queue.put(job_id)
+        self.log(f"Job {job_id} queued ({', '.join(names)})", 'info')
+        return job
+
+    def _trim_jobs(self):
+        """Drop the oldest finished jobs beyond MAX_JOBS (caller holds _jobs_lock)."""
+        excess = len(self.jobs) - MAX_JOBS
+        for job_id in [j.id for j in self.jobs.values() if j.finished][:max(0, excess)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> IngestJob:
+        """
+        Raises:
+            ServiceError: 404 if the job is unknown
+        """
+        with self._jobs_lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise ServiceError(f"Unknown job: {job_id}", HTTPStatus.NOT_FOUND)
+        return job
+
+    def job_log(self, job_id: str, since: int = 0) -> Tuple[List[str], int, str]:
+        """
+        Log lines of a job from line number since on.
+
+        Args:
+            job_id: Job id
+            since: First line wanted (the previous call's next); lines
+                already dropped from the job's buffer are skipped
+
+        Returns:
+            (lines, next line number, job state)
+
+        Raises:
+            ServiceError: 404 if the job is unknown
+        """
+        job = self.get(job_id)
+        with self._jobs_lock:
+            lines = job.logs[max(0, since - job.logs_dropped):]
+            return lines, job.logs_dropped + len(job.logs), job.state
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Every job, newest first (JSON-serializable)."""
+        with self._jobs_lock:
+            return [job.to_dict() for job in reversed(self.jobs.values())]
+
+    def cancel(self, job_id: str) -> IngestJob:
+        """
+        Cancel a queued job.
+
+        Raises:
+            ServiceError: 404 if unknown, 409 if it already started
+        """
+        job = self.get(job_id)
+        with self._jobs_lock:
+            if job.state != 'queued':
+                raise ServiceError(f"Job {job_id} is {job.state}", HTTPStatus.CONFLICT)
+            job.state = 'cancelled'
+            job.finished = datetime.now().isoformat(timespec='seconds')
+        shutil.rmtree(job.bundle_dir, ignore_errors=True)
+        return job
+
+    def status(self) -> Dict[str, Any]:
+        with self._jobs_lock:
+            states: Dict[str, int] = {}
+            for job in self.jobs.values():
+                states[job.state] = states.get(job.state, 0) + 1
+            running = [job.id for job in self._batch]
+        return {'ok': True, 'jobs': states, 'running': running,
+                'workers': self.max_workers, 'maxBatch': self.max_batch}
+
+    # --- Dispatcher -------------------------------------------------------
+
+    def start(self):
+        """Start the dispatcher thread."""
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='ingest-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish the running batch, then stop the dispatcher (queued jobs stay queued)."""
+        self._queue.put(None)
+        if self._dispatcher:
+            self._dispatcher.join(timeout)
+
+    def _next_batch(self) -> Optional[List[IngestJob]]:
+        """Block for a queued job, then take more without waiting (same force setting)."""
+        job_ids = [self._queue.get()]
+        while len(job_ids) < self.max_batch:
+            try:
+                job_ids.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if None in job_ids:
+            return None
+
+        batch: List[IngestJob] = []
+        with self._jobs_lock:
+            for job_id in job_ids:
+                job = self.jobs.get(job_id)
+                if job is None or job.state != 'queued':
+                    continue  # Cancelled while queued
+                if batch and job.force_overwrite != batch[0].force_overwrite:
+                    self._queue.put(job_id)  # Next batch
+                    continue
+                batch.append(job)
+        return batch
+
+    def _dispatch_loop(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if batch:
+                try:
+                    self._run_batch(batch)
+                except Exception as e:
+                    # Never let one batch take the service down
+                    self.log(f"Batch failed: {e}", 'error')
+                    with self._jobs_lock:
+                        for job in batch:
+                            if job.state == 'running':
+                                job.state = 'failed'
+                                job.errors.append(str(e))
+                                job.finished = datetime.now().isoformat(timespec='seconds')
+                        self._batch = []
+
+    def _run_batch(self, batch: List[IngestJob]):
+        with self.repo_lock:
+            started = datetime.now().isoformat(timespec='seconds')
+            with self._jobs_lock:
+                for job in batch:
+                    job.state = 'running'
+                    job.started = started
+                self._batch = batch
+
+            # Fresh tracer per batch: its spans become the jobs' timings
+            tracer = Tracer()
+            self.pipeline.tracer = tracer
+            self.pipeline.get_repo_index().refresh_if_changed()
+            results = self.pipeline.ingest_batch([job.bundle_dir for job in batch],
+                                                 batch[0].force_overwrite, self.max_workers)
+
+            finished = datetime.now().isoformat(timespec='seconds')
+            batch_totals = {name: round(seconds * 1000, 1) for name, seconds in tracer.totals().items()}
+            with self._jobs_lock:
+                for job, result in zip(batch, results):
+                    job.slug = result.slug
+                    job.stage = result.stage
+                    job.errors = list(result.errors)
+                    job.staged_files = [str(p) for p in result.staged_files]
+                    job.state = 'succeeded' if result.success else 'failed'
+                    job.finished = finished
+                    job.timings = {
+                        'stagesMs': {e['name']: round(e['dur'] * 1000, 1) for e in tracer.events
+                                     if result.slug and e['args'].get('slug') == result.slug},
+                        'batchMs': batch_totals,
+                        'batchSize': len(batch),
+                    }
+                self._batch = []
+
+        for job in batch:
+            if job.state == 'succeeded':
+                shutil.rmtree(job.bundle_dir, ignore_errors=True)
+            self.log(f"Job {job.id} {job.state}" + (f" ({job.slug})" if job.slug else ''),
+                     'success' if job.state == 'succeeded' else 'error')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes requests to the IngestService on the server."""
+
+    server_version = 'FoxFuelIngest/1.0'
+
+    @property
+    def service(self) -> IngestService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        self.service.log(f"HTTP {self.address_string()} {format % args}", 'info')
+
+    def _send_json(self, status: HTTPStatus, data: Dict[str, Any]):
+        body = json.dumps(data, indent=2).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str):
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split('/') if p]
+        try:
+            if method == 'GET' and parts == ['health']:
+                self._send_json(HTTPStatus.OK, self.service.status())
+            elif method == 'GET' and parts == ['jobs']:
+                self._send_json(HTTPStatus.OK, {'jobs': self.service.list_jobs()})
+            elif method == 'POST' and parts == ['jobs']:
+                self._submit()
+            elif method == 'GET' and len(parts) == 2 and parts[0] == 'jobs':
+                self._send_json(HTTPStatus.OK, {'job': self.service.get(parts[1]).to_dict()})
+            elif method == 'GET' and len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'log':
+                self._send_log(parts[1], parse_qs(url.query))
+            elif method == 'DELETE' and len(parts) == 2 and parts[0] == 'jobs':
+                self._send_json(HTTPStatus.OK, {'job': self.service.cancel(parts[1]).to_dict()})
+            else:
+                raise ServiceError(f"No route for {method} {url.path}", HTTPStatus.NOT_FOUND)
+        except ServiceError as e:
+            self._send_json(e.status, {'error': str(e)})
+
+    def _submit(self):
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            raise ServiceError("Content-Length required", HTTPStatus.LENGTH_REQUIRED)
+        if length > self.server.max_upload_bytes:
+            raise ServiceError(f"Upload larger than {self.server.max_upload_bytes} bytes",
+                               HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = self.rfile.read(length)
+        fields, files = parse_multipart(self.headers.get('Content-Type', ''), body)
+        if 'force' in fields:
+            force = fields['force'].strip().lower() in ('1', 'true', 'yes', 'on')
+        else:
+            force = self.service.force_overwrite
+        job = self.service.submit(files, force)
+        self._send_json(HTTPStatus.ACCEPTED, {'job': job.to_dict()})
+
+    def _send_log(self, job_id: str, query: Dict[str, List[str]]):
+        try:
+            since = int(query.get('since', ['0'])[0])
+        except ValueError:
+            raise ServiceError("since must be an integer")
+        lines, total, state = self.service.job_log(job_id, since)
+        self._send_json(HTTPStatus.OK, {'id': job_id, 'state': state, 'next': total, 'lines': lines})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+class IngestHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer carrying the service and upload limit."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: IngestService,
+                 max_upload_bytes: int = 64 * 1024 * 1024):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
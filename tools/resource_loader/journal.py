@@ -0,0 +1,286 @@
+"""
+Fox Fuel Resource Loader - Rollback Journal
+
+Write-ahead journal for one ingest transaction. Every change staging makes
+to the repo is recorded in journal.json *before* it happens, and overwritten
+originals are moved aside (or cloned) into the journal folder instead of
+being held in memory:
+
+    tools/resource_loader/tmp/journal/<txid>/journal.json
+    tools/resource_loader/tmp/journal/<txid>/files/<n>-<name>
+
+rollback() replays the journal backwards. A transaction left 'pending' by a
+process that is no longer running was interrupted (crash, kill, power loss)
+and is undone by recover(); 'committed' journals are only deleted.
+"""
+
+import os
+import json
+import shutil
+import socket
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Callable
+
+from staging import clone_file
+
+
+class JournalError(Exception):
+    """Raised when a journal cannot be read or written."""
+    pass
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether a process with this pid is running on this machine."""
+    if os.name == 'nt':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class IngestJournal:
+    """On-disk intent log and backup store for one ingest transaction."""
+
+    VERSION = 1
+
+    # Transaction states
+    PENDING = 'pending'      # In progress; undone by recovery if its process is gone
+    FAILED = 'failed'        # Failed after staging; files kept in place for inspection
+    COMMITTED = 'committed'  # Finished; the journal is deleted
+    ROLLED_BACK = 'rolled_back'  # Undone; the journal is deleted
+
+    # Backup modes
+    MOVE = 'move'  # Rename the original away (file is removed or replaced)
+    LINK = 'link'  # Reflink/hardlink/copy (file is replaced with os.replace)
+    COPY = 'copy'  # Reflink/copy, never a hardlink (file is rewritten in place)
+
+    def __init__(self, repo_root: Path, tx_dir: Path, data: Dict[str, Any]):
+        self.repo_root = Path(repo_root)
+        self.tx_dir = Path(tx_dir)
+        self.data = data
+
+    @property
+    def txid(self) -> str:
+        return self.data['txid']
+
+    @property
+    def slug(self) -> str:
+        return self.data['slug']
+
+    @property
+    def state(self) -> str:
+        return self.data['state']
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.data['meta']
+
+    @classmethod
+    def begin(cls, journal_root: Path, repo_root: Path, slug: str) -> 'IngestJournal':
+        """Start a new pending transaction for a slug."""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        txid = f"{slug}-{timestamp}-{os.getpid()}"
+        tx_dir = Path(journal_root) / txid
+        (tx_dir / 'files').mkdir(parents=True, exist_ok=False)
+        journal = cls(repo_root, tx_dir, {
+            'version': cls.VERSION,
+            'txid': txid,
+            'slug': slug,
+            'state': cls.PENDING,
+            'pid': os.getpid(),
+            'host': socket.gethostname(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'operations': [],
+            'meta': {},
+        })
+        journal._save()
+        return journal
+
+    @classmethod
+    def load(cls, repo_root: Path, tx_dir: Path) -> 'IngestJournal':
+        """Load a journal folder."""
+        try:
+            with open(Path(tx_dir) / 'journal.json', 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise JournalError(f"Unreadable journal {Path(tx_dir).name}: {e}")
+        return cls(repo_root, tx_dir, data)
+
+    @classmethod
+    def find(cls, journal_root: Path, repo_root: Path) -> List['IngestJournal']:
+        """All journals under journal_root, oldest first (unreadable ones are skipped)."""
+        journal_root = Path(journal_root)
+        if not journal_root.is_dir():
+            return []
+        journals = []
+        for tx_dir in sorted(journal_root.iterdir()):
+            if (tx_dir / 'journal.json').is_file():
+                try:
+                    journals.append(cls.load(repo_root, tx_dir))
+                except JournalError:
+                    continue
+        journals.sort(key=lambda j: j.data.get('created', ''))
+        return journals
+
+    def is_own(self) -> bool:
+        """Whether this process started the transaction."""
+        return self.data.get('host') == socket.gethostname() and int(self.data.get('pid', 0)) == os.getpid()
+
+    def is_orphaned(self) -> bool:
+        """Whether the process that owns this pending transaction is gone."""
+        if self.data.get('host') != socket.gethostname():
+            return True
+        return not pid_alive(int(self.data.get('pid', 0)))
+
+    def _save(self):
+        """Rewrite journal.json atomically and durably."""
+        path = self.tx_dir / 'journal.json'
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(self.data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _rel(self, path: Path) -> str:
+        return Path(path).resolve().relative_to(self.repo_root.resolve()).as_posix()
+
+    def _abs(self, rel: str) -> Path:
+        return self.repo_root / rel
+
+    def record_create(self, path: Path):
+        """Record that path is about to be created or replaced."""
+        self.data['operations'].append({'op': 'create', 'path': self._rel(path)})
+        self._save()
+
+    def backup(self, path: Path, mode: str) -> bool:
+        """
+        Preserve an existing file before it is changed.
+
+        The intent is journaled first, then the original is moved aside
+        (MOVE) or cloned (LINK/COPY) into the journal's files/ folder.
+
+        Returns:
+            True if path existed and was backed up
+        """
+        path = Path(path)
+        if not path.exists():
+            return False
+        rel = self._rel(path)
+        if any(op['op'] == 'backup' and op['path'] == rel for op in self.data['operations']):
+            return True  # First backup wins: it holds the pre-transaction bytes
+
+        self.data['backups'] = self.data.get('backups', 0) + 1
+        backup_name = f"{self.data['backups']}-{path.name}"
+        self.data['operations'].append({'op': 'backup', 'path': rel, 'backup': backup_name, 'mode': mode})
+        self._save()
+
+        # The backup only appears under its journaled name once complete, so
+        # a crash mid-clone never restores a partial file
+        backup_path = self.tx_dir / 'files' / backup_name
+        if mode == self.MOVE:
+            os.replace(path, backup_path)
+        else:
+            partial = backup_path.with_name(backup_path.name + '.partial')
+            clone_file(path, partial, allow_hardlink=(mode == self.LINK))
+            os.replace(partial, backup_path)
+        return True
+
+    def discard(self, path: Path):
+        """Forget a file the transaction ended up not changing."""
+        rel = self._rel(path)
+        kept = []
+        for op in self.data['operations']:
+            if op['path'] != rel:
+                kept.append(op)
+            elif op['op'] == 'backup':
+                try:
+                    (self.tx_dir / 'files' / op['backup']).unlink()
+                except OSError:
+                    pass
+        self.data['operations'] = kept
+        self._save()
+
+    def set_meta(self, key: str, value: Any):
+        """Journal extra rollback data (e.g. manifest entries) before the change is made."""
+        self.meta[key] = value
+        self._save()
+
+    def created_paths(self) -> List[Path]:
+        """Paths the transaction created that did not exist before."""
+        backed_up = {op['path'] for op in self.data['operations'] if op['op'] == 'backup'}
+        return [self._abs(op['path']) for op in self.data['operations']
+                if op['op'] == 'create' and op['path'] not in backed_up]
+
+    def paths(self) -> List[Path]:
+        """Every repo path the transaction touched."""
+        return [self._abs(rel) for rel in dict.fromkeys(op['path'] for op in self.data['operations'])]
+
+    def rollback(self, log: Callable[[str, str], None]) -> List[str]:
+        """
+        Replay the journal backwards: delete created files, restore backups.
+
+        Safe to run on a partially applied transaction (a backup that was
+        journaled but never made means the original was never touched).
+
+        Returns:
+            List of error messages (empty on a clean rollback)
+        """
+        errors = []
+
+        for path in reversed(self.created_paths()):
+            try:
+                if path.exists():
+                    path.unlink()
+                    log(f"Removed: {path.name}", 'info')
+            except OSError as e:
+                errors.append(f"Failed to remove {path.name}: {e}")
+
+        for op in reversed(self.data['operations']):
+            if op['op'] != 'backup':
+                continue
+            path = self._abs(op['path'])
+            backup_path = self.tx_dir / 'files' / op['backup']
+            if not backup_path.exists():
+                continue
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(backup_path, path)
+                log(f"Restored: {path.name}", 'info')
+            except OSError as e:
+                errors.append(f"Failed to restore {path.name}: {e}")
+
+        for message in errors:
+            log(message, 'error')
+        return errors
+
+    def close(self, state: str):
+        """
+        End the transaction.
+
+        COMMITTED and ROLLED_BACK delete the journal; FAILED keeps it, with
+        its backups, until a later transaction for the same slug supersedes it.
+        """
+        self.data['state'] = state
+        self._save()
+        if state in (self.COMMITTED, self.ROLLED_BACK):
+            shutil.rmtree(self.tx_dir, ignore_errors=True)
+
+    def remove(self):
+        """Delete the journal folder."""
+        shutil.rmtree(self.tx_dir, ignore_errors=True)
@@ -0,0 +1,228 @@
+"""
+Fox Fuel Resource Loader - Publish Calendar
+
+Answers "what does resources/index.html look like on date X?" without
+touching the system clock or any file. The resource list (legacy
+resources.manifest.json entries and draft front matter) is read once,
+through `node scripts/regenerate-index.js --list`, into a timeline sorted
+by publishDate; a date query is then a bisect into that timeline:
+
+    published on X  = timeline[:bisect_right(dates, X)]
+
+The index preview itself comes from `regenerate-index.js --today X
+--stdout`, so fields, card markup and order are exactly what the generator
+will publish on X (including how its line parser reads front matter).
+"""
+
+import json
+import subprocess
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+NODE_TIMEOUT = 60  # Seconds before a hanging regenerate-index.js is killed
+
+PUBLISH_TIMEZONE = 'America/New_York'
+
+
+def today_et() -> str:
+    """Today's date (YYYY-MM-DD) in America/New_York, as the generators see it."""
+    try:
+        from zoneinfo import ZoneInfo
+        return datetime.now(ZoneInfo(PUBLISH_TIMEZONE)).date().isoformat()
+    except Exception:
+        # No tz database (Windows without tzdata): local date
+        return date.today().isoformat()
+
+
+class CalendarError(Exception):
+    """Raised when regenerate-index.js cannot list or render the resources."""
+    pass
+
+
+def _run_indexer(script: Path, args: List[str]) -> str:
+    """
+    Run regenerate-index.js with args and return its stdout.
+
+    Raises:
+        CalendarError: If node is missing, times out or the script fails
+    """
+    try:
+        result = subprocess.run(['node', str(script), *args], cwd=str(script.parent.parent),
+                                capture_output=True, text=True, encoding='utf-8', timeout=NODE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise CalendarError(f"Could not run {script.name}: {e}")
+    if result.returncode != 0:
+        raise CalendarError(f"{script.name} failed: {result.stderr.strip()[:500]}")
+    return result.stdout
+
+
+@dataclass
+class PublishEvent:
+    """One resource appearing on the index."""
+    publish_date: str
+    slug: str
+    title: str = ''
+    short_title: str = ''
+    description: str = ''
+    category: str = ''
+    tag_type: str = ''
+    source: str = 'draft'  # 'draft' or 'manifest'
+    order: int = 0  # Position in regenerate-index.js's resource list (tie-breaker)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        del data['order']
+        return data
+
+
+class PublishCalendar:
+    """Precomputed publish timeline for one repository."""
+
+    def __init__(self, events: List[PublishEvent], index_script: Optional[Path] = None):
+        """
+        Args:
+            events: Resources in regenerate-index.js order (manifest entries,
+                then drafts; a draft replaces the manifest entry of its slug)
+            index_script: scripts/regenerate-index.js, used by render_index()
+        """
+        self.index_script = index_script
+        # Ascending by date; within a date, later list positions first, so a
+        # reversed prefix is newest-first with ties in list order
+        self.timeline = sorted(events, key=lambda e: (e.publish_date, -e.order))
+        self.dates = [e.publish_date for e in self.timeline]
+        self._pages: Dict[int, str] = {}  # Prefix length -> rendered index.html
+
+    @classmethod
+    def load(cls, repo_root: Path) -> 'PublishCalendar':
+        """
+        List the manifest entries and drafts once, as regenerate-index.js reads them.
+
+        Resources without a slug or publishDate are left out, as the
+        generator leaves them off the index.
+
+        Args:
+            repo_root: Repository root (holds scripts/regenerate-index.js)
+
+        Raises:
+            CalendarError: If the resource list cannot be read
+        """
+        index_script = Path(repo_root) / 'scripts' / 'regenerate-index.js'
+        try:
+            resources = json.loads(_run_indexer(index_script, ['--list']))
+        except ValueError as e:
+            raise CalendarError(f"Unreadable resource list from {index_script.name}: {e}")
+
+        events = []
+        for order, entry in enumerate(resources):
+            if not entry.get('slug') or not entry.get('publishDate'):
+                continue
+            events.append(PublishEvent(
+                publish_date=str(entry['publishDate']),
+                slug=str(entry['slug']),
+                title=entry.get('title') or '',
+                short_title=entry.get('shortTitle') or '',
+                description=entry.get('description') or '',
+                category=entry.get('category') or '',
+                tag_type=entry.get('tagType') or '',
+                source=entry.get('source', 'draft'),
+                order=order,
+            ))
+        return cls(events, index_script)
+
+    # --- Date queries (bisect; no file access) ---------------------------
+
+    def _count(self, day: str) -> int:
+        """Number of resources published on or before day."""
+        return bisect_right(self.dates, day)
+
+    def published(self, day: str) -> List[PublishEvent]:
+        """Resources on the index on day, newest first (the card order)."""
+        return self.timeline[:self._count(day)][::-1]
+
+    def scheduled(self, day: str) -> List[PublishEvent]:
+        """Resources still to come after day, soonest first."""
+        return self.timeline[self._count(day):]
+
+    def events_on(self, day: str) -> List[PublishEvent]:
+        """Resources whose publishDate is exactly day."""
+        return self.timeline[bisect_left(self.dates, day):self._count(day)]
+
+    def next_publish(self, day: str) -> Optional[str]:
+        """First publish date after day, or None."""
+        i = self._count(day)
+        return self.dates[i] if i < len(self.dates) else None
+
+    def changes_between(self, start: str, end: str) -> List[PublishEvent]:
+        """Resources that appear on the index after start, up to and including end."""
+        return self.timeline[self._count(start):self._count(end)]
+
+    # --- Schedule health ------------------------------------------------
+
+    def clusters(self, min_count: int = 2, start: Optional[str] = None) -> List[Tuple[str, List[str]]]:
+        """
+        Days on which at least min_count resources publish.
+
+        Args:
+            min_count: Smallest number of resources on one day reported
+            start: Only consider publish days from this date on (e.g. today)
+
+        Returns:
+            List of (date, slugs)
+        """
+        result = []
+        i = bisect_left(self.dates, start) if start else 0
+        while i < len(self.dates):
+            j = bisect_right(self.dates, self.dates[i], i)
+            if j - i >= min_count:
+                result.append((self.dates[i], [e.slug for e in self.timeline[i:j]]))
+            i = j
+        return result
+
+    def gaps(self, min_days: int = 14, start: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """
+        Stretches of at least min_days between consecutive publish days.
+
+        Args:
+            min_days: Smallest gap reported
+            start: Only consider publish days from this date on (e.g. today)
+
+        Returns:
+            List of (previous publish date, next publish date, days between)
+        """
+        days = sorted(set(self.dates[bisect_left(self.dates, start):] if start else self.dates))
+        result = []
+        for previous, following in zip(days, days[1:]):
+            try:
+                span = (date.fromisoformat(following) - date.fromisoformat(previous)).days
+            except ValueError:
+                continue  # Not a YYYY-MM-DD date; validation reports those
+            if span >= min_days:
+                result.append((previous, following, span))
+        return result
+
+    # --- Rendering -------------------------------------------------------
+
+    def render_index(self, day: str) -> str:
+        """
+        index.html as regenerate-index.js would write it on day; nothing is written.
+
+        Dates with the same published set share one node run.
+
+        Args:
+            day: Date (YYYY-MM-DD)
+
+        Raises:
+            CalendarError: If regenerate-index.js fails
+        """
+        count = self._count(day)
+        if count not in self._pages:
+            self._pages[count] = _run_indexer(self.index_script, ['--today', day, '--stdout'])
+        return self._pages[count]
+
+
+def add_days(day: str, days: int) -> str:
+    """YYYY-MM-DD shifted by a number of days."""
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
@@ -0,0 +1,133 @@
+"""
+Fox Fuel Resource Loader - Repository Configuration Snapshot
+
+One parsed copy of the files that configure ingest:
+- resources/resources.manifest.json (category tags, legacy resources)
+- resources/TEMPLATE-resource-single.html (path and hash)
+
+RepoConfigCache hands out an immutable RepoConfig snapshot and reloads it
+only when a file's (mtime, size) stamp changes, so validation no longer
+re-reads and re-parses the manifest per bundle. One cache is shared by the
+GUI, every pipeline of a session and batch children. (The node scripts
+keep their own (mtime, size)-memoized copies inside the generator worker.)
+"""
+
+import os
+import json
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+
+class RepoConfigError(Exception):
+    """Raised when the manifest is missing or cannot be parsed."""
+    pass
+
+
+def file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass(frozen=True)
+class RepoConfig:
+    """Snapshot of the manifest and template at one point in time."""
+    manifest_path: Path
+    template_path: Path
+    manifest: Dict[str, Any]
+    manifest_sha256: str
+    template_sha256: Optional[str]  # None if the template is missing
+    stamps: Dict[Path, Optional[Tuple[int, int]]] = field(default_factory=dict)
+
+    @property
+    def category_tags(self) -> Dict[str, Any]:
+        """tagType -> tag settings (label, ...)."""
+        return self.manifest.get('categoryTags', {})
+
+    @property
+    def tag_types(self) -> List[str]:
+        return list(self.category_tags.keys())
+
+    @property
+    def legacy_resources(self) -> List[Dict[str, Any]]:
+        """Resources published through the manifest (before drafts existed)."""
+        return self.manifest.get('resources', [])
+
+    @property
+    def legacy_slugs(self) -> List[str]:
+        return [r['slug'] for r in self.legacy_resources if r.get('slug')]
+
+    @classmethod
+    def load(cls, resources_dir: Path) -> 'RepoConfig':
+        """
+        Read and parse the manifest and hash the template.
+
+        Raises:
+            RepoConfigError: If the manifest is missing or not valid JSON
+        """
+        resources_dir = Path(resources_dir)
+        manifest_path = resources_dir / 'resources.manifest.json'
+        template_path = resources_dir / 'TEMPLATE-resource-single.html'
+
+        # Stamp first: a change made while reading shows up as stale next time
+        stamps = {manifest_path: file_stamp(manifest_path), template_path: file_stamp(template_path)}
+        try:
+            raw = manifest_path.read_bytes()
+        except OSError:
+            raise RepoConfigError(f"Manifest not found: {manifest_path}")
+        try:
+            manifest = json.loads(raw.decode('utf-8'))
+        except ValueError as e:
+            raise RepoConfigError(f"Invalid manifest {manifest_path.name}: {e}")
+
+        try:
+            template_sha256 = hashlib.sha256(template_path.read_bytes()).hexdigest()
+        except OSError:
+            template_sha256 = None
+
+        return cls(
+            manifest_path=manifest_path,
+            template_path=template_path,
+            manifest=manifest,
+            manifest_sha256=hashlib.sha256(raw).hexdigest(),
+            template_sha256=template_sha256,
+            stamps=stamps,
+        )
+
+    def is_current(self) -> bool:
+        """Whether every file still has the stamp it had when loaded (stat only)."""
+        return all(file_stamp(path) == stamp for path, stamp in self.stamps.items())
+
+
+class RepoConfigCache:
+    """Shared, revalidating holder of the current RepoConfig (thread-safe)."""
+
+    def __init__(self, resources_dir: Path):
+        self.resources_dir = Path(resources_dir)
+        self._lock = threading.Lock()
+        self._config: Optional[RepoConfig] = None
+        self.loads = 0  # Number of times the files were actually read
+
+    def get(self) -> RepoConfig:
+        """
+        The current snapshot, reloaded only if a file's (mtime, size) changed.
+
+        Raises:
+            RepoConfigError: If the manifest is missing or invalid
+        """
+        with self._lock:
+            if self._config is None or not self._config.is_current():
+                self._config = RepoConfig.load(self.resources_dir)
+                self.loads += 1
+            return self._config
+
+    def invalidate(self):
+        """Force a reload on the next get()."""
+        with self._lock:
+            self._config = None
@@ -0,0 +1,176 @@
+"""
+Fox Fuel Resource Loader - Repository Index
+
+In-memory listing of resources/*.html, resources/drafts/*.md and
+resources/images/, plus the slugs of legacy resources.manifest.json
+entries. It is built with one os.scandir pass per folder and kept current
+by the pipeline as it stages, removes or rolls back files, so collision
+checks never touch the disk.
+
+Changes made outside the pipeline (git pull, Explorer) are picked up by
+refresh_if_changed(), which compares folder and manifest mtimes.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Set, Iterable
+
+from repo_config import RepoConfigCache, RepoConfigError
+
+# {slug}-header.webp, {slug}-inline.png, {slug}-header-768.webp, ...
+IMAGE_NAME_PATTERN = re.compile(r'^(?P<slug>.+)-(?P<role>header|inline)(?:-[0-9][^.]*)?\.[^.]+$')
+
+
+def image_slug(name: str) -> Optional[str]:
+    """Slug a hero/inline image (or width variant) file name belongs to."""
+    match = IMAGE_NAME_PATTERN.match(name)
+    return match.group('slug') if match else None
+
+
+class RepoIndex:
+    """Slug -> files lookup for one repository (thread-safe)."""
+
+    def __init__(self, resources_dir: Path, repo_config: Optional[RepoConfigCache] = None):
+        """
+        Args:
+            resources_dir: The repo's resources/ folder
+            repo_config: Shared manifest snapshot (legacy slugs); a private one if omitted
+        """
+        self.resources_dir = Path(resources_dir)
+        self.drafts_dir = self.resources_dir / 'drafts'
+        self.images_dir = self.resources_dir / 'images'
+        self.manifest_path = self.resources_dir / 'resources.manifest.json'
+        self.repo_config = repo_config or RepoConfigCache(self.resources_dir)
+
+        self._lock = threading.RLock()
+        self.html: Set[str] = set()      # resources/*.html names
+        self.drafts: Set[str] = set()    # drafts/*.md names
+        self.images: Dict[str, Set[str]] = {}  # slug -> images/ names
+        self.legacy_slugs: Set[str] = set()
+        self._mtimes: Dict[Path, int] = {}
+        self.rescan()
+
+    def _watched(self) -> List[Path]:
+        return [self.resources_dir, self.drafts_dir, self.images_dir, self.manifest_path]
+
+    @staticmethod
+    def _mtime(path: Path) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _scan(folder: Path, suffix: Optional[str] = None) -> List[str]:
+        """File names in a folder (one scandir pass; missing folder = empty)."""
+        try:
+            with os.scandir(folder) as entries:
+                return [e.name for e in entries
+                        if e.is_file() and (suffix is None or e.name.endswith(suffix))]
+        except OSError:
+            return []
+
+    def rescan(self):
+        """Rebuild the index from disk."""
+        with self._lock:
+            self._mtimes = {path: self._mtime(path) for path in self._watched()}
+            self.html = set(self._scan(self.resources_dir, '.html'))
+            self.drafts = set(self._scan(self.drafts_dir, '.md'))
+            self.images = {}
+            for name in self._scan(self.images_dir):
+                slug = image_slug(name)
+                if slug:
+                    self.images.setdefault(slug, set()).add(name)
+            self.legacy_slugs = self._load_legacy_slugs()
+
+    def _load_legacy_slugs(self) -> Set[str]:
+        try:
+            return set(self.repo_config.get().legacy_slugs)
+        except RepoConfigError:
+            return set()
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Rescan if a folder or the manifest changed since the index last saw it.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        with self._lock:
+            if all(self._mtime(path) == mtime for path, mtime in self._mtimes.items()):
+                return False
+            self.rescan()
+            return True
+
+    # --- Updates from the pipeline -------------------------------------
+
+    def _bucket(self, path: Path) -> Optional[Set[str]]:
+        """The name set a path belongs in (None for files the index ignores)."""
+        path = Path(path)
+        if path.parent == self.drafts_dir and path.suffix == '.md':
+            return self.drafts
+        if path.parent == self.resources_dir and path.suffix == '.html':
+            return self.html
+        if path.parent == self.images_dir:
+            slug = image_slug(path.name)
+            if slug:
+                return self.images.setdefault(slug, set())
+        return None
+
+    def _touched(self, path: Path):
+        """Our own change to a folder must not look like an external one."""
+        folder = Path(path).parent
+        if folder in self._mtimes:
+            self._mtimes[folder] = self._mtime(folder)
+
+    def add(self, path: Path):
+        """Record a file the pipeline created."""
+        with self._lock:
+            bucket = self._bucket(path)
+            if bucket is not None:
+                bucket.add(Path(path).name)
+                self._touched(path)
+
+    def discard(self, path: Path):
+        """Record a file the pipeline removed."""
+        with self._lock:
+            bucket = self._bucket(path)
+            if bucket is not None:
+                bucket.discard(Path(path).name)
+                self._touched(path)
+
+    def sync(self, paths: Iterable[Path]):
+        """Re-check specific paths on disk (e.g. after a rollback)."""
+        with self._lock:
+            for path in paths:
+                if Path(path).exists():
+                    self.add(path)
+                else:
+                    self.discard(path)
+
+    # --- Queries (no disk access) --------------------------------------
+
+    def has_draft(self, slug: str) -> bool:
+        with self._lock:
+            return f"{slug}.md" in self.drafts
+
+    def has_html(self, slug: str) -> bool:
+        with self._lock:
+            return f"{slug}.html" in self.html
+
+    def is_legacy(self, slug: str) -> bool:
+        """Whether resources.manifest.json lists the slug."""
+        with self._lock:
+            return slug in self.legacy_slugs
+
+    def image_names(self, slug: str) -> List[str]:
+        """Hero/inline images for a slug in images/, including width variants."""
+        with self._lock:
+            return sorted(self.images.get(slug, ()))
+
+    def html_names(self) -> List[str]:
+        """All resources/*.html names."""
+        with self._lock:
+            return sorted(self.html)
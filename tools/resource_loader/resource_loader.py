@@ -11,10 +11,13 @@ A desktop utility for loading resource content bundles:
 
 import os
 import sys
+import queue
+import sqlite3
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import threading
 
 # Try to import tkinterdnd2 for drag-and-drop support
@@ -24,7 +27,13 @@ try:
 except ImportError:
     HAS_DND = False
 
-from ingest_pipeline import IngestPipeline, IngestError, MissingFrontMatterError, find_repo_root, slugify
+from ingest_pipeline import (IngestPipeline, IngestError, IngestCancelledError, MissingFrontMatterError,
+                             find_repo_root, slugify)
+from generator_worker import GeneratorWorker
+from repo_index import RepoIndex
+from repo_config import RepoConfigCache
+from drafts_catalog import DraftsCatalog
+from git_outbox import GitOutbox
 from datetime import datetime
 
 
@@ -87,7 +96,7 @@ class ImageRoleDialog(tk.Toplevel):
 class CommitConfirmDialog(tk.Toplevel):
     """Dialog to confirm commit with summary."""
 
-    def __init__(self, parent, slug: str, related_files: List[str], unrelated_files: List[str],
+    def __init__(self, parent, resources: Dict[str, str], related_files: List[str], unrelated_files: List[str],
                  allow_unrelated: bool = False):
         super().__init__(parent)
         self.title("Confirm Commit & Push")
@@ -101,7 +110,13 @@ class CommitConfirmDialog(tk.Toplevel):
         self.geometry("500x450")
 
         # Summary
-        summary = f"Ready to commit resource: {slug}\n\n"
+        if len(resources) == 1:
+            summary = f"Ready to commit resource: {next(iter(resources))}\n\n"
+        else:
+            summary = f"Ready to commit {len(resources)} resources in one commit:\n"
+            for slug, publish_date in sorted(resources.items(), key=lambda item: (item[1], item[0])):
+                summary += f"  - {slug} ({publish_date})\n"
+            summary += "\n"
         summary += "Files to commit:\n"
         for f in related_files[:10]:
             summary += f"  + {f}\n"
@@ -388,6 +403,11 @@ class FrontMatterDialog(tk.Toplevel):
 class ResourceLoaderApp:
     """Main application window."""
 
+    # How often (ms) the UI drains log/progress messages from the worker
+    QUEUE_POLL_MS = 50
+    OUTBOX_POLL_MS = 1000
+    CLOSE_POLL_MS = 100  # How often a pending close checks for the ingest to finish
+
     def __init__(self, root):
         self.root = root
         self.root.title("Fox Fuel Resource Loader")
@@ -400,8 +420,16 @@ class ResourceLoaderApp:
             messagebox.showerror("Error", "Could not find repository root.\nMake sure this tool is inside the foxfuel-pro-site repo.")
             sys.exit(1)
 
+        # One generator worker per GUI session (node starts on first Process)
+        self.generator_worker = GeneratorWorker(self.repo_root, log_callback=self._log)
+
+        # One manifest snapshot and repo index per GUI session
+        self.repo_config = RepoConfigCache(self.repo_root / 'resources')
+        self.repo_index: Optional[RepoIndex] = None
+        self.drafts_catalog: Optional[DraftsCatalog] = None
+
         # Initialize pipeline
-        self.pipeline = IngestPipeline(self.repo_root, log_callback=self._log)
+        self.pipeline = self._new_pipeline()
 
         # State
         self.md_file: Optional[Path] = None
@@ -410,12 +438,54 @@ class ResourceLoaderApp:
         self.inline_image: Optional[Path] = None
         self.process_complete = False
 
+        # Background worker: log records and stage progress come back through
+        # ui_queue and are drained on the Tk thread by _drain_queue()
+        self.ui_queue: "queue.Queue[Tuple]" = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+        self.trace_path: Optional[Path] = None
+
+        # Commits are pushed in the background (retried with backoff)
+        self.git_outbox = GitOutbox(self.repo_root, log_callback=self._log)
+
         # Build UI
         self._build_ui()
 
         # Update state
         self._update_ui_state()
 
+        # Undo ingests a previous session left half-done (crash, kill, power loss)
+        try:
+            self.pipeline.recover_interrupted()
+        except Exception as e:
+            self._log(f"Journal recovery failed: {e}", 'error')
+
+        self.git_outbox.start()
+
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(self.QUEUE_POLL_MS, self._drain_queue)
+        self.root.after(self.OUTBOX_POLL_MS, self._poll_outbox)
+
+    def _new_pipeline(self) -> IngestPipeline:
+        """Create a pipeline that uses the session's generator worker, config, repo index and catalog."""
+        pipeline = IngestPipeline(self.repo_root, log_callback=self._log)
+        pipeline.generator_worker = self.generator_worker
+        pipeline.repo_config = self.repo_config
+        if self.repo_index is None:
+            self.repo_index = pipeline.get_repo_index()
+        else:
+            # Pick up files changed outside the tool (git pull, Explorer)
+            self.repo_index.refresh_if_changed()
+            pipeline.repo_index = self.repo_index
+        if self.drafts_catalog is None:
+            self.drafts_catalog = pipeline.get_drafts_catalog()
+        else:
+            try:
+                self.drafts_catalog.sync()
+            except sqlite3.Error as e:
+                self._log(f"Drafts catalog sync failed: {e}", 'warning')
+            pipeline.drafts_catalog = self.drafts_catalog
+        return pipeline
+
     def _find_repo_root(self) -> Optional[Path]:
         """Find the repository root."""
         # Start from the script location or current directory
@@ -532,6 +602,10 @@ class ResourceLoaderApp:
         ttk.Checkbutton(row1, text="Allow committing unrelated changes",
                         variable=self.allow_unrelated).pack(side='left', padx=10)
 
+        self.group_commits = tk.BooleanVar(value=False)
+        ttk.Checkbutton(row1, text="Group commits (one per session)",
+                        variable=self.group_commits).pack(side='left')
+
         # Row 2
         row2 = ttk.Frame(frame)
         row2.pack(fill='x', pady=(5, 0))
@@ -544,6 +618,27 @@ class ResourceLoaderApp:
         ttk.Checkbutton(row2, text="Debug mode",
                         variable=self.debug_mode).pack(side='left', padx=10)
 
+        self.write_trace = tk.BooleanVar(value=False)
+        ttk.Checkbutton(row2, text="Write timing trace",
+                        variable=self.write_trace).pack(side='left')
+
+        # Row 3
+        row3 = ttk.Frame(frame)
+        row3.pack(fill='x', pady=(5, 0))
+
+        self.optimize_images = tk.BooleanVar(value=True)
+        ttk.Checkbutton(row3, text="Optimize images",
+                        variable=self.optimize_images).pack(side='left')
+
+        ttk.Label(row3, text="Format:").pack(side='left', padx=(10, 2))
+        self.image_format = tk.StringVar(value=IngestPipeline.DEFAULT_IMAGE_FORMAT)
+        ttk.Combobox(row3, textvariable=self.image_format, values=IngestPipeline.IMAGE_FORMATS,
+                     state='readonly', width=9).pack(side='left')
+
+        ttk.Label(row3, text="Quality:").pack(side='left', padx=(10, 2))
+        self.image_quality = tk.IntVar(value=IngestPipeline.DEFAULT_IMAGE_QUALITY)
+        ttk.Spinbox(row3, from_=40, to=100, textvariable=self.image_quality, width=5).pack(side='left')
+
     def _build_buttons(self, parent):
         """Build the action buttons."""
         frame = ttk.Frame(parent)
@@ -558,6 +653,26 @@ class ResourceLoaderApp:
         self.reset_btn = ttk.Button(frame, text="Reset", command=self._reset)
         self.reset_btn.pack(side='left', padx=5)
 
+        self.cancel_btn = ttk.Button(frame, text="Cancel", command=self._cancel_process, state='disabled')
+        self.cancel_btn.pack(side='left', padx=5)
+
+        # Stage progress
+        self.stage_label = ttk.Label(frame, text="", font=('Segoe UI', 9))
+        self.stage_label.pack(side='right', padx=5)
+        self.progress = ttk.Progressbar(frame, mode='determinate', length=160,
+                                        maximum=len(IngestPipeline.STAGES) - 1)
+        self.progress.pack(side='right', padx=5)
+
+        # Push queue status
+        outbox_frame = ttk.Frame(parent)
+        outbox_frame.pack(fill='x')
+        ttk.Label(outbox_frame, text="Push queue:").pack(side='left', padx=5)
+        self.outbox_label = ttk.Label(outbox_frame, text=self.git_outbox.status().describe(),
+                                      font=('Segoe UI', 9))
+        self.outbox_label.pack(side='left')
+        self.push_now_btn = ttk.Button(outbox_frame, text="Retry Push", command=self.git_outbox.push_now)
+        self.push_now_btn.pack(side='right', padx=5)
+
     def _build_log_panel(self, parent):
         """Build the log panel."""
         frame = ttk.LabelFrame(parent, text="Log", padding=5)
@@ -579,7 +694,45 @@ class ResourceLoaderApp:
         self.log_text.tag_configure('error', foreground='red')
 
     def _log(self, message: str, level: str = 'info'):
-        """Log a message to the log panel."""
+        """Queue a log message for the log panel (safe to call from any thread)."""
+        self.ui_queue.put(('log', message, level))
+
+    def _on_stage(self, stage: str):
+        """Queue a stage progress update (called from the worker thread)."""
+        self.ui_queue.put(('stage', stage))
+
+    def _on_generator_progress(self, processed: int, found: int):
+        """Queue a generator progress update (called from the worker thread)."""
+        self.ui_queue.put(('generator', processed, found))
+
+    def _drain_queue(self):
+        """Apply queued log/progress messages on the Tk thread, then reschedule."""
+        try:
+            while True:
+                item = self.ui_queue.get_nowait()
+                kind = item[0]
+                if kind == 'log':
+                    self._write_log(item[1], item[2])
+                elif kind == 'stage':
+                    self.progress['value'] = IngestPipeline.STAGES.index(item[1])
+                    self.stage_label.config(text=item[1].replace('_', ' '))
+                elif kind == 'generator':
+                    self.stage_label.config(text=f"processed {item[1]} of {item[2]} drafts")
+                elif kind == 'done':
+                    self._on_process_done(item[1])
+        except queue.Empty:
+            pass
+        self.root.after(self.QUEUE_POLL_MS, self._drain_queue)
+
+    def _poll_outbox(self):
+        """Show the push queue status (Tk thread), then reschedule."""
+        status = self.git_outbox.status()
+        self.outbox_label.config(text=status.describe())
+        self.push_now_btn.config(state='normal' if status.state == 'waiting' else 'disabled')
+        self.root.after(self.OUTBOX_POLL_MS, self._poll_outbox)
+
+    def _write_log(self, message: str, level: str = 'info'):
+        """Write a message to the log panel (Tk thread only)."""
         self.log_text.config(state='normal')
 
         # Add icon prefix
@@ -589,7 +742,6 @@ class ResourceLoaderApp:
         self.log_text.insert('end', f"{icon}{message}\n", level)
         self.log_text.see('end')
         self.log_text.config(state='disabled')
-        self.root.update_idletasks()
 
     def _update_ui_state(self):
         """Update UI state based on current loaded files."""
@@ -632,8 +784,15 @@ class ResourceLoaderApp:
                        self.hero_image is not None and
                        self.inline_image is not None)
 
-        self.process_btn.config(state='normal' if valid_files else 'disabled')
-        self.commit_btn.config(state='normal' if self.process_complete else 'disabled')
+        running = self._is_running()
+        self.process_btn.config(state='normal' if valid_files and not running else 'disabled')
+        self.commit_btn.config(state='normal' if self.pipeline.session_resources and not running else 'disabled')
+        self.reset_btn.config(state='disabled' if running else 'normal')
+        self.cancel_btn.config(state='normal' if running else 'disabled')
+
+    def _is_running(self) -> bool:
+        """Whether a background ingest is in progress."""
+        return self.worker is not None and self.worker.is_alive()
 
     def _on_drop(self, event):
         """Handle drag-drop event."""
@@ -698,7 +857,8 @@ class ResourceLoaderApp:
 
             # Parse front matter - handle missing front matter with dialog
             try:
-                fm, _ = self.pipeline.parse_markdown(self.md_file)
+                with self.pipeline.span('parse'):
+                    fm, _ = self.pipeline.parse_markdown(self.md_file)
                 self._log(f"Parsed front matter for slug: {fm.get('slug', 'unknown')}", 'info')
                 self._log("  YAML front matter: present in source file", 'success')
             except MissingFrontMatterError as e:
@@ -749,7 +909,10 @@ class ResourceLoaderApp:
         self._update_ui_state()
 
     def _process(self):
-        """Run the processing pipeline."""
+        """Start the processing pipeline on a background worker thread."""
+        if self._is_running():
+            return
+
         self._log("\n========================================", 'info')
         self._log("        Starting Process", 'info')
         self._log("========================================", 'info')
@@ -757,114 +920,154 @@ class ResourceLoaderApp:
         # Reset process state
         self.process_complete = False
 
-        # Set flags on pipeline
+        # Read Tk variables here; the worker must not touch Tk
         self.pipeline.keep_temp_folder = self.keep_temp_folder.get()
         self.pipeline.debug_mode = self.debug_mode.get()
-
-        # Validate front matter
-        self._log("Validating front matter...", 'info')
-        errors = self.pipeline.validate_front_matter(self.pipeline.front_matter)
-        if errors:
-            for err in errors:
-                self._log(err, 'error')
-            return
-
-        self._log("Front matter validation passed", 'success')
-
-        # Validate images
-        self._log("Validating images...", 'info')
-        for img in [self.hero_image, self.inline_image]:
-            errors = self.pipeline.validate_image(img)
-            if errors:
-                for err in errors:
-                    self._log(err, 'error')
-                return
-
-        self._log("Image validation passed", 'success')
-
-        # Check slug collision
-        slug = self.pipeline.front_matter['slug']
-        self._log(f"Checking for slug collision: {slug}", 'info')
-        collisions = self.pipeline.check_slug_collision(slug, self.force_overwrite.get())
-        if collisions:
-            for msg in collisions:
-                if 'Will overwrite' in msg:
-                    self._log(msg, 'warning')
-                else:
-                    self._log(msg, 'error')
-                    return
-
-        # Stage files (creates temp bundle and copies to destinations)
+        self.pipeline.optimize_images = self.optimize_images.get()
+        self.pipeline.image_format = self.image_format.get()
         try:
-            temp_bundle_dir = self.pipeline.stage_files(
-                self.md_file,
-                self.hero_image,
-                self.inline_image,
-                self.force_overwrite.get()
-            )
-        except IngestError as e:
-            self._log(str(e), 'error')
-            return
+            self.pipeline.image_quality = int(self.image_quality.get())
+        except (tk.TclError, ValueError):
+            self.pipeline.image_quality = IngestPipeline.DEFAULT_IMAGE_QUALITY
+        self.pipeline.progress_callback = self._on_stage
+        self.pipeline.generator_progress_callback = self._on_generator_progress
+        self.pipeline.cancel_event.clear()
+        force_overwrite = self.force_overwrite.get()
+        self.trace_path = self._new_trace_path() if self.write_trace.get() else None
+
+        self.progress['value'] = 0
+        self.stage_label.config(text="")
+        self.worker = threading.Thread(
+            target=self._process_worker,
+            args=(self.pipeline, self.md_file, self.hero_image, self.inline_image, force_overwrite),
+            daemon=True
+        )
+        self.worker.start()
+        self._update_ui_state()
 
-        # Pre-generator validation (fail-fast before running generator)
-        pre_errors = self.pipeline.validate_pre_generator()
-        if pre_errors:
-            for err in pre_errors:
-                self._log(err, 'error')
-            self._log("Keeping temp bundle for debugging: " + str(temp_bundle_dir), 'warning')
-            # Do NOT rollback or clean temp - keep for debugging
-            return
+    def _process_worker(self, pipeline: IngestPipeline, md_file: Path, hero_image: Path,
+                        inline_image: Path, force_overwrite: bool):
+        """Run the ingest stages off the Tk thread; reports back through ui_queue."""
+        success = False
+        try:
+            with pipeline.span('process', 'run'):
+                stage, errors = pipeline.prepare_bundle(md_file, hero_image, inline_image, force_overwrite)
+                if not errors:
+                    stage, errors = pipeline.finish_bundle()
+            success = not errors
+        except IngestCancelledError as e:
+            self._log(str(e), 'warning')
+            pipeline.rollback()
+        except Exception as e:
+            self._log(f"Unexpected error: {e}", 'error')
+            # Close the journal as failed: left pending, it would be replayed at
+            # the next start, over any later ingest of the same slug
+            try:
+                pipeline.fail_journal()
+            except Exception as journal_error:
+                self._log(f"Could not close the rollback journal: {journal_error}", 'error')
+        finally:
+            self.ui_queue.put(('done', success))
+
+    def _on_process_done(self, success: bool):
+        """Handle worker completion on the Tk thread."""
+        self.worker = None
+        if success:
+            slug = self.pipeline.front_matter['slug']
+            self._log("", 'info')
+            self._log("========================================", 'success')
+            self._log(f"  Process complete for: {slug}", 'success')
+            if self.group_commits.get():
+                count = len(self.pipeline.session_resources)
+                self._log(f"  Added to session ({count} resource{'s' if count != 1 else ''})", 'success')
+                self._log("  Reset to add more, or Commit + Push", 'success')
+            else:
+                self._log("  Ready to Commit + Push", 'success')
+            self._log("========================================", 'success')
+        else:
+            self.stage_label.config(text="failed")
 
-        # Run generators
-        success, output = self.pipeline.run_generators()
-        if not success:
-            self._log(output, 'error')
-            self._log("Generator failed - keeping temp bundle for debugging", 'warning')
-            # Do NOT rollback on generator failure - keep files for inspection
-            return
+        self._save_trace()
+        self.process_complete = success
+        self._update_ui_state()
 
-        if self.debug_mode.get():
-            self._log(output, 'info')
+    def _new_trace_path(self) -> Path:
+        """Trace file for this run: tmp/traces/<slug>-<timestamp>.json (Chrome trace format)."""
+        slug = self.pipeline.front_matter.get('slug') or 'ingest'
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return self.repo_root / 'tools' / 'resource_loader' / 'tmp' / 'traces' / f"{slug}-{timestamp}.json"
 
-        # Validate generated HTML
-        errors = self.pipeline.validate_generated_html(slug)
-        if errors:
-            for err in errors:
-                self._log(err, 'error')
-            self._log("HTML validation FAILED", 'error')
-            # Preserve artifacts BEFORE any cleanup (debug mode only)
-            self.pipeline.preserve_failed_artifacts(slug)
-            self._log("Keeping temp bundle for debugging: " + str(temp_bundle_dir), 'warning')
-            # Do NOT rollback - keep staged files for debugging
+    def _save_trace(self):
+        """Write (or rewrite, after git commands) the timing trace if enabled."""
+        if not self.trace_path:
             return
+        try:
+            self.pipeline.tracer.write(self.trace_path)
+            self._log(f"Timing trace: {self.trace_path}", 'info')
+        except OSError as e:
+            self._log(f"Failed to write timing trace: {e}", 'warning')
+
+    def _cancel_process(self):
+        """Cancel the running ingest; the worker rolls back at the next stage boundary."""
+        if self._is_running():
+            self._log("Cancelling... (staged files will be rolled back)", 'warning')
+            self.pipeline.cancel()
+            self.cancel_btn.config(state='disabled')
+
+    def _on_close(self):
+        """Close the window; a running ingest is cancelled and the window closes once it has rolled back."""
+        if self._is_running():
+            if not messagebox.askyesno("Ingest running",
+                                       "An ingest is still running.\nCancel it and roll back before closing?"):
+                return
+            self.pipeline.cancel()
+            self._log("Closing once the ingest has rolled back...", 'warning')
+            self._disable_window()
+            # Poll instead of join() so the Tk thread keeps draining the log
+            self._close_when_done(self.worker)
+            return
+        self._shutdown()
+
+    def _disable_window(self):
+        """Block input while a close waits for the worker (Tk thread)."""
+        self.root.protocol("WM_DELETE_WINDOW", lambda: None)
+        for button in (self.process_btn, self.commit_btn, self.reset_btn, self.cancel_btn, self.push_now_btn):
+            button.config(state='disabled')
+        self.stage_label.config(text="closing")
+        self.root.config(cursor='watch')
+        try:
+            self.root.attributes('-disabled', True)  # Windows only
+        except tk.TclError:
+            pass
+
+    def _close_when_done(self, worker: threading.Thread):
+        """Destroy the window once worker has exited, checking again later otherwise."""
+        if worker.is_alive():
+            self.root.after(self.CLOSE_POLL_MS, self._close_when_done, worker)
+        else:
+            self._shutdown()
 
-        self._log("HTML validation PASSED", 'success')
-
-        # Clean up temp bundle (respects keep_temp_folder setting)
-        self.pipeline.cleanup_temp_bundle()
-
-        self._log("", 'info')
-        self._log("========================================", 'success')
-        self._log(f"  Process complete for: {slug}", 'success')
-        self._log("  Ready to Commit + Push", 'success')
-        self._log("========================================", 'success')
-
-        self.process_complete = True
-        self._update_ui_state()
+    def _shutdown(self):
+        """Stop the session's helpers and destroy the window."""
+        self.generator_worker.stop()
+        if self.drafts_catalog is not None:
+            self.drafts_catalog.close()
+        # Unpushed commits stay in the outbox and go out next session
+        self.git_outbox.stop(timeout=5)
+        self.root.destroy()
 
     def _commit_push(self):
-        """Commit and push changes."""
-        if not self.process_complete:
+        """Commit the session's resources and queue them for the background push."""
+        resources = dict(self.pipeline.session_resources)
+        if not resources:
             self._log("Process must complete successfully before committing.", 'error')
             return
 
-        slug = self.pipeline.front_matter.get('slug', 'unknown')
-
         # Get git status
         related, unrelated = self.pipeline.get_git_status()
 
         # Show confirmation dialog with allow_unrelated flag
-        dialog = CommitConfirmDialog(self.root, slug, related, unrelated,
+        dialog = CommitConfirmDialog(self.root, resources, related, unrelated,
                                      allow_unrelated=self.allow_unrelated.get())
         if not dialog.result:
             self._log("Commit cancelled by user", 'warning')
@@ -872,13 +1075,18 @@ class ResourceLoaderApp:
 
         self._log("\n--- Committing Changes ---", 'info')
 
-        success, output = self.pipeline.commit_and_push(slug)
+        # Only the session's own files are committed, plus the unrelated
+        # ones when the user allowed them
+        extra = unrelated if self.allow_unrelated.get() else []
+        success, output = self.pipeline.commit_session(extra, outbox=self.git_outbox)
 
         if success:
             self._log(output, 'info')
-            self._log(f"\nSuccessfully committed and pushed: {slug}", 'success')
+            self._log(f"\nCommitted: {', '.join(sorted(resources))} (pushing in the background)", 'success')
         else:
             self._log(output, 'error')
+        self._save_trace()
+        self._update_ui_state()
 
     def _reset(self):
         """Reset all state."""
@@ -887,9 +1095,14 @@ class ResourceLoaderApp:
         self.hero_image = None
         self.inline_image = None
         self.process_complete = False
+        self.trace_path = None
 
-        # Reset pipeline
-        self.pipeline = IngestPipeline(self.repo_root, log_callback=self._log)
+        # Reset pipeline (the generator worker stays up for the session)
+        previous = self.pipeline
+        self.pipeline = self._new_pipeline()
+        if self.group_commits.get():
+            # Uncommitted ingests go into the next session commit
+            self.pipeline.carry_session(previous)
 
         # Clear log
         self.log_text.config(state='normal')
@@ -897,11 +1110,17 @@ class ResourceLoaderApp:
         self.log_text.config(state='disabled')
 
         self._log("Reset complete. Ready for new files.", 'info')
+        if self.pipeline.session_resources:
+            count = len(self.pipeline.session_resources)
+            self._log(f"Session: {count} resource{'s' if count != 1 else ''} waiting for one commit", 'info')
         self._update_ui_state()
 
 
 def main():
     """Main entry point."""
+    # Required for the image optimization process pool in the frozen exe
+    multiprocessing.freeze_support()
+
     # Use TkinterDnD if available, otherwise regular Tk
     if HAS_DND:
         root = TkinterDnD.Tk()
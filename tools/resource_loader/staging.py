@@ -0,0 +1,166 @@
+"""
+Fox Fuel Resource Loader - Staging Engine
+
+Handles:
+- Streaming copies that compute SHA-256 in the same pass (one read per input)
+- Atomic placement: write to a temp name in the destination folder, then os.replace
+- Copy-on-write clones (reflink) or hardlinks instead of a second physical copy
+- Skipping byte-identical destinations by hash
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+# Read/write chunk size for streaming copies
+CHUNK_SIZE = 1024 * 1024
+
+# Linux FICLONE ioctl (btrfs, XFS with reflink=1, bcachefs, ...)
+_FICLONE = 0x40049409
+
+# Placement methods reported by place_file()
+UNCHANGED = 'unchanged'
+REFLINK = 'reflink'
+HARDLINK = 'hardlink'
+COPY = 'copy'
+
+
+def copy_with_hash(src: Path, dest: Path) -> str:
+    """
+    Stream src to dest, hashing the bytes on the way through.
+
+    Permission bits and timestamps are copied like shutil.copy2.
+
+    Returns:
+        SHA-256 hex digest of the copied bytes
+    """
+    digest = hashlib.sha256()
+    with open(src, 'rb') as fsrc, open(dest, 'wb') as fdest:
+        for chunk in iter(lambda: fsrc.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            fdest.write(chunk)
+    shutil.copystat(src, dest)
+    return digest.hexdigest()
+
+
+def write_with_hash(data: bytes, dest: Path) -> str:
+    """Write bytes to dest and return their SHA-256 hex digest."""
+    with open(dest, 'wb') as f:
+        f.write(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def same_content(path: Path, sha256: str, size: int) -> bool:
+    """Whether path exists with exactly this size and hash (size is checked first)."""
+    try:
+        if path.stat().st_size != size:
+            return False
+        return file_sha256(path) == sha256
+    except OSError:
+        return False
+
+
+def try_reflink(src: Path, dest: Path) -> bool:
+    """
+    Clone src to dest copy-on-write (shares data blocks until either is written).
+
+    Returns:
+        True if the clone was made; False if unsupported here (dest is not left behind)
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(src, 'rb') as fsrc, open(dest, 'wb') as fdest:
+            fcntl.ioctl(fdest.fileno(), _FICLONE, fsrc.fileno())
+    except OSError:
+        try:
+            os.unlink(dest)
+        except OSError:
+            pass
+        return False
+    shutil.copystat(src, dest)
+    return True
+
+
+def clone_file(src: Path, dest: Path, allow_hardlink: bool = True) -> str:
+    """
+    Make dest a copy of src as cheaply as the filesystem allows.
+
+    Tries a reflink, then (if allowed) a hardlink, then a streaming copy.
+    Only allow hardlinks when neither path is later modified in place:
+    both names share one inode.
+
+    Returns:
+        The method used: 'reflink', 'hardlink' or 'copy'
+    """
+    if try_reflink(src, dest):
+        return REFLINK
+    if allow_hardlink:
+        try:
+            os.link(src, dest)
+            return HARDLINK
+        except OSError:
+            pass  # Cross-device, unsupported (FAT/exFAT) or not permitted
+    shutil.copyfile(src, dest)
+    shutil.copystat(src, dest)
+    return COPY
+
+
+def place_file(src: Path, dest: Path, sha256: Optional[str] = None,
+               allow_hardlink: bool = True) -> str:
+    """
+    Atomically place src at dest.
+
+    The file is cloned to a temp name in dest's folder (same filesystem)
+    and renamed over dest with os.replace, so readers never see a partial
+    file. If dest already holds exactly the same bytes it is left untouched
+    (hashes are only compared when the sizes match).
+
+    Args:
+        src: File to place (normally in the temp bundle)
+        dest: Final path
+        sha256: Known hash of src (saves re-reading it for the unchanged check)
+        allow_hardlink: See clone_file
+
+    Returns:
+        'unchanged', 'reflink', 'hardlink' or 'copy'
+    """
+    src = Path(src)
+    dest = Path(dest)
+    try:
+        sizes_match = dest.stat().st_size == src.stat().st_size
+    except OSError:
+        sizes_match = False
+    if sizes_match and same_content(dest, sha256 or file_sha256(src), dest.stat().st_size):
+        return UNCHANGED
+
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.staging")
+    try:
+        if tmp.exists():
+            tmp.unlink()
+        method = clone_file(src, tmp, allow_hardlink)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return method
@@ -0,0 +1,140 @@
+"""
+Front matter reader on pathological drafts (both readers and parse_markdown).
+
+Run from tools/resource_loader:
+    python -m pytest tests
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from front_matter import DEFAULT_MAX_BYTES, read_front_matter, split_front_matter, load_yaml  # noqa: E402
+from ingest_pipeline import IngestPipeline, IngestError, MissingFrontMatterError  # noqa: E402
+
+BODY = b'# Title\n\nParagraph text.\n'
+
+
+class FrontMatterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix='front-matter-test-'))
+        self.pipeline = IngestPipeline(self.tmp, log_callback=lambda message, level: None)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, data: bytes) -> Path:
+        path = self.tmp / 'draft.md'
+        path.write_bytes(data)
+        return path
+
+    def both(self, data: bytes):
+        """(read_front_matter, split_front_matter) results for the same draft."""
+        return read_front_matter(self.write(data)), split_front_matter(data.decode('utf-8'))
+
+    # --- Missing closing fence ------------------------------------------
+
+    def test_missing_closing_fence(self):
+        data = b'---\nslug: x\ntitle: y\n' + BODY * 100
+        for block in self.both(data):
+            self.assertEqual((block.closed, block.body_offset, block.yaml_text), (False, 0, ''))
+        with self.assertRaisesRegex(IngestError, "no closing '---'"):
+            self.pipeline.parse_markdown(self.tmp / 'draft.md')
+
+    def test_fence_lookalikes_do_not_close(self):
+        data = b'---\nslug: x\n----\n--- x\n -- -\n' + BODY
+        for block in self.both(data):
+            self.assertFalse(block.closed)
+
+    def test_no_opening_fence(self):
+        for block in self.both(BODY):
+            self.assertIsNone(block)
+        with self.assertRaises(MissingFrontMatterError):
+            self.pipeline.parse_markdown(self.tmp / 'draft.md')
+
+    # --- Huge header ----------------------------------------------------
+
+    def test_closing_fence_past_the_cap(self):
+        header = b'---\nslug: x\n' + b'key: value\n' * (DEFAULT_MAX_BYTES // 11 + 1)
+        for block in self.both(header + b'---\n' + BODY):
+            self.assertFalse(block.closed)
+        with self.assertRaises(IngestError):
+            self.pipeline.parse_markdown(self.tmp / 'draft.md')
+
+    def test_single_huge_line(self):
+        data = b'---\n' + b'x' * (8 * DEFAULT_MAX_BYTES) + b'\n---\n' + BODY
+        for block in self.both(data):
+            self.assertFalse(block.closed)
+
+    def test_large_header_within_the_cap(self):
+        header = b'---\nslug: x\n' + b''.join(b'key%d: value\n' % i for i in range(2000)) + b'---\n'
+        self.assertLess(len(header), DEFAULT_MAX_BYTES)
+        block, split = self.both(header + BODY)
+        self.assertEqual((block.closed, block.body_offset), (True, len(header)))
+        self.assertEqual((split.closed, split.body_offset), (True, len(header)))
+        front_matter, body = self.pipeline.parse_markdown(self.tmp / 'draft.md')
+        self.assertEqual(len(front_matter), 2001)
+        self.assertEqual(body, BODY.decode('utf-8'))
+
+    # --- Quoted scalars -------------------------------------------------
+
+    def test_single_and_double_quoted_scalars(self):
+        data = ("---\n"
+                "slug: 'single-quoted'\n"
+                "title: \"Double \\\"quoted\\\" title\"\n"
+                "description: 'It''s a: colon # not a comment'\n"
+                "category: \"Fleet Operations\"\n"
+                "publishDate: '2026-01-15'\n"
+                "---\n").encode('utf-8') + BODY
+        expected = {
+            'slug': 'single-quoted',
+            'title': 'Double "quoted" title',
+            'description': "It's a: colon # not a comment",
+            'category': 'Fleet Operations',
+            'publishDate': '2026-01-15',
+        }
+        block, split = self.both(data)
+        self.assertEqual(load_yaml(block.yaml_text), expected)
+        self.assertEqual(load_yaml(split.yaml_text), expected)
+        front_matter, _ = self.pipeline.parse_markdown(self.tmp / 'draft.md')
+        self.assertEqual(front_matter, expected)
+        self.assertEqual(self.pipeline.slug, 'single-quoted')
+
+    # --- Offsets --------------------------------------------------------
+
+    def test_bom_crlf_and_multibyte_offsets(self):
+        header = '\ufeff---\r\nslug: x\r\ntitle: "Café"\r\n---\r\n'.encode('utf-8')
+        block, split = self.both(header + BODY)
+        self.assertEqual(block.body_offset, len(header))  # Bytes
+        self.assertEqual(split.body_offset, len(header.decode('utf-8')))  # Characters
+        self.assertEqual(block.yaml_text, 'slug: x\ntitle: "Café"')
+        self.assertEqual(split.yaml_text, block.yaml_text)
+
+    def test_dashes_inside_a_block_scalar(self):
+        header = b'---\nslug: x\ndescription: |\n  before\n  ---\n  after\n---\n'
+        block, _ = self.both(header + BODY)
+        self.assertEqual((block.closed, block.body_offset), (True, len(header)))
+        self.assertEqual(load_yaml(block.yaml_text)['description'], 'before\n---\nafter')  # yaml_text ends without a newline
+
+    # --- Encoding -------------------------------------------------------
+
+    def test_non_utf8_draft_is_rejected(self):
+        path = self.write('---\nslug: x\ntitle: "Café"\n---\n'.encode('latin-1') + BODY)
+        with self.assertRaises(UnicodeDecodeError):
+            read_front_matter(path)
+        with self.assertRaisesRegex(IngestError, 'not valid UTF-8'):
+            self.pipeline.parse_markdown(path)
+
+    def test_non_utf8_body_is_rejected(self):
+        path = self.write(b'---\nslug: x\n---\n' + 'Café\n'.encode('cp1252'))
+        with self.assertRaisesRegex(IngestError, 'not valid UTF-8'):
+            self.pipeline.parse_markdown(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
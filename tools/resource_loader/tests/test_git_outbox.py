@@ -0,0 +1,143 @@
+"""
+GitOutbox against a local bare repository as the remote.
+
+Run from tools/resource_loader:
+    python -m pytest tests
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from git_outbox import GitOutbox  # noqa: E402
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(['git', *args], cwd=str(cwd), check=True, capture_output=True,
+                          text=True).stdout.strip()
+
+
+@unittest.skipUnless(shutil.which('git'), 'git is not installed')
+class GitOutboxTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix='outbox-test-'))
+        self.remote = self.tmp / 'remote.git'
+        self.repo = self.tmp / 'repo'
+        git(self.tmp, 'init', '--bare', '-q', str(self.remote))
+        git(self.tmp, 'init', '-q', '-b', 'main', str(self.repo))
+        git(self.repo, 'config', 'user.name', 'Outbox Test')
+        git(self.repo, 'config', 'user.email', 'outbox@example.com')
+        self.commit('init')
+        git(self.repo, 'remote', 'add', 'origin', str(self.remote))
+        git(self.repo, 'push', '-q', '-u', 'origin', 'main')
+
+        self.messages = []
+        self.outbox = self.new_outbox()
+
+    def tearDown(self):
+        self.outbox.stop(timeout=5)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def new_outbox(self) -> GitOutbox:
+        outbox = GitOutbox(self.repo, state_path=self.tmp / 'outbox.json',
+                           log_callback=lambda message, level: self.messages.append((level, message)))
+        outbox.BASE_DELAY = 0.05  # Keep the backoff short
+        return outbox
+
+    def commit(self, name: str) -> str:
+        (self.repo / f"{name}.txt").write_text(name, encoding='utf-8')
+        git(self.repo, 'add', f"{name}.txt")
+        git(self.repo, 'commit', '-q', '-m', f"Add {name}")
+        return git(self.repo, 'rev-parse', 'HEAD')
+
+    def remote_head(self) -> str:
+        return git(self.remote, 'rev-parse', 'main')
+
+    def test_flush_pushes_every_queued_commit_in_one_push(self):
+        first = self.commit('first')
+        second = self.commit('second')
+        self.outbox.enqueue(first, 'Add first')
+        self.outbox.enqueue(second, 'Add second')
+        self.assertEqual(self.outbox.status().pending, 2)
+
+        self.assertTrue(self.outbox.flush(timeout=30))
+
+        self.assertEqual(self.remote_head(), second)
+        self.assertEqual(self.outbox.pending(), [])
+        self.assertEqual(self.outbox.status().state, 'idle')
+        self.assertIn(('success', 'Pushed 2 commit(s)'),
+                      [(level, message.split(' in ')[0]) for level, message in self.messages])
+
+    def test_queue_survives_restart(self):
+        sha = self.commit('queued')
+        self.outbox.enqueue(sha, 'Add queued')
+
+        reopened = self.new_outbox()
+        self.assertEqual([e['sha'] for e in reopened.pending()], [sha])
+        self.assertTrue(reopened.flush(timeout=30))
+        self.assertEqual(self.remote_head(), sha)
+
+    def test_drop_pushed_forgets_commits_the_remote_has(self):
+        pushed = self.commit('pushed-by-hand')
+        self.outbox.enqueue(pushed, 'Add pushed-by-hand')
+        git(self.repo, 'push', '-q')
+        waiting = self.commit('still-waiting')
+        self.outbox.enqueue(waiting, 'Add still-waiting')
+
+        self.outbox._drop_pushed()
+
+        self.assertEqual([e['sha'] for e in self.outbox.pending()], [waiting])
+        self.assertEqual(self.new_outbox().status().pending, 1)  # Persisted
+
+    def test_unreachable_remote_is_retried_with_backoff(self):
+        sha = self.commit('offline')
+        self.outbox.enqueue(sha, 'Add offline')
+        git(self.repo, 'remote', 'set-url', 'origin', str(self.tmp / 'missing.git'))
+
+        self.assertFalse(self.outbox.push_once())
+        status = self.outbox.status()
+        self.assertEqual((status.state, status.attempts, status.pending), ('waiting', 1, 1))
+        self.assertTrue(status.last_error)
+        first_delay = self.outbox._next_attempt - time.monotonic()
+
+        self.assertFalse(self.outbox.push_once())
+        self.assertEqual(self.outbox.status().attempts, 2)
+        self.assertGreater(self.outbox._next_attempt - time.monotonic(), first_delay)
+        self.assertEqual([e['sha'] for e in self.outbox.pending()], [sha])
+
+        # Back online: the next attempt goes out and the failure count resets
+        git(self.repo, 'remote', 'set-url', 'origin', str(self.remote))
+        self.assertTrue(self.outbox.flush(timeout=30))
+        status = self.outbox.status()
+        self.assertEqual((status.state, status.attempts, status.pending), ('idle', 0, 0))
+        self.assertEqual(self.remote_head(), sha)
+
+    def test_background_thread_retries_until_the_push_succeeds(self):
+        git(self.repo, 'remote', 'set-url', 'origin', str(self.tmp / 'missing.git'))
+        self.outbox.start()
+        sha = self.commit('background')
+        self.outbox.enqueue(sha, 'Add background')
+
+        deadline = time.monotonic() + 10
+        while self.outbox.status().attempts < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertGreaterEqual(self.outbox.status().attempts, 2)
+
+        git(self.repo, 'remote', 'set-url', 'origin', str(self.remote))
+        self.outbox.push_now()
+        deadline = time.monotonic() + 30
+        while self.outbox.status().pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.outbox.status().pending, 0)
+        self.assertEqual(self.remote_head(), sha)
+
+
+if __name__ == '__main__':
+    unittest.main()
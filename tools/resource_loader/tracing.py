@@ -0,0 +1,148 @@
+"""
+Fox Fuel Resource Loader - Timing Instrumentation
+
+Handles:
+- Span API (context manager) timing pipeline stages, generator scripts and git commands
+- Per-span timing lines in the log
+- Trace export: Chrome trace_event JSON (chrome://tracing, Perfetto) or JSON Lines
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Iterator
+
+
+class Tracer:
+    """Collects timed spans from one or more pipelines (thread-safe)."""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.events: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, name: str, category: str = 'stage',
+             log: Optional[Callable[[str, str], None]] = None, **args) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block of code.
+
+        Args:
+            name: Span name (e.g. 'parse', 'generate-resources.js', 'git push')
+            category: 'stage', 'image', 'generator', 'git', ...
+            log: Optional log callback; receives "[time] name: N ms" when the span ends
+            **args: Extra fields recorded with the span
+
+        Yields:
+            The span's args dict (callers may add fields, e.g. a result count)
+        """
+        token = self.begin(name, category, log, **args)
+        try:
+            yield token['args']
+        except BaseException as e:
+            token['args']['error'] = type(e).__name__
+            raise
+        finally:
+            self.end(token)
+
+    def begin(self, name: str, category: str = 'stage',
+              log: Optional[Callable[[str, str], None]] = None, **args) -> Dict[str, Any]:
+        """Open a span that is closed later with end() (for spans that do not nest in one block)."""
+        return {'name': name, 'cat': category, 'log': log, 'args': dict(args), 'start': time.perf_counter()}
+
+    def end(self, token: Dict[str, Any]):
+        """Close a span opened with begin()."""
+        end = time.perf_counter()
+        self._record(token['name'], token['cat'], token['start'], end, token['args'])
+        if token['log']:
+            token['log'](f"[time] {token['name']}: {format_duration(end - token['start'])}", 'info')
+
+    def _record(self, name: str, category: str, start: float, end: float, args: Dict[str, Any]):
+        event = {
+            'name': name,
+            'cat': category,
+            'start': start - self._origin,
+            'dur': end - start,
+            'tid': threading.get_ident(),
+            'thread': threading.current_thread().name,
+            'args': args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def totals(self) -> Dict[str, float]:
+        """Total seconds per span name."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for event in self.events:
+                totals[event['name']] = totals.get(event['name'], 0.0) + event['dur']
+        return totals
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace_event format (complete 'X' events, microsecond units)."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+        trace_events = [{
+            'name': e['name'],
+            'cat': e['cat'],
+            'ph': 'X',
+            'ts': round(e['start'] * 1e6),
+            'dur': round(e['dur'] * 1e6),
+            'pid': pid,
+            'tid': e['tid'],
+            'args': e['args'],
+        } for e in events]
+        # Name the threads so batch workers are readable in the viewer
+        for tid, thread in sorted({(e['tid'], e['thread']) for e in events}):
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                                 'args': {'name': thread}})
+        return {
+            'traceEvents': trace_events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'startedAt': self.started_at.isoformat(timespec='seconds')},
+        }
+
+    def to_json_lines(self) -> str:
+        """One JSON object per span (start/duration in milliseconds)."""
+        with self._lock:
+            events = list(self.events)
+        lines = [json.dumps({
+            'name': e['name'],
+            'cat': e['cat'],
+            'startMs': round(e['start'] * 1000, 3),
+            'durMs': round(e['dur'] * 1000, 3),
+            'thread': e['thread'],
+            'startedAt': self.started_at.isoformat(timespec='seconds'),
+            **({'args': e['args']} if e['args'] else {}),
+        }) for e in events]
+        return '\n'.join(lines) + ('\n' if lines else '')
+
+    def write(self, path: Path) -> Path:
+        """
+        Write the trace: JSON Lines for .jsonl files, Chrome trace JSON otherwise.
+
+        Returns:
+            The path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == '.jsonl':
+            content = self.to_json_lines()
+        else:
+            content = json.dumps(self.to_chrome_trace(), indent=1) + '\n'
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(content)
+        return path
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable duration."""
+    if seconds >= 10:
+        return f"{seconds:.1f} s"
+    return f"{seconds * 1000:.0f} ms"